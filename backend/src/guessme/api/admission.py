@@ -0,0 +1,213 @@
+"""Admission control: shed /predict load before it queues up.
+
+Requests are rejected while their bodies are still unread, so an
+overloaded replica spends almost nothing on work it will not finish and
+the event loop stays free to answer /health and /ready promptly.
+"""
+
+import json
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from guessme.metrics import ADMITTED, REQUESTS_SHED
+
+_SHED_DEPTH = REQUESTS_SHED.labels("queue_depth")
+_SHED_WAIT = REQUESTS_SHED.labels("queue_wait")
+_SHED_RATE = REQUESTS_SHED.labels("rate_limit")
+
+
+class TokenBucket:
+    """Allow rate requests per second on average, with bursts up to burst."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Start with a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take one token.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """Decide whether a prediction request may enter the inference queue.
+
+    The queue is every admitted request that has not finished. A request
+    is refused when the queue is at max_depth, or when its estimated wait
+    exceeds max_wait_ms: the drawings ahead of it times the recent
+    per-drawing service time. Each request counts as one drawing, plus
+    whatever drawings a /predict/batch request has queued for inference
+    (reported with add_items), so a large batch weighs by its size.
+    Optionally, each client is limited to client_rate requests per second.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 256,
+        max_wait_ms: float = 500.0,
+        client_rate: float = 0.0,
+        client_burst: int = 20,
+        service_ms: Callable[[], float] = lambda: 0.0,
+        max_clients: int = 10_000,
+    ) -> None:
+        """Configure the limits.
+
+        Args:
+            max_depth: Maximum admitted requests in flight
+            max_wait_ms: Maximum estimated queue wait for a new request
+            client_rate: Requests per second per client; 0 disables
+            client_burst: Requests a client may send at once
+            service_ms: Returns the current service time per drawing in ms
+            max_clients: Rate limit buckets kept, least recent dropped first
+        """
+        self.max_depth = max_depth
+        self.max_wait_ms = max_wait_ms
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.service_ms = service_ms
+        self.max_clients = max_clients
+        self.depth = 0
+        # Drawings queued by admitted batch requests, beyond one per request
+        self.items = 0
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def estimated_wait_ms(self) -> float:
+        """Estimated wait for a request admitted now."""
+        return (self.depth + self.items) * self.service_ms()
+
+    def add_items(self, count: int) -> None:
+        """Count drawings an admitted request queued for inference."""
+        self.items += count
+
+    def remove_items(self, count: int) -> None:
+        """Stop counting drawings once their inference has finished."""
+        self.items -= count
+
+    def admit(self, client_id: str | None) -> tuple[int, float, str] | None:
+        """Admit a request, or say why not.
+
+        Args:
+            client_id: Client identifier for rate limiting, if known
+
+        Returns:
+            None if admitted (call release() when it finishes), otherwise
+            (status code, retry after seconds, reason)
+        """
+        if self.depth >= self.max_depth:
+            _SHED_DEPTH.inc()
+            return 503, self._retry_after(), "Inference queue full"
+
+        wait_ms = self.estimated_wait_ms()
+        if wait_ms > self.max_wait_ms:
+            _SHED_WAIT.inc()
+            return 503, wait_ms / 1000, "Inference queue wait too long"
+
+        if self.client_rate > 0 and client_id is not None:
+            wait_s = self._bucket(client_id).take()
+            if wait_s > 0:
+                _SHED_RATE.inc()
+                return 429, wait_s, "Rate limit exceeded"
+
+        self.depth += 1
+        ADMITTED.set(self.depth)
+        return None
+
+    def release(self) -> None:
+        """Mark an admitted request as finished."""
+        self.depth -= 1
+        ADMITTED.set(self.depth)
+
+    def _retry_after(self) -> float:
+        """Time for the current queue to drain, at least one second."""
+        return max(1.0, self.estimated_wait_ms() / 1000)
+
+    def _bucket(self, client_id: str) -> TokenBucket:
+        """Return the client's bucket, creating it if needed."""
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            bucket = TokenBucket(self.client_rate, self.client_burst)
+            self._buckets[client_id] = bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client_id)
+        return bucket
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying an AdmissionController to some paths.
+
+    Other paths, including /health and /ready, pass straight through and
+    never wait behind prediction traffic.
+    """
+
+    def __init__(
+        self, app: ASGIApp, controller: AdmissionController, paths: tuple[str, ...]
+    ) -> None:
+        """Wrap app.
+
+        Args:
+            app: Downstream ASGI app
+            controller: Admission decisions
+            paths: Request paths subject to admission control
+        """
+        self.app = app
+        self.controller = controller
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        rejection = self.controller.admit(_client_id(scope))
+        if rejection is not None:
+            await _reject(send, *rejection)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+
+def _client_id(scope: Scope) -> str | None:
+    """X-Client-Id header, falling back to the peer address."""
+    for name, value in scope["headers"]:
+        if name == b"x-client-id":
+            return value.decode("latin-1")
+    client = scope.get("client")
+    return client[0] if client else None
+
+
+async def _reject(send: Send, status: int, retry_after: float, reason: str) -> None:
+    """Send an error response with a Retry-After header."""
+    body = json.dumps({"detail": reason}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(retry_after)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
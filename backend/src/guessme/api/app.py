@@ -1,23 +1,129 @@
 """FastAPI application for MNIST prediction."""
 
-from fastapi import FastAPI
+import asyncio
+import contextlib
+import json
+import time
+import traceback
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import torch
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import ValidationError
 
-from guessme.api.schemas import PredictRequest, PredictResponse
+from guessme.api.admission import AdmissionController, AdmissionMiddleware
+from guessme.api.codec import (
+    BITMAP,
+    POINTS_DELTA16,
+    PREDICTION_BINARY,
+    decode_bitmap,
+    decode_points,
+    encode_prediction,
+)
+from guessme.api.live import LiveSession
+from guessme.api.ndjson import (
+    NDJSON_MEDIA_TYPE,
+    DuplexStreamingResponse,
+    chunked,
+    read_lines,
+)
+from guessme.api.schemas import ClientMessage, PredictRequest, PredictResponse
+from guessme.config import Settings
+from guessme.metrics import (
+    IN_FLIGHT,
+    POINTS_REMOVED,
+    REGISTRY,
+    REQUEST_POINTS,
+    REQUESTS,
+    STAGE_LATENCY,
+)
+from guessme.model.preprocess import simplify_points
 from guessme.predictor.deployment import Predictor
 
+_PARSE_LATENCY = STAGE_LATENCY.labels("parse")
+_SERIALIZE_LATENCY = STAGE_LATENCY.labels("serialize")
+
 
-def create_app(predictor: Predictor) -> FastAPI:
+def create_app(
+    predictor: Predictor | None = None, settings: Settings | None = None
+) -> FastAPI:
     """Create FastAPI app with predictor dependency.
 
+    When no predictor is given, the lifespan loads one from settings in the
+    background so /health answers while the model loads. Either way the
+    lifespan warms the model up; /ready only succeeds once that finishes,
+    and reports the error if loading or warmup failed.
+
     Args:
-        predictor: The Ray Serve predictor deployment
+        predictor: Preloaded predictor. If None, loaded from settings.
+        settings: Serving settings used to load the predictor
 
     Returns:
         Configured FastAPI app
     """
+    settings = settings or Settings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        task = asyncio.create_task(asyncio.to_thread(start_predictor, app, settings))
+        task.add_done_callback(startup_done)
+        yield
+        # cancel() cannot stop the loading thread; wait for it, so a
+        # predictor created during shutdown is still closed below
+        with contextlib.suppress(Exception):
+            await task
+        if app.state.predictor is not None:
+            app.state.predictor.close()
+
+    def startup_done(task: asyncio.Task) -> None:
+        """Print a failed startup and keep the error for /ready."""
+        if task.cancelled() or task.exception() is None:
+            return
+        error = task.exception()
+        app.state.startup_error = f"{type(error).__name__}: {error}"
+        print(f"Error: model startup failed ({app.state.startup_error})")
+        traceback.print_exception(error)
+
     app = FastAPI(
-        title="Guessme API", description="MNIST digit prediction API", version="0.1.0"
+        title="Guessme API",
+        description="MNIST digit prediction API",
+        version="0.1.0",
+        lifespan=lifespan,
+    )
+    app.state.predictor = predictor
+    app.state.startup = None
+    app.state.startup_error = None
+
+    def service_ms() -> float:
+        """Recent inference time per drawing, spread over the workers."""
+        predictor = app.state.predictor
+        if predictor is None:
+            return 0.0
+        return predictor.batcher.stats.run_ms_per_item / settings.inference_workers
+
+    app.state.admission = AdmissionController(
+        max_depth=settings.max_queue_depth,
+        max_wait_ms=settings.max_queue_wait_ms,
+        client_rate=settings.client_rate,
+        client_burst=settings.client_burst,
+        service_ms=service_ms,
+    )
+    # Innermost middleware: shed before the body is read or a route runs,
+    # while still counting the 503/429 and adding CORS headers to it
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=app.state.admission,
+        paths=("/predict", "/predict/batch"),
     )
 
     app.add_middleware(
@@ -28,23 +134,378 @@ def create_app(predictor: Predictor) -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Filled once the routes below are registered
+    route_paths: set[str] = set()
+
+    @app.middleware("http")
+    async def track_requests(request: Request, call_next):
+        """Count requests and track in-flight requests."""
+        request.state.start = time.perf_counter()
+        path = request.url.path
+        if path not in route_paths:
+            path = "other"  # bound label cardinality
+
+        IN_FLIGHT.inc()
+        try:
+            response = await call_next(request)
+        except Exception:
+            REQUESTS.labels(path, 500).inc()
+            raise
+        finally:
+            IN_FLIGHT.dec()
+        REQUESTS.labels(path, response.status_code).inc()
+        return response
+
+    @app.get("/metrics")
+    async def metrics() -> Response:
+        """Prometheus metrics in text exposition format."""
+        return Response(
+            REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
     @app.get("/health")
     async def health() -> dict:
         """Health check endpoint."""
         return {"status": "ok"}
 
-    @app.post("/predict", response_model=PredictResponse)
-    async def predict(request: PredictRequest) -> PredictResponse:
-        """Predict digit from canvas points.
+    @app.get("/ready")
+    async def ready() -> dict:
+        """Readiness endpoint: succeeds once the model is loaded and warm."""
+        if app.state.startup_error is not None:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Model failed to load: {app.state.startup_error}",
+            )
+        if app.state.startup is None:
+            raise HTTPException(status_code=503, detail="Model warming up")
+        return {"status": "ready", **app.state.startup}
+
+    @app.post(
+        "/predict",
+        response_model=PredictResponse,
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {"schema": PredictRequest.model_json_schema()},
+                    POINTS_DELTA16: {"schema": {"type": "string", "format": "binary"}},
+                    BITMAP: {"schema": {"type": "string", "format": "binary"}},
+                },
+            },
+            "responses": {
+                "200": {"content": {PREDICTION_BINARY: {}}},
+            },
+        },
+    )
+    async def predict(request: Request) -> Response:
+        """Predict digit from canvas points or a client-rasterized bitmap.
+
+        The body is a PredictRequest as JSON, delta-encoded int16 points
+        (application/x-guessme-points-delta16), or a 28x28 stroke bitmap
+        (application/x-guessme-bitmap) that skips server-side rasterization.
+        The response is JSON, or two bytes (digit, confidence) when the
+        client accepts application/x-guessme-prediction; without an Accept
+        header it mirrors the request encoding.
+
+        Bodies over max_body_bytes and drawings over max_points are
+        rejected with 413. Points that cannot change the raster are dropped
+        before preprocessing; the X-Points-Removed header reports how many.
 
         Args:
-            request: Canvas points
+            request: HTTP request carrying the drawing
 
         Returns:
             Predicted digit and confidence
         """
-        points = [{"x": p.x, "y": p.y} for p in request.points]
-        result = predictor.predict(points)
-        return PredictResponse(**result)
+        media_type = _media_type(request.headers.get("content-type"))
+        body = await _read_body(request, settings.max_body_bytes)
+        drawing = _read_drawing(media_type, body)
+        headers = {}
+        if media_type != BITMAP:
+            REQUEST_POINTS.observe(len(drawing))
+            drawing, removed = _ingest(drawing, settings.max_points)
+            headers["X-Points-Removed"] = str(removed)
+        _PARSE_LATENCY.observe(time.perf_counter() - request.state.start)
+
+        predictor = app.state.predictor
+        if predictor is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Model loading",
+                headers={"Retry-After": "1"},
+            )
+        if media_type == BITMAP:
+            result = await predictor.predict_bitmap_async(drawing)
+        else:
+            result = await predictor.predict_async(drawing)
+
+        with _SERIALIZE_LATENCY.time():
+            if _accepts_binary(request):
+                return Response(
+                    encode_prediction(result),
+                    media_type=PREDICTION_BINARY,
+                    headers=headers,
+                )
+            content = PredictResponse(**result).model_dump_json()
+        return Response(content, media_type="application/json", headers=headers)
+
+    @app.post(
+        "/predict/batch",
+        response_class=DuplexStreamingResponse,
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {
+                    NDJSON_MEDIA_TYPE: {
+                        "schema": PredictRequest.model_json_schema(),
+                    }
+                },
+            }
+        },
+    )
+    async def predict_batch(request: Request) -> DuplexStreamingResponse:
+        """Predict many drawings, streaming results as NDJSON.
+
+        The body holds one PredictRequest JSON object per line. Drawings are
+        read as they arrive and predicted in chunks of batch_chunk_size with
+        one forward pass each; each chunk's results are streamed back while
+        the next chunk is read, so memory stays bounded for any upload size.
+        Every output line carries the input line's index (zero-based,
+        counting blank lines, which get no output) and either digit and
+        confidence or an error.
+        """
+        predictor = app.state.predictor
+        if predictor is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Model loading",
+                headers={"Retry-After": "1"},
+            )
+        loop = asyncio.get_running_loop()
+        admission = app.state.admission
+
+        def run_chunk(lines: list[tuple[int, bytes | None]]) -> bytes:
+            """Parse and predict one chunk of lines, encoding all results."""
+            drawings = [_parse_drawing(line, settings) for _, line in lines]
+            valid = [d for d in drawings if not isinstance(d, str)]
+            predictions = iter(predictor.predict_batch(valid) if valid else [])
+            results = [
+                {"index": index, "error": d}
+                if isinstance(d, str)
+                else {"index": index, **next(predictions)}
+                for (index, _), d in zip(lines, drawings, strict=True)
+            ]
+            return "".join(json.dumps(r) + "\n" for r in results).encode()
+
+        async def stream() -> AsyncIterator[bytes]:
+            pending: asyncio.Future | None = None
+            lines = read_lines(request.stream(), settings.max_line_bytes)
+            async for chunk in chunked(lines, settings.batch_chunk_size):
+                # Start this chunk, then emit the previous one while it runs
+                future = loop.run_in_executor(predictor.executor, run_chunk, chunk)
+                # Weigh this request by the drawings it queues (see admission)
+                count = len(chunk)
+                admission.add_items(count)
+                future.add_done_callback(lambda _, n=count: admission.remove_items(n))
+                if pending is not None:
+                    yield await pending
+                pending = future
+
+            if pending is not None:
+                yield await pending
+
+        return DuplexStreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE)
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket) -> None:
+        """Live predictions while the user draws.
+
+        Clients send stroke, submit and clear messages. Each client's
+        drawing is kept server-side, so strokes only carry new points;
+        the server replies with throttled "predictions" messages and a
+        "final" message on submit.
+
+        Messages are held to the REST limits: over max_body_bytes, or a
+        stroke over max_points, closes the connection with 1009, and
+        strokes are simplified like /predict drawings. A connection may
+        use at most max_live_sessions client IDs (1008 beyond that).
+        """
+        await websocket.accept()
+        sessions: dict[str, LiveSession] = {}
+        try:
+            while True:
+                text = await websocket.receive_text()
+                if len(text.encode()) > settings.max_body_bytes:
+                    limit = settings.max_body_bytes
+                    await websocket.close(
+                        code=1009, reason=f"Message exceeds {limit} bytes"
+                    )
+                    return
+                try:
+                    message = ClientMessage.model_validate_json(text)
+                except ValidationError as e:
+                    await websocket.close(code=1003, reason=str(e)[:120])
+                    return
 
+                session = sessions.get(message.clientId)
+                if session is None:
+                    if len(sessions) >= settings.max_live_sessions:
+                        limit = settings.max_live_sessions
+                        await websocket.close(
+                            code=1008, reason=f"More than {limit} client IDs"
+                        )
+                        return
+                    session = sessions[message.clientId] = LiveSession(
+                        message.clientId,
+                        lambda: app.state.predictor,
+                        websocket.send_json,
+                        interval_ms=settings.live_interval_ms,
+                    )
+
+                if message.type == "stroke":
+                    if message.data is not None:
+                        try:
+                            points, _ = _ingest(
+                                message.data.points, settings.max_points
+                            )
+                        except HTTPException as e:
+                            await websocket.close(code=1009, reason=e.detail[:120])
+                            return
+                        session.stroke(points)
+                elif message.type == "clear":
+                    session.clear()
+                elif not await session.submit():
+                    await websocket.close(code=1013, reason="Model loading")
+                    return
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for session in sessions.values():
+                session.cancel()
+
+    route_paths.update(route.path for route in app.routes)
     return app
+
+
+def _media_type(content_type: str | None) -> str:
+    """Media type of a Content-Type header, defaulting to JSON."""
+    return (content_type or "application/json").split(";")[0].strip()
+
+
+async def _read_body(request: Request, limit: int) -> bytes:
+    """Read the request body, failing with 413 once it exceeds limit bytes."""
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > limit:
+        raise HTTPException(status_code=413, detail=f"Body exceeds {limit} bytes")
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise HTTPException(status_code=413, detail=f"Body exceeds {limit} bytes")
+    return bytes(body)
+
+
+def _ingest(points: torch.Tensor, max_points: int) -> tuple[torch.Tensor, int]:
+    """Enforce the point limit and drop points that cannot change the raster.
+
+    Returns:
+        (points, removed): the kept points and how many were dropped
+
+    Raises:
+        HTTPException: 413 if there are more than max_points points
+    """
+    if len(points) > max_points:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Drawing has {len(points)} points, limit is {max_points}",
+        )
+    kept = simplify_points(points)
+    removed = len(points) - len(kept)
+    POINTS_REMOVED.inc(removed)
+    return kept, removed
+
+
+def _read_drawing(media_type: str, body: bytes) -> torch.Tensor:
+    """Decode a /predict body according to its media type.
+
+    Returns:
+        (N, 2) canvas points, or a (28, 28) bitmap for BITMAP bodies
+
+    Raises:
+        RequestValidationError: If a JSON body is not a valid PredictRequest
+        HTTPException: 400 for a malformed binary body, 415 for other types
+    """
+    decoders = {POINTS_DELTA16: decode_points, BITMAP: decode_bitmap}
+    if media_type in decoders:
+        try:
+            return decoders[media_type](body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+    if media_type != "application/json" and not media_type.endswith("+json"):
+        raise HTTPException(
+            status_code=415, detail=f"Unsupported content type {media_type!r}"
+        )
+
+    try:
+        return PredictRequest.model_validate_json(body).points
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in errors],
+            body=body,
+        ) from e
+
+
+def _accepts_binary(request: Request) -> bool:
+    """Whether to answer /predict with a binary prediction."""
+    accept = request.headers.get("accept", "")
+    if PREDICTION_BINARY in accept:
+        return True
+    if "json" in accept:
+        return False
+    return _media_type(request.headers.get("content-type")) in (POINTS_DELTA16, BITMAP)
+
+
+def _parse_drawing(line: bytes | None, settings: Settings) -> torch.Tensor | str:
+    """Parse one NDJSON line into points, or an error message."""
+    if line is None:
+        return f"line exceeds {settings.max_line_bytes} bytes"
+    try:
+        points = PredictRequest.model_validate_json(line).points
+        return _ingest(points, settings.max_points)[0]
+    except ValidationError as e:
+        return e.errors(include_url=False)[0]["msg"]
+    except HTTPException as e:
+        return e.detail
+
+
+def start_predictor(app: FastAPI, settings: Settings) -> None:
+    """Load (if needed) and warm up the predictor, then mark the app ready.
+
+    Runs in a worker thread during the app lifespan. Startup timings are
+    printed and kept in app.state.startup for /ready.
+    """
+    start = time.perf_counter()
+    if app.state.predictor is None:
+        app.state.predictor = Predictor.from_settings(settings)
+    predictor = app.state.predictor
+    load_ms = (time.perf_counter() - start) * 1000
+
+    warmup_ms = predictor.warmup()
+
+    # A timed single prediction shows what the first real request will cost
+    first_start = time.perf_counter()
+    predictor.predict([{"x": 200, "y": 100}, {"x": 200, "y": 300}])
+    first_request_ms = (time.perf_counter() - first_start) * 1000
+
+    app.state.startup = {
+        "load_ms": round(load_ms, 1),
+        "warmup_ms": round(warmup_ms, 1),
+        "first_request_ms": round(first_request_ms, 2),
+        "startup_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+    print(
+        f"Model ready: load {load_ms:.1f}ms | warmup {warmup_ms:.1f}ms | "
+        f"first request {first_request_ms:.2f}ms"
+    )
@@ -0,0 +1,114 @@
+"""Compact binary encodings for /predict requests and responses.
+
+Drawings are sent either as points or as a client-rasterized bitmap.
+
+Points are sent as int16 (x, y) pairs in canvas pixels: the first pair is
+absolute, every following pair is the delta from the previous point.
+Mouse samples are close together, so deltas stay small, and decoding is a
+single buffer copy and cumulative sum with no per-point Python objects.
+Integers are little-endian, the byte order of every host we run on, so
+buffers are used as-is.
+"""
+
+import torch
+
+# Request body: delta-encoded int16 points
+POINTS_DELTA16 = "application/x-guessme-points-delta16"
+# Request body: client-rasterized 28x28 stroke bitmap
+BITMAP = "application/x-guessme-bitmap"
+# Response body: two bytes, digit then confidence (0-100)
+PREDICTION_BINARY = "application/x-guessme-prediction"
+
+_INT16_MIN, _INT16_MAX = -(2**15), 2**15 - 1
+
+
+def encode_points(points: torch.Tensor) -> bytes:
+    """Encode canvas points as delta-encoded int16 pairs.
+
+    Coordinates are rounded to whole canvas pixels.
+
+    Args:
+        points: (N, 2) tensor of canvas (x, y)
+
+    Returns:
+        Encoded body, 4 bytes per point
+
+    Raises:
+        ValueError: If a coordinate or delta does not fit in int16
+    """
+    coords = points.round().to(torch.int32).view(-1, 2)
+    deltas = torch.cat([coords[:1], coords.diff(dim=0)])
+    if deltas.numel() and (deltas.min() < _INT16_MIN or deltas.max() > _INT16_MAX):
+        raise ValueError("point coordinates must fit in int16 deltas")
+    return bytes(deltas.to(torch.int16).untyped_storage())
+
+
+def decode_points(body: bytes) -> torch.Tensor:
+    """Decode delta-encoded int16 pairs into canvas points.
+
+    Args:
+        body: Encoded body, 4 bytes per point
+
+    Returns:
+        Float32 tensor of shape (N, 2)
+
+    Raises:
+        ValueError: If the body length is not a multiple of 4 bytes
+    """
+    if len(body) % 4:
+        raise ValueError("body must hold whole int16 (x, y) pairs")
+    if not body:
+        return torch.zeros(0, 2)
+    deltas = torch.frombuffer(bytearray(body), dtype=torch.int16).view(-1, 2)
+    return deltas.to(torch.int32).cumsum(dim=0).to(torch.float32)
+
+
+def encode_bitmap(image: torch.Tensor, packed: bool = True) -> bytes:
+    """Encode a 28x28 stroke bitmap.
+
+    Args:
+        image: (28, 28) tensor with values in 0-1
+        packed: If True, one bit per pixel (98 bytes, set where the pixel
+            is nonzero); otherwise one uint8 per pixel (784 bytes, 0-255)
+
+    Returns:
+        Encoded body, rows top to bottom, most significant bit first
+    """
+    if not packed:
+        pixels = (image.reshape(784) * 255).round().to(torch.uint8)
+        return bytes(pixels.untyped_storage())
+    bits = (image.reshape(98, 8) > 0).to(torch.uint8)
+    packed_bytes = (bits << torch.arange(7, -1, -1, dtype=torch.uint8)).sum(dim=1)
+    return bytes(packed_bytes.to(torch.uint8).untyped_storage())
+
+
+def decode_bitmap(body: bytes) -> torch.Tensor:
+    """Decode a packed-bit (98 bytes) or uint8 (784 bytes) 28x28 bitmap.
+
+    Args:
+        body: Encoded bitmap, rows top to bottom
+
+    Returns:
+        Float32 tensor of shape (28, 28) with values in 0-1
+
+    Raises:
+        ValueError: If the body is neither 98 nor 784 bytes long
+    """
+    if len(body) not in (98, 784):
+        raise ValueError("bitmap must be 98 packed bytes or 784 uint8 pixels")
+    data = torch.frombuffer(bytearray(body), dtype=torch.uint8)
+    if len(body) == 784:
+        return (data.to(torch.float32) / 255).view(28, 28)
+    bits = (data[:, None] >> torch.arange(7, -1, -1, dtype=torch.uint8)) & 1
+    return bits.to(torch.float32).view(28, 28)
+
+
+def encode_prediction(result: dict) -> bytes:
+    """Encode {"digit", "confidence"} as two bytes."""
+    return bytes((result["digit"], result["confidence"]))
+
+
+def decode_prediction(body: bytes) -> dict:
+    """Decode a two-byte prediction into {"digit", "confidence"}."""
+    digit, confidence = body
+    return {"digit": digit, "confidence": confidence}
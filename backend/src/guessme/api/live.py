@@ -0,0 +1,128 @@
+"""Live prediction sessions for the /ws endpoint."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+import torch
+
+from guessme.api.schemas import Prediction
+from guessme.model.preprocess import StrokeRaster
+from guessme.predictor.deployment import Predictor
+
+# Candidates sent in each live "predictions" message
+TOP_K = 3
+
+
+def to_predictions(probs: torch.Tensor, k: int = TOP_K) -> list[Prediction]:
+    """Convert class probabilities to the k most likely predictions.
+
+    Args:
+        probs: (10,) tensor of class probabilities
+        k: Number of candidates to return
+
+    Returns:
+        Predictions sorted by descending confidence
+    """
+    confidence, digit = torch.topk(probs, k)
+    return [
+        Prediction(label=str(d), confidence=int(c * 100))
+        for d, c in zip(digit.tolist(), confidence.tolist(), strict=True)
+    ]
+
+
+class LiveSession:
+    """Drawing state and live prediction scheduling for one client.
+
+    Strokes are rasterized as they arrive, and each prediction builds its
+    model input from the raster without revisiting earlier points. Live
+    predictions are coalesced: at most one runs at a time, strokes arriving
+    meanwhile are folded into the next one, and consecutive predictions are
+    at least interval_ms apart. A fast drawer therefore triggers a bounded
+    number of forward passes no matter how many stroke messages it sends.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        get_predictor: Callable[[], Predictor | None],
+        send: Callable[[dict], Awaitable[None]],
+        interval_ms: float = 100.0,
+    ) -> None:
+        """Create an empty session.
+
+        Args:
+            client_id: Client identifier echoed in every reply
+            get_predictor: Returns the current predictor, or None if loading
+            send: Coroutine sending a JSON message to the client
+            interval_ms: Minimum time between live predictions
+        """
+        self.client_id = client_id
+        self.get_predictor = get_predictor
+        self.send = send
+        self.interval = interval_ms / 1000
+        self.raster = StrokeRaster()
+
+        self._dirty = False
+        self._last_run = -float("inf")
+        self._task: asyncio.Task | None = None
+
+    def stroke(self, points: torch.Tensor) -> None:
+        """Add a stroke and schedule a live prediction.
+
+        Args:
+            points: (N, 2) float32 tensor of canvas (x, y)
+        """
+        self.raster.append(points)
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._live())
+
+    async def submit(self) -> bool:
+        """Send the final prediction for the current drawing.
+
+        Returns:
+            False if no model is loaded yet, True otherwise
+        """
+        predictor = self.get_predictor()
+        if predictor is None:
+            return False
+
+        self.cancel()
+        probs = await predictor.classify_image_async(self.raster.to_tensor())
+        best = to_predictions(probs, k=1)[0]
+        await self.send(self._message("final", best.model_dump()))
+        return True
+
+    def clear(self) -> None:
+        """Erase the drawing and drop any pending live prediction."""
+        self.cancel()
+        self.raster.clear()
+
+    def cancel(self) -> None:
+        """Stop the live prediction task, if any."""
+        self._dirty = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _live(self) -> None:
+        """Send live predictions until no new strokes are pending."""
+        while self._dirty:
+            delay = self._last_run + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            predictor = self.get_predictor()
+            if predictor is None:
+                return  # Model still loading; the next stroke retries
+
+            self._dirty = False
+            self._last_run = time.monotonic()
+            probs = await predictor.classify_image_async(self.raster.to_tensor())
+            predictions = [p.model_dump() for p in to_predictions(probs)]
+            await self.send(self._message("predictions", predictions))
+
+    def _message(self, type: str, data: object) -> dict:
+        """Build a server message for this client."""
+        return {"clientId": self.client_id, "type": type, "data": data}
@@ -0,0 +1,91 @@
+"""Newline-delimited JSON streaming helpers for /predict/batch."""
+
+from collections.abc import AsyncIterable, AsyncIterator
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def read_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    """Split a byte stream into lines without buffering the whole stream.
+
+    At most one line (plus one network chunk) is held in memory. Lines
+    longer than max_line_bytes are discarded as they arrive and reported
+    as None so the caller can emit an error for them. Blank lines are
+    skipped but still counted, so line numbers match the input.
+
+    Args:
+        chunks: Request body chunks, e.g. Request.stream()
+        max_line_bytes: Maximum accepted line length
+
+    Yields:
+        (number, line) for each non-blank line: its zero-based position
+        among all input lines, and the line without its newline, or None
+        if it was too long
+    """
+    buffer = bytearray()
+    oversized = False
+    number = 0
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            if not oversized:
+                buffer += chunk[start:end]
+            if oversized or len(buffer) > max_line_bytes:
+                yield number, None
+            elif buffer.strip():
+                yield number, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            number += 1
+            start = end + 1
+
+        if not oversized:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                buffer.clear()
+                oversized = True
+
+    if oversized:
+        yield number, None
+    elif buffer.strip():
+        yield number, bytes(buffer)
+
+
+async def chunked[T](items: AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    """Group an async stream into lists of up to size items.
+
+    Args:
+        items: Items to group
+        size: Maximum items per list
+
+    Yields:
+        Consecutive lists of items; only the last may be shorter than size
+    """
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """Streaming response whose body may be produced while reading the request.
+
+    StreamingResponse watches for client disconnects by consuming receive()
+    while it streams, which would steal request body chunks from a
+    generator still reading them. This response only streams; a client
+    that goes away surfaces as an error when reading or sending.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
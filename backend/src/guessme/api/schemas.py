@@ -1,6 +1,9 @@
 """Pydantic schemas for API requests and responses."""
 
-from pydantic import BaseModel
+from typing import Annotated, Any, Literal
+
+import torch
+from pydantic import BaseModel, PlainSerializer, PlainValidator, WithJsonSchema
 
 
 class Point(BaseModel):
@@ -10,10 +13,57 @@ class Point(BaseModel):
     y: float
 
 
+def parse_points(value: Any) -> torch.Tensor:
+    """Parse a JSON list of {"x", "y"} objects into an (N, 2) float32 tensor.
+
+    Coordinates go straight into one packed buffer; no per-point model
+    objects are created. Like Point, numeric strings such as "1.5" are
+    accepted as coordinates.
+
+    Args:
+        value: Decoded JSON value for the points field
+
+    Returns:
+        Float32 tensor of shape (N, 2)
+
+    Raises:
+        ValueError: If value is not a list of points with finite numeric x, y
+    """
+    if isinstance(value, torch.Tensor):
+        return value.to(torch.float32).view(-1, 2)
+    if not isinstance(value, list):
+        raise ValueError("points must be a list")
+    error = "each point must be an object with numeric x and y"
+    try:
+        coords = [v for p in value for v in (p["x"], p["y"])]
+    except (KeyError, TypeError) as e:
+        raise ValueError(error) from e
+    try:
+        # torch.tensor misreads strings, so numeric strings are converted first
+        coords = [float(v) if isinstance(v, str) else v for v in coords]
+        points = torch.tensor(coords, dtype=torch.float32).view(-1, 2)
+    except (TypeError, ValueError) as e:
+        raise ValueError(error) from e
+    if not torch.isfinite(points).all():
+        raise ValueError("point coordinates must be finite")
+    return points
+
+
+# (N, 2) float32 tensor of canvas (x, y), validated from [{"x", "y"}, ...]
+PointArray = Annotated[
+    torch.Tensor,
+    PlainValidator(parse_points),
+    PlainSerializer(
+        lambda t: [{"x": x, "y": y} for x, y in t.tolist()], return_type=list
+    ),
+    WithJsonSchema({"type": "array", "items": Point.model_json_schema()}),
+]
+
+
 class PredictRequest(BaseModel):
     """Request body for /predict endpoint."""
 
-    points: list[Point]
+    points: PointArray
 
 
 class PredictResponse(BaseModel):
@@ -21,3 +71,27 @@ class PredictResponse(BaseModel):
 
     digit: int
     confidence: int  # 0-100
+
+
+# === WebSocket messages ===
+
+
+class StrokeData(BaseModel):
+    """Payload of a stroke message."""
+
+    points: PointArray
+
+
+class ClientMessage(BaseModel):
+    """Message sent by the client over /ws."""
+
+    clientId: str  # camelCase to match the frontend protocol
+    type: Literal["stroke", "submit", "clear"]
+    data: StrokeData | None = None
+
+
+class Prediction(BaseModel):
+    """One candidate digit in a WebSocket reply."""
+
+    label: str
+    confidence: int  # 0-100
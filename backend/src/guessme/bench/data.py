@@ -0,0 +1,71 @@
+"""Benchmark MNIST data loading: torchvision per-sample vs memory-mapped tensors.
+
+Times one pass over the training set with each loader, with and without a
+training step, so the share of epoch time spent loading data is visible.
+Downloads MNIST on first run.
+
+Usage:
+    uv run python -m guessme.bench.data
+"""
+
+import time
+from itertools import islice
+
+import torch
+import torch.nn as nn
+
+from guessme.model.cnn import MNISTNet
+from guessme.model.train import get_dataloaders
+
+
+def time_epoch(loader, step=None, max_batches: int | None = None) -> tuple[float, int]:
+    """Iterate over a loader, optionally running step on every batch.
+
+    Returns:
+        (seconds, images seen)
+    """
+    images_seen = 0
+    start = time.perf_counter()
+    for images, labels in islice(loader, max_batches):
+        if step is not None:
+            step(images, labels)
+        images_seen += len(images)
+    return time.perf_counter() - start, images_seen
+
+
+def main(batch_size: int = 64, max_batches: int | None = None) -> None:
+    """Print images/second for each data mode, loading only and training.
+
+    Args:
+        batch_size: Images per batch
+        max_batches: Stop each pass after this many batches (None = full epoch)
+    """
+    model = MNISTNet()
+    criterion = nn.CrossEntropyLoss()
+    optimizer = torch.optim.Adam(model.parameters())
+
+    def step(images: torch.Tensor, labels: torch.Tensor) -> None:
+        optimizer.zero_grad()
+        criterion(model(images), labels).backward()
+        optimizer.step()
+
+    print(f"{'mode':>12} | {'load img/s':>11} | {'train img/s':>11}")
+    print("-" * 40)
+    for mode in ("torchvision", "tensor"):
+        train_loader, _ = get_dataloaders(batch_size, mode)
+        load_s, n = time_epoch(train_loader, max_batches=max_batches)
+        train_s, m = time_epoch(train_loader, step, max_batches=max_batches)
+        print(f"{mode:>12} | {n / load_s:>11.0f} | {m / train_s:>11.0f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark MNIST data loading")
+    parser.add_argument("--batch-size", type=int, default=64, help="Batch size")
+    parser.add_argument(
+        "--max-batches", type=int, help="Batches per pass (default: full epoch)"
+    )
+    args = parser.parse_args()
+
+    main(batch_size=args.batch_size, max_batches=args.max_batches)
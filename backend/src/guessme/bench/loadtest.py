@@ -0,0 +1,484 @@
+"""End-to-end load test of the HTTP API with latency percentiles.
+
+Boots guessme.main:app, the Dockerfile's entry point, under uvicorn in a
+subprocess (or targets --url), replays drawings against /predict from many
+concurrent connections at increasing concurrency levels, and reports
+throughput, p50/p95/p99 latency and error rates. Results are saved as JSON so runs can be compared between commits.
+Everything runs locally; no network access or dataset download is needed.
+
+The load generator is a single asyncio process, so at high concurrency it
+can become the bottleneck itself; compare runs made on the same machine.
+The corpus is replayed round-robin, so after the first pass every request
+hits the result cache; set GUESSME_CACHE_SIZE=0 to load the model instead.
+
+Usage:
+    uv run python -m guessme.bench.loadtest
+    uv run python -m guessme.bench.loadtest --concurrency 1 8 64 --duration 10
+    uv run python -m guessme.bench.loadtest --compare loadtest-<commit>.json
+"""
+
+import asyncio
+import itertools
+import json
+import math
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+import torch
+
+from guessme.api.codec import BITMAP, POINTS_DELTA16, encode_bitmap, encode_points
+from guessme.model.preprocess import CANVAS_SIZE, rasterize, scale_points
+
+# === Drawing Corpus ===
+
+# Pen strokes for each digit as control points in a unit square
+DIGIT_STROKES: dict[int, list[list[tuple[float, float]]]] = {
+    0: [
+        [
+            (0.5, 0.0),
+            (0.1, 0.3),
+            (0.1, 0.7),
+            (0.5, 1.0),
+            (0.9, 0.7),
+            (0.9, 0.3),
+            (0.5, 0.0),
+        ]
+    ],
+    1: [[(0.3, 0.2), (0.5, 0.0), (0.5, 1.0)]],
+    2: [[(0.1, 0.2), (0.5, 0.0), (0.9, 0.2), (0.8, 0.5), (0.1, 1.0), (0.9, 1.0)]],
+    3: [[(0.1, 0.1), (0.8, 0.1), (0.4, 0.45), (0.9, 0.7), (0.5, 1.0), (0.1, 0.9)]],
+    4: [[(0.6, 0.0), (0.1, 0.65), (0.9, 0.65)], [(0.65, 0.3), (0.65, 1.0)]],
+    5: [[(0.9, 0.0), (0.2, 0.0), (0.15, 0.45), (0.8, 0.5), (0.8, 0.9), (0.1, 1.0)]],
+    6: [[(0.8, 0.0), (0.2, 0.4), (0.15, 0.9), (0.5, 1.0), (0.85, 0.75), (0.2, 0.6)]],
+    7: [[(0.1, 0.0), (0.9, 0.0), (0.4, 1.0)]],
+    8: [
+        [(0.5, 0.5), (0.15, 0.25), (0.5, 0.0), (0.85, 0.25), (0.5, 0.5)],
+        [(0.5, 0.5), (0.1, 0.75), (0.5, 1.0), (0.9, 0.75), (0.5, 0.5)],
+    ],
+    9: [[(0.85, 0.35), (0.5, 0.0), (0.15, 0.3), (0.5, 0.5), (0.85, 0.3), (0.75, 1.0)]],
+}
+
+
+def synthetic_drawing(digit: int, rng: random.Random) -> list[dict]:
+    """Draw a digit the way a mouse or finger samples it.
+
+    The digit's control points are jittered, scaled and placed on the
+    canvas, then each segment is sampled every few pixels with a little
+    hand tremor, giving drawings of roughly 50-300 points like real clients
+    send.
+
+    Args:
+        digit: Digit to draw (0-9)
+        rng: Random source
+
+    Returns:
+        List of {"x": float, "y": float} in canvas coordinates
+    """
+    size = rng.uniform(0.4, 0.8) * CANVAS_SIZE
+    left = rng.uniform(0, CANVAS_SIZE - size * 0.8)
+    top = rng.uniform(0, CANVAS_SIZE - size)
+    points = []
+
+    def add(x: float, y: float) -> None:
+        points.append(
+            {"x": min(CANVAS_SIZE, max(0.0, x)), "y": min(CANVAS_SIZE, max(0.0, y))}
+        )
+
+    for stroke in DIGIT_STROKES[digit]:
+        anchors = [
+            (
+                left + (x + rng.gauss(0, 0.04)) * size * 0.8,
+                top + (y + rng.gauss(0, 0.04)) * size,
+            )
+            for x, y in stroke
+        ]
+        for (x0, y0), (x1, y1) in itertools.pairwise(anchors):
+            steps = max(1, int(math.dist((x0, y0), (x1, y1)) / rng.uniform(3, 8)))
+            for i in range(steps):
+                t = i / steps
+                add(
+                    x0 + (x1 - x0) * t + rng.gauss(0, 0.7),
+                    y0 + (y1 - y0) * t + rng.gauss(0, 0.7),
+                )
+        add(*anchors[-1])
+    return points
+
+
+def synthetic_corpus(size: int, seed: int = 0) -> list[list[dict]]:
+    """Generate size drawings cycling through the ten digits."""
+    rng = random.Random(seed)
+    return [synthetic_drawing(i % 10, rng) for i in range(size)]
+
+
+def load_corpus(path: Path) -> list[list[dict]]:
+    """Load drawings from an NDJSON file of PredictRequest objects.
+
+    The format matches /predict/batch request bodies, one
+    {"points": [...]} object per line.
+    """
+    with path.open() as f:
+        return [json.loads(line)["points"] for line in f if line.strip()]
+
+
+def encode_request(points: list[dict], encoding: str) -> tuple[bytes, str]:
+    """Encode a drawing as a /predict body.
+
+    Args:
+        points: Canvas points
+        encoding: "json", "delta16" or "bitmap"
+
+    Returns:
+        (body, content type)
+    """
+    if encoding == "json":
+        return json.dumps({"points": points}).encode(), "application/json"
+    coords = torch.tensor([[p["x"], p["y"]] for p in points], dtype=torch.float32)
+    if encoding == "delta16":
+        return encode_points(coords), POINTS_DELTA16
+    if encoding == "bitmap":
+        return encode_bitmap(rasterize(scale_points(coords))), BITMAP
+    raise ValueError(f"Unknown encoding {encoding!r}")
+
+
+# === Load Generation ===
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values (0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(
+    concurrency: int,
+    latencies_ms: list[float],
+    statuses: Counter,
+    elapsed_s: float,
+) -> dict:
+    """Summarize one concurrency level.
+
+    Args:
+        concurrency: Concurrent connections used
+        latencies_ms: Latency of every measured request, errors included
+        statuses: Count per HTTP status, or per exception name on failure
+        elapsed_s: Length of the measurement window
+
+    Returns:
+        Throughput, error rate, latency percentiles and status counts
+    """
+    requests = sum(statuses.values())
+    ok = statuses.get("200", 0)
+    latencies = sorted(latencies_ms)
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": requests - ok,
+        "error_rate": (requests - ok) / requests if requests else 0.0,
+        "throughput_rps": ok / elapsed_s if elapsed_s else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0,
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+        },
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    bodies: list[tuple[bytes, str]],
+    concurrency: int,
+    duration_s: float,
+    warmup_s: float = 1.0,
+) -> dict:
+    """Send requests from concurrency closed-loop workers for a while.
+
+    Each worker sends its next request as soon as the previous one
+    completes. Requests that finish during the first warmup_s seconds are
+    not measured.
+
+    Args:
+        client: HTTP client whose base URL is the server
+        bodies: Encoded (body, content type) pairs, replayed round-robin
+        concurrency: Number of concurrent workers
+        duration_s: Measurement window after warmup
+        warmup_s: Unmeasured ramp-up time
+
+    Returns:
+        summarize() of the measured requests
+    """
+    latencies_ms: list[float] = []
+    statuses: Counter = Counter()
+    start = time.perf_counter()
+    measure_from = start + warmup_s
+    stop_at = measure_from + duration_s
+
+    async def worker(offset: int) -> None:
+        i = offset
+        while (sent := time.perf_counter()) < stop_at:
+            body, content_type = bodies[i % len(bodies)]
+            i += concurrency
+            try:
+                response = await client.post(
+                    "/predict",
+                    content=body,
+                    headers={"Content-Type": content_type, "X-Client-Id": str(offset)},
+                )
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            done = time.perf_counter()
+            if done >= measure_from:
+                latencies_ms.append((done - sent) * 1000)
+                statuses[status] += 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - measure_from
+    return summarize(concurrency, latencies_ms, statuses, elapsed)
+
+
+async def run(
+    url: str,
+    bodies: list[tuple[bytes, str]],
+    levels: list[int],
+    duration_s: float,
+    warmup_s: float,
+) -> list[dict]:
+    """Run every concurrency level in turn, printing a row for each."""
+    print(
+        f"{'conc':>6} | {'req/s':>9} | {'p50 ms':>8} | {'p95 ms':>8} | "
+        f"{'p99 ms':>8} | {'errors':>7}"
+    )
+    print("-" * 62)
+    results = []
+    for concurrency in levels:
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(
+            base_url=url, limits=limits, timeout=30.0
+        ) as client:
+            level = await run_level(client, bodies, concurrency, duration_s, warmup_s)
+        latency = level["latency_ms"]
+        print(
+            f"{concurrency:>6} | {level['throughput_rps']:>9.1f} | "
+            f"{latency['p50']:>8.2f} | {latency['p95']:>8.2f} | "
+            f"{latency['p99']:>8.2f} | {level['error_rate']:>6.1%}"
+        )
+        results.append(level)
+    return results
+
+
+# === Server ===
+
+
+def free_port() -> int:
+    """Ask the OS for an unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_server(timeout_s: float = 120.0) -> Iterator[tuple[str, dict]]:
+    """Run guessme.main:app under uvicorn in a subprocess until the block exits.
+
+    Like the Dockerfile's server, it reads its GUESSME_* settings from the
+    environment, which it inherits from this process.
+
+    Yields:
+        (base URL, /ready response body with startup timings)
+
+    Raises:
+        RuntimeError: If the server exits or is not ready within timeout_s
+    """
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "guessme.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ]
+    )
+    try:
+        deadline = time.monotonic() + timeout_s
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            try:
+                response = httpx.get(f"{url}/ready")
+                if response.status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Server not ready after {timeout_s}s")
+            time.sleep(0.1)
+        yield url, response.json()
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+# === Reporting ===
+
+
+def git_commit() -> str | None:
+    """Current git commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict) -> None:
+    """Print per-level throughput and tail latency changes vs a baseline run."""
+    previous = {level["concurrency"]: level for level in baseline["levels"]}
+    print(f"\nvs {baseline.get('commit') or 'baseline'}:")
+    print(f"{'conc':>6} | {'req/s':>9} | {'p50':>8} | {'p99':>8}")
+    print("-" * 40)
+
+    def change(new: float, old: float) -> str:
+        return f"{(new - old) / old:+.1%}" if old else "n/a"
+
+    for level in current["levels"]:
+        old = previous.get(level["concurrency"])
+        if old is None:
+            continue
+        print(
+            f"{level['concurrency']:>6} | "
+            f"{change(level['throughput_rps'], old['throughput_rps']):>9} | "
+            f"{change(level['latency_ms']['p50'], old['latency_ms']['p50']):>8} | "
+            f"{change(level['latency_ms']['p99'], old['latency_ms']['p99']):>8}"
+        )
+
+
+def main(
+    levels: tuple[int, ...] = (1, 4, 16, 64),
+    duration_s: float = 5.0,
+    warmup_s: float = 1.0,
+    encoding: str = "json",
+    corpus: Path | None = None,
+    corpus_size: int = 500,
+    url: str | None = None,
+    output: Path | None = None,
+    baseline: Path | None = None,
+) -> dict:
+    """Run the load test and save the results.
+
+    Args:
+        levels: Concurrency levels to run, in order
+        duration_s: Measured seconds per level
+        warmup_s: Unmeasured seconds at the start of each level
+        encoding: Request body encoding: "json", "delta16" or "bitmap"
+        corpus: NDJSON drawings to replay; synthetic digits if None
+        corpus_size: Number of synthetic drawings
+        url: Existing server to target; boots a local one if None
+        output: Results file; defaults to loadtest-<commit>.json
+        baseline: Earlier results file to compare against
+
+    Returns:
+        The saved results
+    """
+    drawings = load_corpus(corpus) if corpus else synthetic_corpus(corpus_size)
+    bodies = [encode_request(points, encoding) for points in drawings]
+    mean_points = sum(map(len, drawings)) / len(drawings)
+    print(
+        f"Corpus: {len(drawings)} drawings, {mean_points:.0f} points on average, "
+        f"{encoding} encoding"
+    )
+
+    commit = git_commit()
+    server = nullcontext((url, None)) if url else local_server()
+    with server as (base_url, startup):
+        if startup is not None:
+            print(f"Server ready at {base_url}: {startup}")
+        levels_results = asyncio.run(
+            run(base_url, bodies, list(levels), duration_s, warmup_s)
+        )
+
+    results = {
+        "commit": commit,
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "url": url or "local",
+        "encoding": encoding,
+        "corpus": {"drawings": len(drawings), "mean_points": mean_points},
+        "duration_s": duration_s,
+        "warmup_s": warmup_s,
+        "startup": startup,
+        "levels": levels_results,
+    }
+    output = output or Path(f"loadtest-{commit or 'local'}.json")
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Saved results to {output}")
+
+    if baseline is not None:
+        compare(json.loads(baseline.read_text()), results)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test the prediction API")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16, 64],
+        help="Concurrency levels",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="Measured seconds per level"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=1.0, help="Unmeasured seconds per level"
+    )
+    parser.add_argument(
+        "--encoding", choices=["json", "delta16", "bitmap"], default="json"
+    )
+    parser.add_argument("--corpus", type=Path, help="NDJSON drawings to replay")
+    parser.add_argument(
+        "--corpus-size", type=int, default=500, help="Synthetic drawings"
+    )
+    parser.add_argument("--url", help="Target a running server instead")
+    parser.add_argument("--output", type=Path, help="Results JSON path")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON")
+    args = parser.parse_args()
+
+    main(
+        levels=tuple(args.concurrency),
+        duration_s=args.duration,
+        warmup_s=args.warmup,
+        encoding=args.encoding,
+        corpus=args.corpus,
+        corpus_size=args.corpus_size,
+        url=args.url,
+        output=args.output,
+        baseline=args.compare,
+    )
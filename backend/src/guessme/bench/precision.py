@@ -0,0 +1,167 @@
+"""Benchmark bf16 autocast against fp32 on CPU: throughput and accuracy.
+
+Throughput is measured on synthetic MNIST-shaped data for inference at
+several batch sizes and for training steps. Accuracy is measured on the
+MNIST test set (downloaded on first run): the saved weights evaluated in
+each precision, and a model trained from scratch in each precision.
+bf16 only pays off on CPUs with native bf16 kernels (AVX512-BF16 or AMX);
+elsewhere it can be slower than fp32.
+
+Usage:
+    uv run python -m guessme.bench.precision
+    uv run python -m guessme.bench.precision --no-accuracy
+"""
+
+import time
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+
+from guessme.bench.scaling import synthetic_mnist
+from guessme.model.cnn import MNISTNet
+from guessme.model.data import TensorLoader, TensorMNIST
+
+PRECISIONS = {"fp32": False, "bf16": True}
+WEIGHTS_PATH = Path(__file__).parent.parent / "model" / "weights" / "mnist_cnn.pt"
+
+
+def autocast(bf16: bool) -> torch.autocast:
+    """CPU bfloat16 autocast, or a no-op context when bf16 is False."""
+    return torch.autocast("cpu", dtype=torch.bfloat16, enabled=bf16)
+
+
+def inference_throughput(model: nn.Module, batch_size: int, bf16: bool) -> float:
+    """Images/second of eval-mode forward passes at one batch size."""
+    x = torch.randn(batch_size, 1, 28, 28)
+    runs = max(10, 2048 // batch_size)
+    with torch.no_grad(), autocast(bf16):
+        for _ in range(3):
+            model(x)  # warmup
+        start = time.perf_counter()
+        for _ in range(runs):
+            model(x)
+    return runs * batch_size / (time.perf_counter() - start)
+
+
+def train(model: nn.Module, loader: TensorLoader, bf16: bool, steps: int) -> float:
+    """Run up to steps training steps, returning images/second."""
+    criterion = nn.CrossEntropyLoss()
+    optimizer = torch.optim.Adam(model.parameters())
+    model.train()
+    images_seen = 0
+    start = time.perf_counter()
+    for step, (images, labels) in enumerate(loader):
+        if step == steps:
+            break
+        optimizer.zero_grad()
+        with autocast(bf16):
+            loss = criterion(model(images), labels)
+        loss.backward()
+        optimizer.step()
+        images_seen += len(images)
+    return images_seen / (time.perf_counter() - start)
+
+
+def accuracy(model: nn.Module, loader: TensorLoader, bf16: bool) -> float:
+    """Test-set accuracy (0-100%) with the model run in the given precision."""
+    model.eval()
+    correct = 0
+    with torch.no_grad(), autocast(bf16):
+        for images, labels in loader:
+            correct += (model(images).argmax(dim=1) == labels).sum().item()
+    return 100 * correct / len(loader.dataset)
+
+
+def main(
+    batch_sizes: tuple[int, ...] = (1, 32, 256),
+    train_steps: int = 100,
+    epochs: int = 1,
+    check_accuracy: bool = True,
+) -> None:
+    """Print fp32 vs bf16 throughput tables and accuracy comparison.
+
+    Args:
+        batch_sizes: Inference batch sizes to time
+        train_steps: Timed training steps per precision
+        epochs: Epochs to train from scratch in each precision for accuracy
+        check_accuracy: Compare accuracy on the MNIST test set
+    """
+    model = MNISTNet().eval()
+    print(f"{'batch':>8} | {'fp32 img/s':>11} | {'bf16 img/s':>11} | {'speedup':>8}")
+    print("-" * 48)
+    for batch_size in batch_sizes:
+        fp32, bf16 = (
+            inference_throughput(model, batch_size, flag)
+            for flag in PRECISIONS.values()
+        )
+        print(f"{batch_size:>8} | {fp32:>11.0f} | {bf16:>11.0f} | {bf16 / fp32:>7.2f}x")
+
+    print(f"\nTraining, batch 64, {train_steps} steps")
+    data = synthetic_mnist(64 * train_steps)
+    rates = {}
+    for name, flag in PRECISIONS.items():
+        torch.manual_seed(0)
+        rates[name] = train(
+            MNISTNet(), TensorLoader(data, batch_size=64), flag, train_steps
+        )
+        print(f"{name:>8} | {rates[name]:>11.0f} img/s")
+    print(f"{'speedup':>8} | {rates['bf16'] / rates['fp32']:>10.2f}x")
+
+    if not check_accuracy:
+        return
+
+    train_set = TensorLoader(TensorMNIST.load(train=True), batch_size=64, shuffle=True)
+    test_set = TensorLoader(TensorMNIST.load(train=False), batch_size=256)
+
+    print("\nMNIST test accuracy")
+    if WEIGHTS_PATH.exists():
+        trained = MNISTNet()
+        trained.load_state_dict(torch.load(WEIGHTS_PATH, weights_only=True))
+        results = {n: accuracy(trained, test_set, f) for n, f in PRECISIONS.items()}
+        print(
+            f"saved weights, inference: fp32 {results['fp32']:.2f}% | "
+            f"bf16 {results['bf16']:.2f}% | "
+            f"change {results['bf16'] - results['fp32']:+.2f} points"
+        )
+    else:
+        print(f"No weights at {WEIGHTS_PATH}, skipping inference accuracy")
+
+    results = {}
+    for name, flag in PRECISIONS.items():
+        torch.manual_seed(0)
+        fresh = MNISTNet()
+        for _ in range(epochs):
+            train(fresh, train_set, flag, len(train_set))
+        results[name] = accuracy(fresh, test_set, flag)
+    print(
+        f"trained {epochs} epoch(s): fp32 {results['fp32']:.2f}% | "
+        f"bf16 {results['bf16']:.2f}% | "
+        f"change {results['bf16'] - results['fp32']:+.2f} points"
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark bf16 vs fp32 on CPU")
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[1, 32, 256], help="Batch sizes"
+    )
+    parser.add_argument(
+        "--train-steps", type=int, default=100, help="Timed training steps"
+    )
+    parser.add_argument(
+        "--epochs", type=int, default=1, help="Epochs per precision for accuracy"
+    )
+    parser.add_argument(
+        "--no-accuracy", action="store_true", help="Skip the MNIST accuracy check"
+    )
+    args = parser.parse_args()
+
+    main(
+        batch_sizes=tuple(args.batch_sizes),
+        train_steps=args.train_steps,
+        epochs=args.epochs,
+        check_accuracy=not args.no_accuracy,
+    )
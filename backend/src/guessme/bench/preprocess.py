@@ -0,0 +1,143 @@
+"""Benchmark stroke rasterization: per-pixel Bresenham loop vs vectorized,
+and full re-rasterization vs StrokeRaster while a drawing grows.
+
+Usage:
+    uv run python -m guessme.bench.preprocess
+"""
+
+import itertools
+import random
+import time
+from collections.abc import Callable
+
+import torch
+
+from guessme.model.preprocess import (
+    CANVAS_SIZE,
+    StrokeRaster,
+    bresenham_line,
+    canvas_to_tensor,
+    rasterize,
+)
+
+
+def random_drawing(n_points: int, seed: int = 0) -> list[dict]:
+    """Generate a random-walk drawing on the canvas.
+
+    Args:
+        n_points: Number of points in the drawing
+        seed: Random seed for reproducibility
+
+    Returns:
+        List of {"x": float, "y": float} in canvas coordinates (0-400)
+    """
+    rng = random.Random(seed)
+    x, y = CANVAS_SIZE / 2, CANVAS_SIZE / 2
+    points = []
+    for _ in range(n_points):
+        x = min(CANVAS_SIZE, max(0.0, x + rng.uniform(-40, 40)))
+        y = min(CANVAS_SIZE, max(0.0, y + rng.uniform(-40, 40)))
+        points.append({"x": x, "y": y})
+    return points
+
+
+def scale_points(points: list[dict]) -> list[tuple[int, int]]:
+    """Scale canvas points to clamped tensor coordinates (0-27)."""
+    return [
+        (
+            max(0, min(27, int(p["x"] * 27 / CANVAS_SIZE))),
+            max(0, min(27, int(p["y"] * 27 / CANVAS_SIZE))),
+        )
+        for p in points
+    ]
+
+
+def loop_rasterize(scaled_points: list[tuple[int, int]]) -> torch.Tensor:
+    """Reference rasterizer: one tensor write per Bresenham pixel."""
+    img = torch.zeros(28, 28)
+    for x, y in scaled_points:
+        img[y, x] = 1.0
+    for (x0, y0), (x1, y1) in itertools.pairwise(scaled_points):
+        for x, y in bresenham_line(x0, y0, x1, y1):
+            img[y, x] = 1.0
+    return img
+
+
+def live_full(points: list[dict], chunk: int) -> torch.Tensor:
+    """Live guessing by re-running canvas_to_tensor after every chunk."""
+    for end in range(chunk, len(points) + chunk, chunk):
+        result = canvas_to_tensor(points[:end])
+    return result
+
+
+def live_incremental(points: list[dict], chunk: int) -> torch.Tensor:
+    """Live guessing by appending each chunk to a StrokeRaster."""
+    raster = StrokeRaster()
+    for start in range(0, len(points), chunk):
+        raster.append(points[start : start + chunk])
+        result = raster.to_tensor()
+    return result
+
+
+def time_fn(fn: Callable[[], object], repeat: int) -> float:
+    """Return the median wall time of fn in milliseconds."""
+    fn()  # warmup
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def main(sizes: tuple[int, ...] = (50, 500, 5000), repeat: int = 20) -> None:
+    """Run the rasterization benchmark and print a results table.
+
+    Args:
+        sizes: Drawing sizes (number of points) to benchmark
+        repeat: Timed runs per size
+    """
+    print(f"{'points':>8} | {'loop ms':>10} | {'vector ms':>10} | {'speedup':>8}")
+    print("-" * 46)
+    for n in sizes:
+        scaled = scale_points(random_drawing(n))
+        scaled_tensor = torch.tensor(scaled, dtype=torch.long)
+
+        assert torch.equal(loop_rasterize(scaled), rasterize(scaled_tensor))
+
+        loop_ms = time_fn(lambda s=scaled: loop_rasterize(s), repeat)
+        vector_ms = time_fn(lambda s=scaled_tensor: rasterize(s), repeat)
+        print(
+            f"{n:>8} | {loop_ms:>10.3f} | {vector_ms:>10.3f} | {loop_ms / vector_ms:>7.1f}x"
+        )
+
+    # Model input after every 10-point chunk, as the /ws endpoint does
+    chunk = 10
+    print()
+    print(f"{'points':>8} | {'full ms':>10} | {'incr ms':>10} | {'speedup':>8}")
+    print("-" * 46)
+    for n in sizes:
+        points = random_drawing(n)
+        assert torch.equal(live_full(points, chunk), live_incremental(points, chunk))
+
+        full_ms = time_fn(lambda p=points: live_full(p, chunk), max(1, repeat // 10))
+        incr_ms = time_fn(
+            lambda p=points: live_incremental(p, chunk), max(1, repeat // 10)
+        )
+        print(
+            f"{n:>8} | {full_ms:>10.3f} | {incr_ms:>10.3f} | {full_ms / incr_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark stroke rasterization")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[50, 500, 5000], help="Point counts"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per size")
+    args = parser.parse_args()
+
+    main(sizes=tuple(args.sizes), repeat=args.repeat)
@@ -0,0 +1,127 @@
+"""Benchmark data-parallel training throughput for 1/2/4/8 CPU workers.
+
+Each configuration spawns DDP (gloo) workers on this machine, splits its
+cores between them, and times a fixed number of training steps per worker.
+Synthetic MNIST-shaped data is used by default so the benchmark runs
+offline; pass --mnist to train on the real dataset.
+
+Usage:
+    uv run python -m guessme.bench.scaling
+    uv run python -m guessme.bench.scaling --workers 1 2 4 --steps 200
+"""
+
+import os
+import time
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+import torch.nn as nn
+from torch.nn.parallel import DistributedDataParallel
+
+from guessme.model.cnn import MNISTNet
+from guessme.model.data import TensorLoader, TensorMNIST
+from guessme.model.distributed import init_worker, shutdown_worker, spawn
+
+
+def synthetic_mnist(size: int = 60_000) -> TensorMNIST:
+    """Random uint8 images and labels with MNIST's shapes."""
+    generator = torch.Generator().manual_seed(0)
+    images = torch.randint(
+        0, 256, (size, 28, 28), dtype=torch.uint8, generator=generator
+    )
+    return TensorMNIST(images, torch.randint(0, 10, (size,), generator=generator))
+
+
+def worker(
+    rank: int,
+    world_size: int,
+    steps: int,
+    batch_size: int,
+    mnist: bool,
+    results: mp.SimpleQueue,
+) -> None:
+    """Train for steps batches and report images/second from rank 0."""
+    info = init_worker(rank, world_size)
+    try:
+        dataset = TensorMNIST.load(train=True) if mnist else synthetic_mnist()
+        loader = TensorLoader(
+            dataset,
+            batch_size=batch_size,
+            shuffle=True,
+            generator=torch.Generator().manual_seed(0),
+            rank=rank,
+            world_size=world_size,
+        )
+        model = MNISTNet()
+        net = DistributedDataParallel(model) if info.distributed else model
+        criterion = nn.CrossEntropyLoss()
+        optimizer = torch.optim.Adam(model.parameters())
+
+        def step(images: torch.Tensor, labels: torch.Tensor) -> None:
+            optimizer.zero_grad()
+            criterion(net(images), labels).backward()
+            optimizer.step()
+
+        batches = iter(loader)
+        step(*next(batches))  # warmup
+        if info.distributed:
+            dist.barrier()
+        start = time.perf_counter()
+        for _ in range(steps):
+            step(*next(batches))
+        if info.distributed:
+            dist.barrier()
+        elapsed = time.perf_counter() - start
+
+        if info.is_main:
+            results.put(steps * batch_size * world_size / elapsed)
+    finally:
+        shutdown_worker()
+
+
+def main(
+    workers: tuple[int, ...] = (1, 2, 4, 8),
+    steps: int = 100,
+    batch_size: int = 64,
+    mnist: bool = False,
+) -> None:
+    """Print throughput, speedup and scaling efficiency per worker count.
+
+    Args:
+        workers: Worker counts to benchmark
+        steps: Timed training steps per worker
+        batch_size: Batch size per worker
+        mnist: Train on real MNIST instead of synthetic data
+    """
+    print(f"CPU cores: {os.cpu_count()} | batch size per worker: {batch_size}")
+    print(f"{'workers':>8} | {'img/s':>9} | {'speedup':>8} | {'efficiency':>10}")
+    print("-" * 46)
+    results = mp.get_context("spawn").SimpleQueue()
+    baseline = None
+    for n in workers:
+        spawn(worker, n, steps, batch_size, mnist, results)
+        throughput = results.get()
+        baseline = baseline or throughput
+        speedup = throughput / baseline
+        print(f"{n:>8} | {throughput:>9.0f} | {speedup:>7.2f}x | {speedup / n:>9.0%}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark data-parallel training")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts"
+    )
+    parser.add_argument("--steps", type=int, default=100, help="Timed steps per worker")
+    parser.add_argument("--batch-size", type=int, default=64, help="Batch per worker")
+    parser.add_argument("--mnist", action="store_true", help="Use real MNIST data")
+    args = parser.parse_args()
+
+    main(
+        workers=tuple(args.workers),
+        steps=args.steps,
+        batch_size=args.batch_size,
+        mnist=args.mnist,
+    )
@@ -0,0 +1,73 @@
+"""Runtime settings read from GUESSME_* environment variables."""
+
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+
+def _env[T](name: str, cast: Callable[[str], T], default: T) -> T:
+    """Read GUESSME_<name> from the environment, or return default."""
+    value = os.environ.get(f"GUESSME_{name}")
+    return default if value is None else cast(value)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Serving configuration."""
+
+    max_batch_size: int = 32
+    max_wait_ms: float = 2.0
+    # Match these to the pod's CPU allocation
+    inference_workers: int = 1
+    torch_threads: int | None = None
+    # "fp32", "int8" or "bf16"
+    precision: str = "fp32"
+    # "eager", "script" or "compile"
+    backend: str = "eager"
+    compile_cache_dir: Path | None = None
+    # Minimum time between live predictions for one WebSocket client, and
+    # the most client IDs (drawings) one WebSocket connection may open
+    live_interval_ms: float = 100.0
+    max_live_sessions: int = 8
+    # Prediction result cache (0 entries disables it)
+    cache_size: int = 4096
+    cache_ttl_s: float = 300.0
+    # Ingest limits per request, NDJSON line or WebSocket message
+    max_points: int = 10_000
+    max_body_bytes: int = 1 << 20
+    # /predict/batch: drawings per forward pass and longest accepted line
+    batch_chunk_size: int = 256
+    max_line_bytes: int = 1 << 20
+    # Admission control on /predict and /predict/batch: queued requests and
+    # estimated queue wait before shedding with 503, and an optional
+    # per-client rate limit (requests/second, 0 disables)
+    max_queue_depth: int = 256
+    max_queue_wait_ms: float = 500.0
+    client_rate: float = 0.0
+    client_burst: int = 20
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from the environment, falling back to defaults."""
+        return cls(
+            max_batch_size=_env("MAX_BATCH_SIZE", int, cls.max_batch_size),
+            max_wait_ms=_env("MAX_WAIT_MS", float, cls.max_wait_ms),
+            inference_workers=_env("INFERENCE_WORKERS", int, cls.inference_workers),
+            torch_threads=_env("TORCH_THREADS", int, cls.torch_threads),
+            precision=_env("PRECISION", str, cls.precision),
+            backend=_env("BACKEND", str, cls.backend),
+            compile_cache_dir=_env("COMPILE_CACHE_DIR", Path, cls.compile_cache_dir),
+            live_interval_ms=_env("LIVE_INTERVAL_MS", float, cls.live_interval_ms),
+            max_live_sessions=_env("MAX_LIVE_SESSIONS", int, cls.max_live_sessions),
+            cache_size=_env("CACHE_SIZE", int, cls.cache_size),
+            cache_ttl_s=_env("CACHE_TTL_S", float, cls.cache_ttl_s),
+            max_points=_env("MAX_POINTS", int, cls.max_points),
+            max_body_bytes=_env("MAX_BODY_BYTES", int, cls.max_body_bytes),
+            batch_chunk_size=_env("BATCH_CHUNK_SIZE", int, cls.batch_chunk_size),
+            max_line_bytes=_env("MAX_LINE_BYTES", int, cls.max_line_bytes),
+            max_queue_depth=_env("MAX_QUEUE_DEPTH", int, cls.max_queue_depth),
+            max_queue_wait_ms=_env("MAX_QUEUE_WAIT_MS", float, cls.max_queue_wait_ms),
+            client_rate=_env("CLIENT_RATE", float, cls.client_rate),
+            client_burst=_env("CLIENT_BURST", int, cls.client_burst),
+        )
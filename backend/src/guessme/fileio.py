@@ -0,0 +1,33 @@
+"""Crash-safe file writes shared by checkpoints, dataset and backend caches."""
+
+import os
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import BinaryIO
+
+
+def atomic_write(path: Path, write: Callable[[BinaryIO], object]) -> None:
+    """Write a file through a temp file renamed into place once complete.
+
+    The temp file gets a unique name in the target directory, so concurrent
+    writers (replicas sharing a cache dir, parallel trials) never clobber
+    each other's partial output, and it is fsynced before the rename, so a
+    crash leaves either the previous file or the complete new one.
+
+    Args:
+        path: Destination file; its parent directory is created if missing
+        write: Called with the open binary temp file to fill it
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    tmp = Path(name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -1,6 +1,14 @@
 """FastAPI entry point for Guessme backend."""
 
+import torch
+
 from guessme.api.app import create_app
-from guessme.predictor.deployment import Predictor
+from guessme.config import Settings
+
+settings = Settings.from_env()
+
+if settings.torch_threads is not None:
+    torch.set_num_threads(settings.torch_threads)
 
-app = create_app(Predictor())
+# The model is loaded and warmed up in the app lifespan, not at import time
+app = create_app(settings=settings)
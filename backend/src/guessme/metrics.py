@@ -0,0 +1,277 @@
+"""Minimal in-process metrics with Prometheus text exposition.
+
+Counters, gauges and histograms are plain in-memory values updated under a
+lock; nothing is formatted until /metrics is scraped, so instrumentation
+costs a few hundred nanoseconds per observation and needs no external
+services.
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from 50us to 2.5s
+LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: list[Metric] = []
+
+    def register(self, metric: "Metric") -> None:
+        """Add a metric to the registry."""
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metric(ABC):
+    """Base class: a named metric with optional labels."""
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        registry: Registry | None = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values: object):
+        """Return the child metric for the given label values."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> object:
+        """Create the value holder for one label combination."""
+
+    def _default(self):
+        return self.labels()
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        """Render this metric's sample lines."""
+
+
+class _Value:
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(c.value)}"
+            for k, c in sorted(self._children.items())
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+
+class _HistogramValue:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+        registry: Registry | None = REGISTRY,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames, registry)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self):
+        """Context manager observing elapsed seconds."""
+        return self._default().time()
+
+    def samples(self) -> list[str]:
+        lines = []
+        names = (*self.labelnames, "le")
+        for key, child in sorted(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                labels = _format_labels(names, (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# === Serving metrics ===
+
+REQUESTS = Counter(
+    "guessme_requests_total", "HTTP requests by path and status", ("path", "status")
+)
+IN_FLIGHT = Gauge("guessme_requests_in_flight", "HTTP requests being served")
+STAGE_LATENCY = Histogram(
+    "guessme_stage_latency_seconds",
+    "Latency of each prediction stage (preprocess stages are per batch)",
+    ("stage",),
+)
+REQUEST_POINTS = Histogram(
+    "guessme_request_points",
+    "Number of canvas points per prediction request",
+    buckets=(0, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+POINTS_REMOVED = Counter(
+    "guessme_ingest_points_removed_total",
+    "Points dropped at ingest because they cannot change the raster",
+)
+BATCH_SIZE = Histogram(
+    "guessme_batch_size",
+    "Requests per batched forward pass",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+QUEUE_WAIT = Histogram(
+    "guessme_batch_queue_wait_seconds", "Time requests wait for their batch"
+)
+CACHE_LOOKUPS = Counter(
+    "guessme_cache_lookups_total", "Result cache lookups by result", ("result",)
+)
+CACHE_EVICTIONS = Counter(
+    "guessme_cache_evictions_total", "Result cache entries removed", ("reason",)
+)
+SINGLEFLIGHT = Counter(
+    "guessme_singleflight_requests_total",
+    "Predictions that started a computation (leader) or joined one (shared)",
+    ("role",),
+)
+ADMITTED = Gauge(
+    "guessme_admitted_requests", "Prediction requests admitted and not yet finished"
+)
+REQUESTS_SHED = Counter(
+    "guessme_requests_shed_total",
+    "Prediction requests rejected by admission control, by reason",
+    ("reason",),
+)
@@ -0,0 +1,136 @@
+"""In-memory MNIST: uint8 tensors on disk, memory-mapped, batched by slicing.
+
+torchvision's MNIST dataset returns one PIL image per sample and runs the
+ToTensor/Normalize transforms on each, so a training epoch spends most of
+its CPU time in per-sample Python. Here the dataset is decoded once into a
+contiguous uint8 file per split; later runs memory-map it, and batches are
+taken by indexing the whole tensor and normalized in one vectorized op.
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import torch
+from torchvision import datasets
+
+from guessme.fileio import atomic_write
+from guessme.model.preprocess import MNIST_MEAN, MNIST_STD
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+class TensorMNIST:
+    """One MNIST split as a memory-mapped (N, 28, 28) uint8 tensor."""
+
+    def __init__(self, images: torch.Tensor, labels: torch.Tensor) -> None:
+        """Wrap decoded images and labels.
+
+        Args:
+            images: (N, 28, 28) uint8 pixels
+            labels: (N,) int64 digits
+        """
+        self.images = images
+        self.labels = labels
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @classmethod
+    def load(cls, train: bool, data_dir: Path = DATA_DIR) -> "TensorMNIST":
+        """Memory-map a split, decoding it from torchvision's files on first use.
+
+        Args:
+            train: Training split if True, otherwise the test split
+            data_dir: Directory holding (or receiving) the MNIST download
+
+        Returns:
+            The split, backed by files under data_dir/MNIST/tensor
+        """
+        split = "train" if train else "test"
+        cache_dir = data_dir / "MNIST" / "tensor"
+        images_path = cache_dir / f"{split}-images.u8"
+        labels_path = cache_dir / f"{split}-labels.u8"
+
+        if not labels_path.exists():
+            mnist = datasets.MNIST(root=data_dir, train=train, download=True)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            _write_raw(images_path, mnist.data.to(torch.uint8))
+            _write_raw(labels_path, mnist.targets.to(torch.uint8))
+
+        count = labels_path.stat().st_size
+        images = torch.from_file(
+            str(images_path), shared=False, size=count * 28 * 28, dtype=torch.uint8
+        )
+        labels = torch.from_file(
+            str(labels_path), shared=False, size=count, dtype=torch.uint8
+        )
+        return cls(images.view(count, 28, 28), labels.long())
+
+
+def _write_raw(path: Path, tensor: torch.Tensor) -> None:
+    """Write a tensor's raw bytes, renaming into place once complete."""
+    atomic_write(path, lambda f: f.write(tensor.contiguous().numpy().tobytes()))
+
+
+def normalize(images: torch.Tensor) -> torch.Tensor:
+    """Convert (B, 28, 28) uint8 pixels to normalized (B, 1, 28, 28) floats.
+
+    Matches ToTensor followed by Normalize((MNIST_MEAN,), (MNIST_STD,)).
+    """
+    batch = images.unsqueeze(1).to(torch.float32)
+    return batch.div_(255).sub_(MNIST_MEAN).div_(MNIST_STD)
+
+
+class TensorLoader:
+    """Batches of a TensorMNIST, a drop-in for DataLoader in the training loop.
+
+    Unshuffled batches are contiguous slices (no copy until normalize);
+    shuffled batches gather one random permutation per epoch. With
+    world_size > 1 the loader yields only this rank's shard: an equal,
+    disjoint part of every epoch (up to world_size - 1 samples are left
+    out so all ranks run the same number of steps). Ranks must share the
+    generator seed to agree on the shuffle.
+    """
+
+    def __init__(
+        self,
+        dataset: TensorMNIST,
+        batch_size: int = 64,
+        shuffle: bool = False,
+        generator: torch.Generator | None = None,
+        rank: int = 0,
+        world_size: int = 1,
+    ) -> None:
+        """Create a loader.
+
+        Args:
+            dataset: Split to iterate over
+            batch_size: Images per batch; the last batch may be smaller
+            shuffle: Reorder samples every epoch
+            generator: Random source for shuffling
+            rank: This worker's shard
+            world_size: Number of shards
+        """
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.generator = generator
+        self.rank = rank
+        self.world_size = world_size
+        self.shard_size = len(dataset) // world_size
+
+    def __len__(self) -> int:
+        return -(-self.shard_size // self.batch_size)
+
+    def __iter__(self) -> Iterator[tuple[torch.Tensor, torch.Tensor]]:
+        images, labels = self.dataset.images, self.dataset.labels
+        first = self.rank * self.shard_size
+        order = (
+            torch.randperm(len(self.dataset), generator=self.generator)
+            if self.shuffle
+            else None
+        )
+        for start in range(first, first + self.shard_size, self.batch_size):
+            end = min(start + self.batch_size, first + self.shard_size)
+            batch = slice(start, end) if order is None else order[start:end]
+            yield normalize(images[batch]), labels[batch]
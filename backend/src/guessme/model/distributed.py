@@ -0,0 +1,111 @@
+"""Data-parallel training helpers: DDP over gloo on CPU.
+
+Workers are started either by spawn() on one machine, or by torchrun
+across several (which sets RANK, WORLD_SIZE, MASTER_ADDR and friends).
+Each worker trains on its shard of the data; DDP averages gradients every
+step, so all workers hold the same weights.
+"""
+
+import os
+import socket
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+
+
+@dataclass(frozen=True)
+class WorkerInfo:
+    """Where this process sits in the worker group."""
+
+    rank: int = 0
+    world_size: int = 1
+    # Rank and worker count on this machine
+    local_rank: int = 0
+    local_world_size: int = 1
+
+    @property
+    def is_main(self) -> bool:
+        """Whether this worker logs and saves for the group."""
+        return self.rank == 0
+
+    @property
+    def distributed(self) -> bool:
+        return self.world_size > 1
+
+
+def launched_by_torchrun() -> bool:
+    """Whether torchrun (or another launcher) set up the worker group."""
+    return "WORLD_SIZE" in os.environ and "RANK" in os.environ
+
+
+def init_worker(rank: int | None = None, world_size: int | None = None) -> WorkerInfo:
+    """Join the gloo process group and claim this worker's share of cores.
+
+    Args:
+        rank: Worker rank; read from the environment when None (torchrun)
+        world_size: Worker count; read from the environment when None
+
+    Returns:
+        This worker's position in the group
+    """
+    if rank is None or world_size is None:
+        rank = int(os.environ["RANK"])
+        world_size = int(os.environ["WORLD_SIZE"])
+        local_rank = int(os.environ.get("LOCAL_RANK", rank))
+        local_world_size = int(os.environ.get("LOCAL_WORLD_SIZE", world_size))
+    else:
+        local_rank, local_world_size = rank, world_size
+
+    if world_size > 1:
+        dist.init_process_group("gloo", rank=rank, world_size=world_size)
+    if local_world_size > 1:
+        # Otherwise every worker starts one thread per core and they thrash
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // local_world_size))
+    return WorkerInfo(rank, world_size, local_rank, local_world_size)
+
+
+def shutdown_worker() -> None:
+    """Leave the process group, if one was joined."""
+    if dist.is_initialized():
+        dist.destroy_process_group()
+
+
+@contextmanager
+def local_main_first(worker: WorkerInfo) -> Iterator[None]:
+    """Run the block on local rank 0 before the other workers on its machine.
+
+    For one-time setup such as downloading or decoding data, so workers
+    sharing a disk do not race to write the same files.
+    """
+    if worker.distributed and worker.local_rank != 0:
+        dist.barrier()
+    yield
+    if worker.distributed and worker.local_rank == 0:
+        dist.barrier()
+
+
+def all_reduce_mean(value: float) -> float:
+    """Average a per-worker scalar across the group."""
+    if not dist.is_initialized():
+        return value
+    tensor = torch.tensor([value], dtype=torch.float64)
+    dist.all_reduce(tensor)
+    return tensor.item() / dist.get_world_size()
+
+
+def spawn(fn: Callable[..., None], workers: int, *args: object) -> None:
+    """Run fn(rank, workers, *args) in workers local processes.
+
+    Sets up a rendezvous on a free localhost port and waits for every
+    worker to finish; an exception in any worker is re-raised here.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    os.environ["MASTER_ADDR"] = "127.0.0.1"
+    os.environ["MASTER_PORT"] = str(port)
+    mp.spawn(fn, args=(workers, *args), nprocs=workers, join=True)
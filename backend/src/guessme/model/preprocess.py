@@ -13,7 +13,8 @@ and MNIST training data characteristics:
 
 1. Line Interpolation (Bresenham): Canvas sends discrete mouse positions
    with gaps. Bresenham's algorithm fills pixels between consecutive points
-   to create continuous strokes.
+   to create continuous strokes. All segments are rasterized at once with
+   tensor arithmetic and written with a single scatter.
 
 2. Stroke Dilation (optional, disabled by default): Thickens 1px strokes
    using max_pool2d. Disabled by default as it can fill small holes in
@@ -25,12 +26,19 @@ and MNIST training data characteristics:
 
 4. Gaussian Blur: Applies anti-aliasing to smooth jagged edges from
    pixelation, matching MNIST's smoother stroke appearance.
+
+For serving, PreprocessPipeline runs all stages plus MNIST normalization
+on batches, with kernels and coordinate grids built once up front.
 """
 
 import torch
 import torch.nn.functional as F
 
+from guessme.metrics import STAGE_LATENCY
+
 CANVAS_SIZE = 400  # Frontend canvas is 400x400 pixels
+MNIST_MEAN = 0.1307
+MNIST_STD = 0.3081
 
 
 # === Line Interpolation (Bresenham) ===
@@ -71,6 +79,72 @@ def bresenham_line(x0: int, y0: int, x1: int, y1: int) -> list[tuple[int, int]]:
     return points
 
 
+def line_pixels(scaled_points: torch.Tensor) -> torch.Tensor:
+    """Compute Bresenham pixels for every segment of a polyline at once.
+
+    Vectorized equivalent of calling bresenham_line on each pair of
+    consecutive points. Bresenham takes one step per pixel along the major
+    axis, so a segment of length n = max(|dx|, |dy|) has n + 1 pixels, and
+    the offset of pixel i along an axis of length d has the closed form
+    (2 * i * d + n - 1) // (2 * n). On the major axis this reduces to i, so
+    both axes share one formula.
+
+    Args:
+        scaled_points: Integer tensor of shape (N, 2) with (x, y) coordinates
+
+    Returns:
+        Integer tensor of shape (M, 2) with (x, y) of every line pixel,
+        in the same order bresenham_line would produce them
+    """
+    if scaled_points.shape[0] < 2:
+        return scaled_points.new_empty((0, 2))
+
+    pixels, _ = segment_pixels(scaled_points[:-1], scaled_points[1:])
+    return pixels
+
+
+def segment_pixels(
+    start: torch.Tensor, end: torch.Tensor
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Compute Bresenham pixels for independent segments at once.
+
+    Args:
+        start: Integer tensor of shape (S, 2) with segment start points
+        end: Integer tensor of shape (S, 2) with segment end points
+
+    Returns:
+        (pixels, seg): pixels of shape (M, 2) with (x, y) coordinates, and
+        seg of shape (M,) with the index of the segment each pixel belongs to
+    """
+    delta = end - start
+    steps = delta.abs().amax(dim=1)
+
+    # Segment index and step index (0..n) for every output pixel
+    seg = torch.repeat_interleave(steps + 1)
+    first = torch.cumsum(steps + 1, dim=0) - (steps + 1)
+    step = torch.arange(seg.numel(), device=seg.device) - first[seg]
+
+    n = steps[seg].unsqueeze(1)
+    d = delta[seg]
+    # clamp() handles zero-length segments (n = 0), which emit their start
+    offset = (2 * step.unsqueeze(1) * d.abs() + n - 1).clamp(min=0) // (2 * n).clamp(
+        min=1
+    )
+    return start[seg] + d.sign() * offset, seg
+
+
+def set_pixels(img: torch.Tensor, pixels: torch.Tensor) -> None:
+    """Set pixels to 1.0 with a single scatter, skipping out-of-bounds ones.
+
+    Args:
+        img: 2D tensor (28x28) to draw on, modified in-place
+        pixels: Integer tensor of shape (M, 2) with (x, y) coordinates
+    """
+    inside = ((pixels >= 0) & (pixels <= 27)).all(dim=1)
+    pixels = pixels[inside]
+    img[pixels[:, 1], pixels[:, 0]] = 1.0
+
+
 def draw_lines_on_tensor(
     img: torch.Tensor, scaled_points: list[tuple[int, int]]
 ) -> None:
@@ -86,13 +160,52 @@ def draw_lines_on_tensor(
     if len(scaled_points) < 2:
         return
 
-    for i in range(len(scaled_points) - 1):
-        x0, y0 = scaled_points[i]
-        x1, y1 = scaled_points[i + 1]
-        line_points = bresenham_line(x0, y0, x1, y1)
-        for x, y in line_points:
-            if 0 <= x <= 27 and 0 <= y <= 27:
-                img[y, x] = 1.0
+    set_pixels(img, line_pixels(torch.tensor(scaled_points, dtype=torch.long)))
+
+
+def rasterize(scaled_points: torch.Tensor) -> torch.Tensor:
+    """Rasterize points and the lines connecting them into a 28x28 image.
+
+    Args:
+        scaled_points: Integer tensor of shape (N, 2) in tensor coords (0-27)
+
+    Returns:
+        2D tensor (28x28) with stroke pixels set to 1.0
+    """
+    img = torch.zeros(28, 28)
+    set_pixels(img, torch.cat([scaled_points, line_pixels(scaled_points)]))
+    return img
+
+
+def rasterize_batch(drawings: list[torch.Tensor]) -> torch.Tensor:
+    """Rasterize many drawings into a stack of 28x28 images with one scatter.
+
+    Points of all drawings are concatenated so that every segment of every
+    drawing is rasterized in a single segment_pixels call. Segments that
+    would join the last point of one drawing to the first of the next are
+    dropped.
+
+    Args:
+        drawings: List of integer tensors of shape (N_i, 2) in tensor coords
+
+    Returns:
+        Tensor of shape (len(drawings), 28, 28) with stroke pixels set to 1.0
+    """
+    imgs = torch.zeros(len(drawings), 28, 28)
+    if not drawings:
+        return imgs
+
+    points = torch.cat(drawings)
+    owner = torch.repeat_interleave(torch.tensor([len(d) for d in drawings]))
+
+    same = owner[1:] == owner[:-1]
+    pixels, seg = segment_pixels(points[:-1][same], points[1:][same])
+
+    pixels = torch.cat([points, pixels])
+    owner = torch.cat([owner, owner[:-1][same][seg]])
+    inside = ((pixels >= 0) & (pixels <= 27)).all(dim=1)
+    imgs[owner[inside], pixels[inside, 1], pixels[inside, 0]] = 1.0
+    return imgs
 
 
 # === Stroke Dilation ===
@@ -105,17 +218,17 @@ def dilate_strokes(tensor: torch.Tensor, kernel_size: int = 3) -> torch.Tensor:
     which has thick filled strokes.
 
     Args:
-        tensor: Input tensor of shape (1, 28, 28)
+        tensor: Input tensor of shape (1, 28, 28) or batch (N, 1, 28, 28)
         kernel_size: Size of dilation kernel (default 3)
 
     Returns:
         Dilated tensor of same shape
     """
     # Add batch dim for max_pool2d: (1, 28, 28) -> (1, 1, 28, 28)
-    x = tensor.unsqueeze(0)
+    x = tensor if tensor.dim() == 4 else tensor.unsqueeze(0)
     padding = kernel_size // 2
     dilated = F.max_pool2d(x, kernel_size, stride=1, padding=padding)
-    return dilated.squeeze(0)
+    return dilated if tensor.dim() == 4 else dilated.squeeze(0)
 
 
 # === Center of Mass Centering ===
@@ -174,6 +287,63 @@ def center_tensor(tensor: torch.Tensor) -> torch.Tensor:
     return shifted
 
 
+def center_of_mass_batch(
+    images: torch.Tensor, coords: torch.Tensor | None = None
+) -> torch.Tensor:
+    """Calculate center of mass of non-zero pixels for a batch of images.
+
+    Args:
+        images: Input tensor of shape (N, 1, 28, 28)
+        coords: Precomputed float arange(28) on the images' device (optional)
+
+    Returns:
+        Tensor of shape (N, 2) with (cy, cx) per image, (14, 14) if empty
+    """
+    img = images.reshape(-1, 28, 28)
+    if coords is None:
+        coords = torch.arange(28, dtype=torch.float32, device=images.device)
+
+    total_mass = img.sum(dim=(1, 2))
+    cy = (img.sum(dim=2) * coords).sum(dim=1) / total_mass
+    cx = (img.sum(dim=1) * coords).sum(dim=1) / total_mass
+
+    com = torch.stack([cy, cx], dim=1)
+    com[total_mass == 0] = 14.0  # Center if empty
+    return com
+
+
+def center_batch(
+    images: torch.Tensor, coords: torch.Tensor | None = None
+) -> torch.Tensor:
+    """Shift each image so its center of mass is at the image center.
+
+    Batched equivalent of center_tensor: each image gets its own circular
+    shift, applied with a single gather instead of per-image torch.roll.
+
+    Args:
+        images: Input tensor of shape (N, 1, 28, 28)
+        coords: Precomputed float arange(28) on the images' device (optional)
+
+    Returns:
+        Centered tensor of same shape
+    """
+    if coords is None:
+        coords = torch.arange(28, dtype=torch.float32, device=images.device)
+
+    # Round in float64 like center_tensor's Python round() on .item() values;
+    # on CPU, since MPS has no float64
+    com = center_of_mass_batch(images, coords)
+    shifts = torch.round(14.0 - com.cpu().double()).long().to(images.device)
+
+    # torch.roll semantics: out[i] = in[(i - shift) % 28]
+    idx = coords.long()
+    rows = (idx - shifts[:, 0:1]) % 28
+    cols = (idx - shifts[:, 1:2]) % 28
+    batch = torch.arange(images.shape[0], device=images.device)[:, None, None]
+
+    return images[:, 0][batch, rows[:, :, None], cols[:, None, :]].unsqueeze(1)
+
+
 # === Gaussian Blur ===
 
 
@@ -202,7 +372,7 @@ def gaussian_blur(
     anti-aliased appearance.
 
     Args:
-        tensor: Input tensor of shape (1, 28, 28)
+        tensor: Input tensor of shape (1, 28, 28) or batch (N, 1, 28, 28)
         kernel_size: Size of Gaussian kernel (must be odd)
         sigma: Standard deviation of Gaussian
 
@@ -214,10 +384,10 @@ def gaussian_blur(
     kernel = kernel.view(1, 1, kernel_size, kernel_size).to(tensor.device)
 
     # Add batch dim: (1, 28, 28) -> (1, 1, 28, 28)
-    x = tensor.unsqueeze(0)
+    x = tensor if tensor.dim() == 4 else tensor.unsqueeze(0)
     padding = kernel_size // 2
     blurred = F.conv2d(x, kernel, padding=padding)
-    return blurred.squeeze(0)
+    return blurred if tensor.dim() == 4 else blurred.squeeze(0)
 
 
 # === ASCII Visualization ===
@@ -244,9 +414,85 @@ def print_ascii(tensor: torch.Tensor) -> None:
     print()
 
 
-# TODO: define points with custom struct
+# === Point Packing ===
+
+
+def pack_points(points: list[dict] | torch.Tensor) -> torch.Tensor:
+    """Pack canvas points into an (N, 2) float32 tensor of (x, y).
+
+    Packed tensors are passed through unchanged, so callers that already
+    hold a buffer (e.g. from request parsing) pay no per-point cost.
+
+    Args:
+        points: (N, 2) tensor, or list of {"x": float, "y": float}
+
+    Returns:
+        Float32 tensor of shape (N, 2)
+    """
+    if isinstance(points, torch.Tensor):
+        return points.to(torch.float32).view(-1, 2)
+    coords = [v for p in points for v in (p["x"], p["y"])]
+    return torch.tensor(coords, dtype=torch.float32).view(-1, 2)
+
+
+def scale_points(points: list[dict] | torch.Tensor) -> torch.Tensor:
+    """Scale canvas coords (0-400) to clamped tensor coords (0-27).
+
+    Args:
+        points: (N, 2) float32 tensor of canvas (x, y), or list of dicts
+
+    Returns:
+        Integer tensor of shape (N, 2) with (x, y) coordinates
+    """
+    # Scale in float64 and truncate toward zero, matching int(x * 27 / 400)
+    scaled = pack_points(points).double() * 27 / CANVAS_SIZE
+    return scaled.clamp(0, 27).long()  # Clamp bounds
+
+
+# === Stroke Simplification ===
+
+
+def simplify_points(points: list[dict] | torch.Tensor) -> torch.Tensor:
+    """Drop points that cannot change the rasterized drawing.
+
+    Two kinds of points are redundant once scaled to the 28x28 grid:
+    - Consecutive points in the same cell (zero-length segments)
+    - Interior points of a straight run: when the segments before and after
+      a point have the same direction, the point lies on the lattice line
+      between its neighbours and Bresenham draws the same pixels for the
+      joined segment as for the two halves
+
+    This is Ramer-Douglas-Peucker with zero tolerance on the scaled grid,
+    the only tolerance that leaves the raster exactly unchanged, and it
+    needs just one vectorized pass.
+
+    Args:
+        points: (N, 2) float32 tensor of canvas (x, y), or list of dicts
+
+    Returns:
+        Float32 tensor of shape (M, 2), M <= N, with the kept canvas points
+    """
+    packed = pack_points(points)
+    scaled = scale_points(packed)
+
+    # Consecutive duplicates after scaling
+    keep = torch.ones(len(scaled), dtype=torch.bool)
+    keep[1:] = (scaled[1:] != scaled[:-1]).any(dim=1)
+    packed, scaled = packed[keep], scaled[keep]
+
+    # Interior points where the incoming and outgoing directions agree
+    before = scaled[1:-1] - scaled[:-2]
+    after = scaled[2:] - scaled[1:-1]
+    cross = before[:, 0] * after[:, 1] - before[:, 1] * after[:, 0]
+    same_direction = (cross == 0) & ((before * after).sum(dim=1) > 0)
+
+    keep = torch.ones(len(scaled), dtype=torch.bool)
+    keep[1:-1] = ~same_direction
+    return packed[keep]
+
+
 def canvas_to_tensor(
-    points: list[dict],
+    points: list[dict] | torch.Tensor,
     debug: bool = False,
     dilate: bool = False,
     center: bool = True,
@@ -266,7 +512,8 @@ def canvas_to_tensor(
     5. Gaussian blur - anti-aliasing for smoother edges
 
     Args:
-        points: List of {"x": float, "y": float} from canvas (0-400 range)
+        points: (N, 2) float32 tensor of canvas (x, y) (0-400 range), or
+            list of {"x": float, "y": float}
         debug: If True, print ASCII representation of the tensor
         dilate: If True, apply stroke dilation (default False - fills holes)
         center: If True, center drawing by center of mass (default True)
@@ -275,24 +522,11 @@ def canvas_to_tensor(
     Returns:
         Tensor of shape (1, 28, 28), values normalized to 0-1 range
     """
-    # Create blank 28x28 image
-    img = torch.zeros(28, 28)
-
     # Scale canvas coords (0-400) to tensor coords (0-27)
-    scaled_points = []
-    for p in points:
-        x = int(p["x"] * 27 / CANVAS_SIZE)
-        y = int(p["y"] * 27 / CANVAS_SIZE)
-        x = max(0, min(27, x))  # Clamp bounds
-        y = max(0, min(27, y))
-        scaled_points.append((x, y))
-
-    # Draw individual points
-    for x, y in scaled_points:
-        img[y, x] = 1.0
+    scaled_points = scale_points(points)
 
-    # Draw lines connecting consecutive points (fills gaps)
-    draw_lines_on_tensor(img, scaled_points)
+    # Draw individual points and the lines connecting them (fills gaps)
+    img = rasterize(scaled_points)
 
     result = img.unsqueeze(0)
 
@@ -313,3 +547,244 @@ def canvas_to_tensor(
         print_ascii(result)
 
     return result
+
+
+def canvas_to_tensor_batch(
+    drawings: list[list[dict] | torch.Tensor],
+    dilate: bool = False,
+    center: bool = True,
+    blur: bool = True,
+) -> torch.Tensor:
+    """Convert many canvas drawings to a batch of MNIST-compatible tensors.
+
+    Runs the same pipeline as canvas_to_tensor, but each stage is a single
+    batched tensor op over all drawings.
+
+    Args:
+        drawings: List of drawings, each an (N, 2) tensor or list of dicts
+        dilate: If True, apply stroke dilation (default False - fills holes)
+        center: If True, center drawings by center of mass (default True)
+        blur: If True, apply Gaussian blur (default True)
+
+    Returns:
+        Tensor of shape (N, 1, 28, 28), values normalized to 0-1 range
+    """
+    pipeline = PreprocessPipeline(
+        dilate=dilate, center=center, blur=blur, normalize=False
+    )
+    return pipeline(drawings)
+
+
+# === Incremental Rasterization ===
+
+
+class StrokeRaster:
+    """28x28 stroke bitmap that grows as points are appended.
+
+    Appended points continue the polyline from the last point, exactly as
+    if all points had been sent at once, but only the new segments are
+    rasterized. The pixel count and coordinate sums behind the center of
+    mass are updated with each newly set pixel, so producing the model
+    input never rescans the drawing. Live drawing therefore costs work
+    proportional to the new points rather than the whole drawing.
+
+    Dilation is not supported: it changes the center of mass.
+    """
+
+    def __init__(self) -> None:
+        """Start with an empty bitmap."""
+        self.image = torch.zeros(28, 28)
+        self.last: torch.Tensor | None = None  # Last point, tensor coords
+        self.num_points = 0
+        # Center of mass sums over set pixels (exact integers)
+        self.mass = 0
+        self.sum_y = 0
+        self.sum_x = 0
+        # Same kernel as gaussian_blur's default, built once
+        self.blur_kernel = gaussian_kernel().view(1, 1, 3, 3)
+
+    def append(self, points: list[dict] | torch.Tensor) -> None:
+        """Rasterize new canvas points and the segments joining them.
+
+        Args:
+            points: (N, 2) float32 tensor of canvas (x, y), or list of dicts
+        """
+        scaled = scale_points(points)
+        if scaled.shape[0] == 0:
+            return
+
+        # Join the new points to the end of the existing polyline
+        path = scaled if self.last is None else torch.cat([self.last[None], scaled])
+        pixels = torch.cat([scaled, line_pixels(path)])
+
+        # Only pixels that were not already set change the sums
+        inside = ((pixels >= 0) & (pixels <= 27)).all(dim=1)
+        index = torch.unique(pixels[inside, 1] * 28 + pixels[inside, 0])
+        flat = self.image.view(-1)
+        fresh = index[flat[index] == 0]
+        flat[fresh] = 1.0
+
+        self.mass += fresh.numel()
+        self.sum_y += int((fresh // 28).sum())
+        self.sum_x += int((fresh % 28).sum())
+        self.last = scaled[-1]
+        self.num_points += scaled.shape[0]
+
+    def center_of_mass(self) -> tuple[float, float]:
+        """Center of mass from the running sums, as center_of_mass computes it.
+
+        Returns:
+            (cy, cx) center of mass coordinates, or (14, 14) if empty
+        """
+        if self.mass == 0:
+            return (14.0, 14.0)
+        # Same float32 division as center_of_mass, so rounding agrees
+        sums = torch.tensor([self.sum_y, self.sum_x], dtype=torch.float32)
+        cy, cx = (sums / self.mass).tolist()
+        return (cy, cx)
+
+    def to_tensor(self, center: bool = True, blur: bool = True) -> torch.Tensor:
+        """Build the model input for the points appended so far.
+
+        Equal to canvas_to_tensor over all appended points with the same
+        flags (and no dilation).
+
+        Args:
+            center: If True, center drawing by center of mass (default True)
+            blur: If True, apply Gaussian blur (default True)
+
+        Returns:
+            New tensor of shape (1, 28, 28), values in 0-1 range
+        """
+        result = self.image.unsqueeze(0)
+
+        if center:
+            cy, cx = self.center_of_mass()
+            shifts = (round(14.0 - cy), round(14.0 - cx))
+            result = torch.roll(result, shifts=shifts, dims=(1, 2))
+
+        if blur:
+            result = F.conv2d(result.unsqueeze(0), self.blur_kernel, padding=1)[0]
+
+        return torch.clamp(result, 0.0, 1.0)
+
+    def clear(self) -> None:
+        """Erase the drawing."""
+        self.image.zero_()
+        self.last = None
+        self.num_points = 0
+        self.mass = self.sum_y = self.sum_x = 0
+
+
+# === Reusable Pipeline ===
+
+_RASTERIZE_LATENCY = STAGE_LATENCY.labels("rasterize")
+_PREPROCESS_LATENCY = STAGE_LATENCY.labels("preprocess")
+_NORMALIZE_LATENCY = STAGE_LATENCY.labels("normalize")
+
+
+class PreprocessPipeline:
+    """Preprocessing chain with precomputed kernels, built once and reused.
+
+    Holds the Gaussian kernel and coordinate grids on the target device so
+    each call only runs the stages themselves: rasterize, dilate, center,
+    blur, clamp and (optionally) MNIST mean/std normalization.
+    """
+
+    def __init__(
+        self,
+        device: torch.device | None = None,
+        dilate: bool = False,
+        center: bool = True,
+        blur: bool = True,
+        normalize: bool = True,
+        dilate_kernel_size: int = 3,
+        blur_kernel_size: int = 3,
+        blur_sigma: float = 1.0,
+    ) -> None:
+        """Configure stages and precompute their constants.
+
+        Args:
+            device: Device the output tensors live on (default CPU)
+            dilate: If True, apply stroke dilation
+            center: If True, center drawings by center of mass
+            blur: If True, apply Gaussian blur
+            normalize: If True, apply MNIST mean/std normalization
+            dilate_kernel_size: Size of dilation kernel
+            blur_kernel_size: Size of Gaussian kernel (must be odd)
+            blur_sigma: Standard deviation of Gaussian
+        """
+        self.device = device or torch.device("cpu")
+        self.dilate = dilate
+        self.center = center
+        self.blur = blur
+        self.normalize = normalize
+        self.dilate_kernel_size = dilate_kernel_size
+
+        self.blur_kernel = (
+            gaussian_kernel(blur_kernel_size, blur_sigma)
+            .view(1, 1, blur_kernel_size, blur_kernel_size)
+            .to(self.device)
+        )
+        self.coords = torch.arange(28, dtype=torch.float32, device=self.device)
+
+    def __call__(self, drawings: list[list[dict] | torch.Tensor]) -> torch.Tensor:
+        """Preprocess canvas drawings into a batch of model inputs.
+
+        Args:
+            drawings: List of drawings, each an (N, 2) tensor or list of dicts
+
+        Returns:
+            Tensor of shape (N, 1, 28, 28) on the pipeline's device
+        """
+        with _RASTERIZE_LATENCY.time():
+            images = rasterize_batch([scale_points(points) for points in drawings])
+        return self.transform(images.unsqueeze(1))
+
+    def transform(self, images: torch.Tensor) -> torch.Tensor:
+        """Run the post-rasterization stages on a batch of stroke bitmaps.
+
+        Args:
+            images: Tensor of shape (N, 1, 28, 28) with values in 0-1
+
+        Returns:
+            Tensor of same shape on the pipeline's device
+        """
+        with _PREPROCESS_LATENCY.time():
+            result = images.to(self.device)
+
+            if self.dilate:
+                result = dilate_strokes(result, self.dilate_kernel_size)
+
+            if self.center:
+                result = center_batch(result, self.coords)
+
+            if self.blur:
+                padding = self.blur_kernel.shape[-1] // 2
+                result = F.conv2d(result, self.blur_kernel, padding=padding)
+
+            result = torch.clamp(result, 0.0, 1.0)
+
+        if self.normalize:
+            with _NORMALIZE_LATENCY.time():
+                result = result.sub_(MNIST_MEAN).div_(MNIST_STD)
+
+        return result
+
+    def finalize(self, images: torch.Tensor) -> torch.Tensor:
+        """Move already preprocessed images to the device and normalize them.
+
+        For inputs such as StrokeRaster.to_tensor that have been rasterized,
+        centered and blurred elsewhere.
+
+        Args:
+            images: Tensor of shape (N, 1, 28, 28) with values in 0-1
+
+        Returns:
+            Tensor of same shape on the pipeline's device
+        """
+        result = images.to(self.device)
+        if self.normalize:
+            with _NORMALIZE_LATENCY.time():
+                result = (result - MNIST_MEAN) / MNIST_STD
+        return result
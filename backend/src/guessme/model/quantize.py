@@ -0,0 +1,208 @@
+"""INT8 quantization of MNISTNet for CPU inference.
+
+Conv blocks are statically quantized (fused conv+ReLU, activation ranges
+from calibration data) and Linear layers are dynamically quantized.
+fc1 alone holds 3136x128 weights, so INT8 storage cuts the model to about
+a quarter of its float32 size.
+
+Usage (requires 'train' dependency group for MNIST data):
+    uv run python -m guessme.model.quantize
+"""
+
+import io
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+from torch.ao.quantization import (
+    DeQuantStub,
+    QuantStub,
+    convert,
+    fuse_modules,
+    get_default_qconfig,
+    prepare,
+    quantize_dynamic,
+)
+
+from guessme.model.cnn import MNISTNet
+
+
+class QuantizableMNISTNet(nn.Module):
+    """MNISTNet with quant/dequant stubs around the conv blocks.
+
+    MNISTNet shares one ReLU module between layers; here each conv gets its
+    own so conv+ReLU pairs can be fused.
+    """
+
+    def __init__(self, model: MNISTNet) -> None:
+        super().__init__()
+        self.quant = QuantStub()
+        self.conv1 = model.conv1
+        self.relu1 = nn.ReLU()
+        self.conv2 = model.conv2
+        self.relu2 = nn.ReLU()
+        self.pool = model.pool
+        self.dequant = DeQuantStub()
+
+        self.fc1 = model.fc1
+        self.relu = nn.ReLU()
+        self.fc2 = model.fc2
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        # Quantized conv blocks: (1, 28, 28) -> (64, 7, 7)
+        x = self.quant(x)
+        x = self.pool(self.relu1(self.conv1(x)))
+        x = self.pool(self.relu2(self.conv2(x)))
+        x = self.dequant(x)
+        # Float activations into dynamically quantized FC layers
+        x = x.reshape(x.size(0), -1)
+        x = self.relu(self.fc1(x))
+        return self.fc2(x)
+
+
+def quantize_model(
+    model: MNISTNet, calibration: Iterable[torch.Tensor] | None = None
+) -> nn.Module:
+    """Quantize a float MNISTNet to INT8.
+
+    Args:
+        model: Trained float model (left unmodified)
+        calibration: Normalized (N, 1, 28, 28) batches used to observe
+            activation ranges. If None, only Linear layers are quantized
+            (dynamic quantization needs no calibration).
+
+    Returns:
+        Quantized model in eval mode, on CPU
+    """
+    engine = torch.backends.quantized.engine
+    float_model = MNISTNet()
+    float_model.load_state_dict(model.state_dict())
+    qmodel = QuantizableMNISTNet(float_model).eval()
+
+    if calibration is not None:
+        fuse_modules(qmodel, [["conv1", "relu1"], ["conv2", "relu2"]], inplace=True)
+        qmodel.qconfig = get_default_qconfig(engine)
+        # FC layers stay float here and are dynamically quantized below
+        qmodel.fc1.qconfig = None
+        qmodel.fc2.qconfig = None
+        prepare(qmodel, inplace=True)
+        with torch.no_grad():
+            for images in calibration:
+                qmodel(images)
+        convert(qmodel, inplace=True)
+
+    return quantize_dynamic(qmodel, {nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def load_quantized(path: Path, fp32_fingerprint: str | None = None) -> nn.Module:
+    """Load a statically quantized model saved by save_quantized.
+
+    Args:
+        path: Path to the saved quantized model
+        fp32_fingerprint: If given, must match the float weights'
+            fingerprint saved with the model
+
+    Returns:
+        Quantized model in eval mode, on CPU
+
+    Raises:
+        ValueError: If the model was quantized from other float weights
+    """
+    saved = torch.load(path, map_location="cpu", weights_only=True)
+    if (
+        fp32_fingerprint is not None
+        and saved.get("fp32_fingerprint") != fp32_fingerprint
+    ):
+        raise ValueError(f"{path.name} was quantized from different float weights")
+    # Rebuild the quantized module structure, then restore weights and qparams
+    qmodel = quantize_model(MNISTNet(), calibration=[torch.zeros(1, 1, 28, 28)])
+    qmodel.load_state_dict(saved["state_dict"])
+    return qmodel
+
+
+def save_quantized(qmodel: nn.Module, path: Path, fp32_fingerprint: str) -> None:
+    """Save a quantized model's state dict with its float weights' fingerprint.
+
+    Args:
+        qmodel: Quantized model
+        path: Destination file
+        fp32_fingerprint: model_fingerprint of the float model it came from
+    """
+    torch.save(
+        {"state_dict": qmodel.state_dict(), "fp32_fingerprint": fp32_fingerprint}, path
+    )
+
+
+def model_size_bytes(model: nn.Module) -> int:
+    """Size of a model's serialized state dict in bytes."""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+
+def batch1_latency_ms(model: nn.Module, runs: int = 200) -> float:
+    """Median batch-of-1 forward pass latency in milliseconds."""
+    x = torch.randn(1, 1, 28, 28)
+    times = []
+    with torch.no_grad():
+        model(x)  # warmup
+        for _ in range(runs):
+            start = time.perf_counter()
+            model(x)
+            times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def main(calibration_batches: int = 32, batch_size: int = 64) -> None:
+    """Quantize trained weights, check accuracy on MNIST test set and save.
+
+    Args:
+        calibration_batches: Number of training batches for calibration
+        batch_size: Batch size for calibration and evaluation
+    """
+    from itertools import islice
+
+    from guessme.model.train import evaluate, get_dataloaders
+    from guessme.predictor.backends import model_fingerprint
+
+    weights_dir = Path(__file__).parent / "weights"
+    device = torch.device("cpu")
+
+    model = MNISTNet()
+    model.load_state_dict(
+        torch.load(weights_dir / "mnist_cnn.pt", map_location=device, weights_only=True)
+    )
+    model.eval()
+
+    train_loader, test_loader = get_dataloaders(batch_size)
+    calibration = (images for images, _ in islice(train_loader, calibration_batches))
+    qmodel = quantize_model(model, calibration)
+
+    fp32_acc = evaluate(model, test_loader, device)
+    int8_acc = evaluate(qmodel, test_loader, device)
+
+    print(f"{'':>6} | {'accuracy':>9} | {'size KB':>8} | {'batch-1 ms':>10}")
+    for name, m, acc in (("fp32", model, fp32_acc), ("int8", qmodel, int8_acc)):
+        print(
+            f"{name:>6} | {acc:>8.2f}% | {model_size_bytes(m) / 1024:>8.1f} | {batch1_latency_ms(m):>10.3f}"
+        )
+    print(f"Accuracy change: {int8_acc - fp32_acc:+.2f} points")
+
+    save_quantized(qmodel, weights_dir / "mnist_cnn_int8.pt", model_fingerprint(model))
+    print(f"Saved quantized model to {weights_dir / 'mnist_cnn_int8.pt'}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Quantize MNIST model to INT8")
+    parser.add_argument(
+        "--calibration-batches", type=int, default=32, help="Calibration batches"
+    )
+    parser.add_argument("--batch-size", type=int, default=64, help="Batch size")
+    args = parser.parse_args()
+
+    main(calibration_batches=args.calibration_batches, batch_size=args.batch_size)
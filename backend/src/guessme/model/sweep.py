@@ -0,0 +1,499 @@
+"""Hyperparameter sweeps: train a grid of configurations in parallel.
+
+Every combination of the search space is one trial, trained on CPU in its
+own process, or on Ray Tune when it is installed. The cores are split
+evenly between the trials running at the same time, so they do not
+oversubscribe the machine. Trials are stopped early by the median rule:
+after a grace period, a trial whose accuracy at an epoch is below the
+median of the other trials at that epoch is stopped. The sweep is one
+MLflow run in the mnist-training experiment, with each trial nested
+under it. MLflow is imported only where runs are tracked, so the grid and
+stopping logic work without the train dependency group.
+
+Usage:
+    uv run python -m guessme.model.sweep --lr 0.0003 0.001 0.003 --batch-size 32 64
+    uv run python -m guessme.model.sweep --parallel 2 --backend local
+"""
+
+import itertools
+import os
+import statistics
+import time
+from collections.abc import Callable, MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import torch
+import torch.multiprocessing as mp
+import torch.nn as nn
+
+from guessme.model.cnn import MNISTNet
+from guessme.model.train import (
+    evaluate,
+    get_dataloaders,
+    setup_mlflow,
+    train_epoch,
+)
+
+BACKENDS = ("auto", "local", "ray")
+
+
+@dataclass(frozen=True)
+class TrialSettings:
+    """What every trial of a sweep shares."""
+
+    epochs: int
+    data_mode: str
+    bf16: bool
+    # Intra-op threads per trial
+    threads: int
+    parent_run_id: str
+
+
+@dataclass(frozen=True)
+class TrialResult:
+    """Outcome of one trial."""
+
+    name: str
+    config: dict
+    best_accuracy: float
+    epochs_run: int
+    stopped_early: bool
+
+
+def grid(space: dict[str, list]) -> list[dict]:
+    """Every combination of the values in a search space.
+
+    Args:
+        space: Hyperparameter name -> values to try, e.g. {"lr": [1e-3, 3e-3]}
+
+    Returns:
+        One config dict per combination, in itertools.product order
+    """
+    names = list(space)
+    return [
+        dict(zip(names, values, strict=True))
+        for values in itertools.product(*space.values())
+    ]
+
+
+def threads_per_trial(parallel: int) -> int:
+    """Split this machine's cores evenly between concurrent trials."""
+    return max(1, (os.cpu_count() or 1) // parallel)
+
+
+def ray_available() -> bool:
+    """Whether Ray Tune can be imported."""
+    try:
+        import ray.tune  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class MedianStopper:
+    """Median stopping rule over per-epoch accuracies of concurrent trials.
+
+    A trial is stopped once it has finished more than grace_epochs epochs
+    and its accuracy is below the median that at least min_trials other
+    trials reached at the same epoch. history may be a multiprocessing
+    Manager dict, so trials in different processes see each other; each
+    trial writes only its own key.
+    """
+
+    def __init__(
+        self,
+        history: MutableMapping[str, list[float]],
+        grace_epochs: int = 1,
+        min_trials: int = 3,
+    ) -> None:
+        """Create a stopper.
+
+        Args:
+            history: Trial name -> accuracy after each epoch, shared by trials
+            grace_epochs: Epochs every trial runs before it can be stopped
+            min_trials: Other trials needed at an epoch to compare against
+        """
+        self.history = history
+        self.grace_epochs = grace_epochs
+        self.min_trials = min_trials
+
+    def report(self, name: str, epoch: int, accuracy: float) -> bool:
+        """Record a trial's accuracy after an epoch.
+
+        Args:
+            name: Trial reporting
+            epoch: Zero-based epoch just finished
+            accuracy: Test accuracy after that epoch
+
+        Returns:
+            Whether the trial should stop
+        """
+        # Reassign rather than append: Manager proxies do not see mutations
+        self.history[name] = [*self.history.get(name, []), accuracy]
+        if epoch < self.grace_epochs:
+            return False
+        others = [
+            accuracies[epoch]
+            for other, accuracies in self.history.items()
+            if other != name and len(accuracies) > epoch
+        ]
+        if len(others) < self.min_trials:
+            return False
+        return accuracy < statistics.median(others)
+
+
+def run_trial(
+    name: str,
+    config: dict,
+    settings: TrialSettings,
+    report: Callable[[int, dict], bool],
+) -> TrialResult:
+    """Train one configuration, logged as a run nested under the sweep.
+
+    Args:
+        name: Trial name, used as the MLflow run name
+        config: Hyperparameters: "lr" and "batch_size"
+        settings: Settings shared by the sweep
+        report: Called with (epoch, metrics) after every epoch; returns
+            whether to stop
+
+    Returns:
+        The trial's best accuracy and how far it got
+    """
+    import mlflow
+
+    torch.set_num_threads(settings.threads)
+    # Same initial weights in every trial, so only the hyperparameters differ
+    torch.manual_seed(0)
+
+    # Trials share the CPU; its cores are what the sweep splits
+    device = torch.device("cpu")
+    train_loader, test_loader = get_dataloaders(
+        config["batch_size"], settings.data_mode
+    )
+    model = MNISTNet().to(device)
+    criterion = nn.CrossEntropyLoss()
+    optimizer = torch.optim.Adam(model.parameters(), lr=config["lr"])
+
+    setup_mlflow()
+    best_acc, epochs_run, stopped = 0.0, 0, False
+    # The sweep run samples system metrics for the whole machine; a sampler
+    # per trial would only add writers to the shared sqlite database
+    run = mlflow.start_run(
+        run_name=name,
+        parent_run_id=settings.parent_run_id,
+        log_system_metrics=False,
+    )
+    with run:
+        mlflow.log_params(
+            {
+                "epochs": settings.epochs,
+                "batch_size": config["batch_size"],
+                "learning_rate": config["lr"],
+                "optimizer": "Adam",
+                "data_mode": settings.data_mode,
+                "precision": "bf16" if settings.bf16 else "fp32",
+                "threads": settings.threads,
+            }
+        )
+
+        for epoch in range(settings.epochs):
+            epoch_start = time.time()
+            loss = train_epoch(
+                model, train_loader, optimizer, criterion, device, settings.bf16
+            )
+            acc = evaluate(model, test_loader, device, settings.bf16)
+            best_acc = max(best_acc, acc)
+            epochs_run = epoch + 1
+            metrics = {
+                "loss": loss,
+                "accuracy": acc,
+                "epoch_time_sec": time.time() - epoch_start,
+            }
+            mlflow.log_metrics(metrics, step=epoch)
+            print(f"{name} | Epoch {epochs_run}/{settings.epochs} | Acc: {acc:.2f}%")
+
+            should_stop = report(epoch, {**metrics, "best_accuracy": best_acc})
+            if should_stop and epochs_run < settings.epochs:
+                stopped = True
+                print(f"{name} | Stopped early: below the median")
+                break
+
+        mlflow.log_metric("best_accuracy", best_acc)
+        mlflow.set_tag("stopped_early", stopped)
+    return TrialResult(name, config, best_acc, epochs_run, stopped)
+
+
+def _local_trial(
+    name: str, config: dict, settings: TrialSettings, stopper: MedianStopper
+) -> TrialResult:
+    """Pool entry point: a trial that reports to the shared stopper."""
+
+    def report(epoch: int, metrics: dict) -> bool:
+        return stopper.report(name, epoch, metrics["accuracy"])
+
+    return run_trial(name, config, settings, report)
+
+
+def run_local(
+    configs: list[dict],
+    settings: TrialSettings,
+    parallel: int,
+    grace_epochs: int = 1,
+    min_trials: int = 3,
+) -> list[TrialResult]:
+    """Run trials in a pool of parallel worker processes.
+
+    Args:
+        configs: One hyperparameter dict per trial
+        settings: Settings shared by every trial
+        parallel: Trials running at once
+        grace_epochs: Epochs before a trial can be stopped early
+        min_trials: Other trials needed at an epoch to compare against
+
+    Returns:
+        Results in the order of configs
+    """
+    context = mp.get_context("spawn")
+    with (
+        context.Manager() as manager,
+        ProcessPoolExecutor(max_workers=parallel, mp_context=context) as pool,
+    ):
+        stopper = MedianStopper(manager.dict(), grace_epochs, min_trials)
+        futures = [
+            pool.submit(_local_trial, f"trial-{i}", config, settings, stopper)
+            for i, config in enumerate(configs)
+        ]
+        return [future.result() for future in futures]
+
+
+def _ray_trial(config: dict, settings: TrialSettings) -> None:
+    """Ray Tune trainable: report every epoch and let the scheduler stop it."""
+    from ray import tune
+
+    # tune.report replaced ray.train.report inside Tune in newer Ray releases
+    report_fn = getattr(tune, "report", None)
+    if report_fn is None:
+        from ray.train import report as report_fn
+
+    def report(epoch: int, metrics: dict) -> bool:
+        report_fn(metrics)
+        return False
+
+    name = f"trial-{tune.get_context().get_trial_id()}"
+    run_trial(name, config, settings, report)
+
+
+def run_ray(
+    space: dict[str, list],
+    settings: TrialSettings,
+    parallel: int,
+    grace_epochs: int = 1,
+    min_trials: int = 3,
+) -> list[TrialResult]:
+    """Run the grid on Ray Tune with its median stopping rule.
+
+    Each trial reserves settings.threads CPUs, so Ray never schedules
+    more trials than the cores can take.
+
+    Args:
+        space: Hyperparameter name -> values to try
+        settings: Settings shared by every trial
+        parallel: Most trials running at once
+        grace_epochs: Epochs before a trial can be stopped early
+        min_trials: Other trials needed at an epoch to compare against
+
+    Returns:
+        One result per trial
+    """
+    from ray import tune
+    from ray.tune.schedulers import MedianStoppingRule
+
+    trainable = tune.with_resources(
+        tune.with_parameters(_ray_trial, settings=settings),
+        {"cpu": settings.threads},
+    )
+    tuner = tune.Tuner(
+        trainable,
+        param_space={name: tune.grid_search(values) for name, values in space.items()},
+        tune_config=tune.TuneConfig(
+            metric="accuracy",
+            mode="max",
+            scheduler=MedianStoppingRule(
+                time_attr="training_iteration",
+                grace_period=grace_epochs,
+                min_samples_required=min_trials,
+            ),
+            max_concurrent_trials=parallel,
+        ),
+    )
+    results = []
+    for result in tuner.fit():
+        if result.error is not None:
+            raise result.error
+        epochs_run = result.metrics["training_iteration"]
+        results.append(
+            TrialResult(
+                name=f"trial-{result.metrics['trial_id']}",
+                config={name: result.config[name] for name in space},
+                best_accuracy=result.metrics["best_accuracy"],
+                epochs_run=epochs_run,
+                stopped_early=epochs_run < settings.epochs,
+            )
+        )
+    return results
+
+
+def main(
+    space: dict[str, list] | None = None,
+    epochs: int = 5,
+    parallel: int | None = None,
+    backend: str = "auto",
+    grace_epochs: int = 1,
+    min_trials: int = 3,
+    data_mode: str = "tensor",
+    bf16: bool = False,
+) -> list[TrialResult]:
+    """Run a sweep over a grid and print the trials, best first.
+
+    Args:
+        space: Hyperparameter name -> values; keys "lr" and "batch_size".
+            Defaults to lr 3e-4/1e-3/3e-3 and batch_size 64
+        epochs: Most epochs per trial
+        parallel: Trials running at once; defaults to one per core, capped
+            at the number of trials
+        backend: "local" processes, "ray" Tune, or "auto" for Ray when
+            it is installed
+        grace_epochs: Epochs before a trial can be stopped early
+        min_trials: Other trials needed at an epoch to compare against
+        data_mode: Dataset mode passed to get_dataloaders
+        bf16: Train and evaluate under bfloat16 autocast
+
+    Returns:
+        Results, best accuracy first
+    """
+    space = space or {"lr": [3e-4, 1e-3, 3e-3], "batch_size": [64]}
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    if backend == "auto":
+        backend = "ray" if ray_available() else "local"
+    configs = grid(space)
+    parallel = parallel or min(len(configs), os.cpu_count() or 1)
+    threads = threads_per_trial(parallel)
+
+    # Download or decode the data once, before trials race to do it
+    get_dataloaders(64, data_mode)
+
+    import mlflow
+
+    setup_mlflow()
+    with mlflow.start_run(run_name="sweep") as run:
+        mlflow.log_params(
+            {
+                **{f"space_{name}": values for name, values in space.items()},
+                "trials": len(configs),
+                "epochs": epochs,
+                "backend": backend,
+                "parallel": parallel,
+                "threads_per_trial": threads,
+                "grace_epochs": grace_epochs,
+                "min_trials": min_trials,
+                "precision": "bf16" if bf16 else "fp32",
+            }
+        )
+        print(
+            f"{len(configs)} trials | backend: {backend} | "
+            f"parallel: {parallel} | threads/trial: {threads}"
+        )
+
+        settings = TrialSettings(epochs, data_mode, bf16, threads, run.info.run_id)
+        start_time = time.time()
+        if backend == "ray":
+            results = run_ray(space, settings, parallel, grace_epochs, min_trials)
+        else:
+            results = run_local(configs, settings, parallel, grace_epochs, min_trials)
+        results.sort(key=lambda r: r.best_accuracy, reverse=True)
+
+        best = results[0]
+        mlflow.log_params({f"best_{k}": v for k, v in best.config.items()})
+        mlflow.log_metrics(
+            {
+                "best_accuracy": best.best_accuracy,
+                "stopped_early": sum(r.stopped_early for r in results),
+                "total_sweep_time_sec": time.time() - start_time,
+            }
+        )
+
+    print(
+        f"\n{'trial':>14} | {'lr':>8} | {'batch':>5} | {'epochs':>6} | {'best acc':>8}"
+    )
+    print("-" * 56)
+    for r in results:
+        stopped = " (stopped)" if r.stopped_early else ""
+        print(
+            f"{r.name[-14:]:>14} | {r.config['lr']:>8.2g} | "
+            f"{r.config['batch_size']:>5} | {r.epochs_run:>6} | "
+            f"{r.best_accuracy:>7.2f}%{stopped}"
+        )
+    print(f"MLflow sweep run ID: {run.info.run_id}")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sweep MNIST hyperparameters")
+    parser.add_argument(
+        "--lr",
+        type=float,
+        nargs="+",
+        default=[3e-4, 1e-3, 3e-3],
+        help="Learning rates to try",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, nargs="+", default=[64], help="Batch sizes to try"
+    )
+    parser.add_argument("--epochs", type=int, default=5, help="Most epochs per trial")
+    parser.add_argument(
+        "--parallel", type=int, help="Trials at once (default: one per core)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="auto",
+        help="Local processes, Ray Tune, or Ray when installed",
+    )
+    parser.add_argument(
+        "--grace-epochs",
+        type=int,
+        default=1,
+        help="Epochs before a trial can be stopped early",
+    )
+    parser.add_argument(
+        "--min-trials",
+        type=int,
+        default=3,
+        help="Other trials needed to compare against before stopping one",
+    )
+    parser.add_argument(
+        "--data",
+        choices=["tensor", "torchvision"],
+        default="tensor",
+        help="Dataset mode: memory-mapped tensors or per-sample torchvision",
+    )
+    parser.add_argument(
+        "--bf16", action="store_true", help="Train under bfloat16 autocast"
+    )
+    args = parser.parse_args()
+
+    main(
+        space={"lr": args.lr, "batch_size": args.batch_size},
+        epochs=args.epochs,
+        parallel=args.parallel,
+        backend=args.backend,
+        grace_epochs=args.grace_epochs,
+        min_trials=args.min_trials,
+        data_mode=args.data,
+        bf16=args.bf16,
+    )
@@ -1,16 +1,37 @@
-"""MNIST training script with PyTorch and MLflow tracking."""
+"""MNIST training script with PyTorch and MLflow tracking.
+
+MLflow comes from the train dependency group and is imported where runs
+are tracked, so the data and training-loop functions work without it.
+"""
 
 import platform
 import time
+from contextlib import nullcontext
 from pathlib import Path
 
-import mlflow
 import torch
 import torch.nn as nn
-from torch.utils.data import DataLoader
+from torch.nn.parallel import DistributedDataParallel
+from torch.utils.data import DataLoader, DistributedSampler
 from torchvision import datasets, transforms
 
+from guessme.model.checkpoint import (
+    AsyncCheckpointer,
+    load_checkpoint,
+    rng_state,
+    set_rng_state,
+)
 from guessme.model.cnn import MNISTNet
+from guessme.model.data import TensorLoader, TensorMNIST
+from guessme.model.distributed import (
+    WorkerInfo,
+    all_reduce_mean,
+    init_worker,
+    launched_by_torchrun,
+    local_main_first,
+    shutdown_worker,
+    spawn,
+)
 
 
 def get_system_info() -> dict:
@@ -35,23 +56,66 @@ def get_device() -> torch.device:
     return torch.device("cpu")
 
 
-def get_dataloaders(batch_size: int = 64) -> tuple[DataLoader, DataLoader]:
+def setup_mlflow() -> None:
+    """Point MLflow at backend/mlflow.db and the mnist-training experiment."""
+    import mlflow
+
+    # MLflow db in backend/ directory (4 levels up from train.py)
+    backend_dir = Path(__file__).resolve().parent.parent.parent.parent
+    mlflow_db = backend_dir / "mlflow.db"
+    print(f"[DEBUG] MLflow DB: {mlflow_db}")
+    mlflow.set_tracking_uri(f"sqlite:///{mlflow_db}")
+    mlflow.set_experiment("mnist-training")
+    mlflow.enable_system_metrics_logging()
+
+
+def get_dataloaders(
+    batch_size: int = 64,
+    mode: str = "tensor",
+    rank: int = 0,
+    world_size: int = 1,
+) -> tuple[DataLoader | TensorLoader, DataLoader | TensorLoader]:
     """Create train and test dataloaders for MNIST.
 
     Args:
         batch_size: Number of images per batch
+        mode: "tensor" to batch memory-mapped uint8 tensors (fast), or
+            "torchvision" for the per-sample PIL dataset and transforms
+        rank: This worker's shard of both splits
+        world_size: Number of data-parallel workers sharing the data
 
     Returns:
         (train_loader, test_loader)
     """
+    # Download and load datasets
+    data_dir = Path(__file__).parent / "data"
+    # Workers must shuffle identically so their shards stay disjoint
+    generator = torch.Generator().manual_seed(0) if world_size > 1 else None
+
+    if mode == "tensor":
+        train_loader = TensorLoader(
+            TensorMNIST.load(train=True, data_dir=data_dir),
+            batch_size=batch_size,
+            shuffle=True,
+            generator=generator,
+            rank=rank,
+            world_size=world_size,
+        )
+        test_loader = TensorLoader(
+            TensorMNIST.load(train=False, data_dir=data_dir),
+            batch_size=batch_size,
+            rank=rank,
+            world_size=world_size,
+        )
+        return train_loader, test_loader
+    if mode != "torchvision":
+        raise ValueError(f"Unknown data mode {mode!r}")
+
     # MNIST normalization values
     transform = transforms.Compose(
         [transforms.ToTensor(), transforms.Normalize((0.1307,), (0.3081,))]
     )
 
-    # Download and load datasets
-    data_dir = Path(__file__).parent / "data"
-
     train_dataset = datasets.MNIST(
         root=data_dir, train=True, download=True, transform=transform
     )
@@ -60,6 +124,21 @@ def get_dataloaders(batch_size: int = 64) -> tuple[DataLoader, DataLoader]:
         root=data_dir, train=False, download=True, transform=transform
     )
 
+    if world_size > 1:
+        train_sampler = DistributedSampler(
+            train_dataset, num_replicas=world_size, rank=rank, shuffle=True
+        )
+        test_sampler = DistributedSampler(
+            test_dataset, num_replicas=world_size, rank=rank, shuffle=False
+        )
+        train_loader = DataLoader(
+            train_dataset, batch_size=batch_size, sampler=train_sampler
+        )
+        test_loader = DataLoader(
+            test_dataset, batch_size=batch_size, sampler=test_sampler
+        )
+        return train_loader, test_loader
+
     train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
 
     test_loader = DataLoader(test_dataset, batch_size=batch_size, shuffle=False)
@@ -73,6 +152,7 @@ def train_epoch(
     optimizer: torch.optim.Optimizer,
     criterion: nn.Module,
     device: torch.device,
+    bf16: bool = False,
 ) -> float:
     """Train for one epoch.
 
@@ -82,6 +162,8 @@ def train_epoch(
         optimizer: Optimizer (e.g., Adam)
         criterion: Loss function (e.g., CrossEntropyLoss)
         device: Device to train on
+        bf16: Run forward and loss under bfloat16 autocast; weights,
+            gradients and optimizer state stay fp32, so no loss scaling
 
     Returns:
         Average loss for the epoch
@@ -94,8 +176,9 @@ def train_epoch(
 
         # Forward pass
         optimizer.zero_grad()
-        outputs = model(images)
-        loss = criterion(outputs, labels)
+        with torch.autocast(device.type, dtype=torch.bfloat16, enabled=bf16):
+            outputs = model(images)
+            loss = criterion(outputs, labels)
 
         # Backward pass
         loss.backward()
@@ -106,13 +189,16 @@ def train_epoch(
     return total_loss / len(loader)
 
 
-def evaluate(model: nn.Module, loader: DataLoader, device: torch.device) -> float:
+def evaluate(
+    model: nn.Module, loader: DataLoader, device: torch.device, bf16: bool = False
+) -> float:
     """Evaluate model accuracy.
 
     Args:
         model: The CNN model
         loader: Test data loader
         device: Device to evaluate on
+        bf16: Run the model under bfloat16 autocast
 
     Returns:
         Accuracy (0-100%)
@@ -124,7 +210,8 @@ def evaluate(model: nn.Module, loader: DataLoader, device: torch.device) -> floa
     with torch.no_grad():
         for images, labels in loader:
             images, labels = images.to(device), labels.to(device)
-            outputs = model(images)
+            with torch.autocast(device.type, dtype=torch.bfloat16, enabled=bf16):
+                outputs = model(images)
             _, predicted = torch.max(outputs, 1)
             total += labels.size(0)
             correct += (predicted == labels).sum().item()
@@ -132,86 +219,215 @@ def evaluate(model: nn.Module, loader: DataLoader, device: torch.device) -> floa
     return 100 * correct / total
 
 
-def main(epochs: int = 5, batch_size: int = 64, lr: float = 0.001) -> None:
+def main(
+    epochs: int = 5,
+    batch_size: int = 64,
+    lr: float = 0.001,
+    data_mode: str = "tensor",
+    workers: int = 1,
+    checkpoint_path: Path | None = None,
+    checkpoint_every: int = 1,
+    resume: bool = False,
+    bf16: bool = False,
+) -> None:
     """Train MNIST model and save weights.
 
+    With workers > 1, trains data-parallel in that many local processes.
+    Under torchrun, the launcher's worker group is used instead, which can
+    span several machines.
+
     Args:
         epochs: Number of training epochs
-        batch_size: Batch size for training
+        batch_size: Batch size for training, per worker
         lr: Learning rate
+        data_mode: Dataset mode passed to get_dataloaders
+        workers: Local data-parallel worker processes
+        checkpoint_path: Full training checkpoint; defaults to
+            weights/checkpoint.pt
+        checkpoint_every: Write the checkpoint every this many epochs
+        resume: Continue the run saved in checkpoint_path
+        bf16: Train and evaluate under bfloat16 autocast
     """
-    # Setup MLflow
-    # MLflow db in backend/ directory (4 levels up from train.py)
-    backend_dir = Path(__file__).resolve().parent.parent.parent.parent
-    mlflow_db = backend_dir / "mlflow.db"
-    print(f"[DEBUG] MLflow DB: {mlflow_db}")
-    mlflow.set_tracking_uri(f"sqlite:///{mlflow_db}")
-    mlflow.set_experiment("mnist-training")
-    mlflow.enable_system_metrics_logging()
-
-    # Setup
-    device = get_device()
-    print(f"Using device: {device}")
+    checkpoint_path = checkpoint_path or Path(__file__).parent / "weights/checkpoint.pt"
+    args = (
+        epochs,
+        batch_size,
+        lr,
+        data_mode,
+        checkpoint_path,
+        checkpoint_every,
+        resume,
+        bf16,
+    )
+    if launched_by_torchrun():
+        train_worker(None, None, *args)
+    elif workers > 1:
+        spawn(train_worker, workers, *args)
+    else:
+        train_worker(0, 1, *args)
+
+
+def train_worker(
+    rank: int | None,
+    world_size: int | None,
+    epochs: int,
+    batch_size: int,
+    lr: float,
+    data_mode: str,
+    checkpoint_path: Path,
+    checkpoint_every: int,
+    resume: bool,
+    bf16: bool,
+) -> None:
+    """Run one training worker; with a single worker this is plain training.
+
+    Every worker trains on its shard with gradients averaged by DDP. Loss
+    and accuracy are averaged across workers, and only rank 0 talks to
+    MLflow and saves weights.
 
-    # Data
-    train_loader, test_loader = get_dataloaders(batch_size)
-    print(f"Train: {len(train_loader.dataset)} images")
-    print(f"Test: {len(test_loader.dataset)} images")
+    Args:
+        rank: Worker rank, or None to read it from the environment
+        world_size: Worker count, or None to read it from the environment
+        epochs: Number of training epochs
+        batch_size: Batch size for training, per worker
+        lr: Learning rate
+        data_mode: Dataset mode passed to get_dataloaders
+        checkpoint_path: Full training checkpoint to write and resume from
+        checkpoint_every: Write the checkpoint every this many epochs
+        resume: Continue the run saved in checkpoint_path
+        bf16: Train and evaluate under bfloat16 autocast
+    """
+    worker = init_worker(rank, world_size)
+    try:
+        _train(
+            worker,
+            epochs,
+            batch_size,
+            lr,
+            data_mode,
+            checkpoint_path,
+            checkpoint_every,
+            resume,
+            bf16,
+        )
+    finally:
+        shutdown_worker()
+
+
+def _train(
+    worker: WorkerInfo,
+    epochs: int,
+    batch_size: int,
+    lr: float,
+    data_mode: str,
+    checkpoint_path: Path,
+    checkpoint_every: int,
+    resume: bool,
+    bf16: bool,
+) -> None:
+    """Training loop shared by single-process and data-parallel runs."""
+    import mlflow
+
+    if worker.is_main:
+        setup_mlflow()
+
+    # Setup; gloo data parallelism runs on CPU
+    device = torch.device("cpu") if worker.distributed else get_device()
+    if worker.is_main:
+        print(f"Using device: {device} | workers: {worker.world_size}")
+
+    # Data; one worker per machine decodes or downloads it first
+    with local_main_first(worker):
+        train_loader, test_loader = get_dataloaders(
+            batch_size, data_mode, worker.rank, worker.world_size
+        )
+    if worker.is_main:
+        print(f"Train: {len(train_loader.dataset)} images")
+        print(f"Test: {len(test_loader.dataset)} images")
 
     # Model
     model = MNISTNet().to(device)
     criterion = nn.CrossEntropyLoss()
     optimizer = torch.optim.Adam(model.parameters(), lr=lr)
 
-    with mlflow.start_run():
-        # Log system info
-        sys_info = get_system_info()
-        mlflow.log_params({f"sys_{k}": v for k, v in sys_info.items()})
-
-        # Log hyperparameters
-        mlflow.log_params(
-            {
-                "epochs": epochs,
-                "batch_size": batch_size,
-                "learning_rate": lr,
-                "optimizer": "Adam",
-                "loss_function": "CrossEntropyLoss",
-                "device": str(device),
-            }
-        )
+    # Resume after the last completed epoch; every worker loads the same file
+    start_epoch, best_acc, run_id = 0, 0.0, None
+    generator = getattr(train_loader, "generator", None)
+    if resume:
+        state = load_checkpoint(checkpoint_path)
+        model.load_state_dict(state["model"])
+        optimizer.load_state_dict(state["optimizer"])
+        set_rng_state(state["rng"], generator)
+        start_epoch, best_acc = state["epoch"], state["best_accuracy"]
+        run_id = state["mlflow_run_id"]
+        if worker.is_main:
+            print(f"Resuming from {checkpoint_path} after epoch {start_epoch}")
+    net = DistributedDataParallel(model) if worker.distributed else model
+
+    run = mlflow.start_run(run_id=run_id) if worker.is_main else nullcontext()
+    with run, AsyncCheckpointer() as checkpointer:
+        if worker.is_main and not resume:
+            # Log system info
+            sys_info = get_system_info()
+            mlflow.log_params({f"sys_{k}": v for k, v in sys_info.items()})
+
+            # Log hyperparameters
+            mlflow.log_params(
+                {
+                    "epochs": epochs,
+                    "batch_size": batch_size,
+                    "learning_rate": lr,
+                    "optimizer": "Adam",
+                    "loss_function": "CrossEntropyLoss",
+                    "device": str(device),
+                    "data_mode": data_mode,
+                    "workers": worker.world_size,
+                    "global_batch_size": batch_size * worker.world_size,
+                    "precision": "bf16" if bf16 else "fp32",
+                }
+            )
 
-        # Log dataset info
-        mlflow.log_params(
-            {
-                "train_samples": len(train_loader.dataset),
-                "test_samples": len(test_loader.dataset),
-                "num_classes": 10,
-                "input_shape": "1x28x28",
-            }
-        )
+            # Log dataset info
+            mlflow.log_params(
+                {
+                    "train_samples": len(train_loader.dataset),
+                    "test_samples": len(test_loader.dataset),
+                    "num_classes": 10,
+                    "input_shape": "1x28x28",
+                }
+            )
 
-        # Log model architecture
-        total_params = sum(p.numel() for p in model.parameters())
-        trainable_params = sum(p.numel() for p in model.parameters() if p.requires_grad)
-        mlflow.log_params(
-            {
-                "model_name": "MNISTNet",
-                "total_params": total_params,
-                "trainable_params": trainable_params,
-            }
-        )
+            # Log model architecture
+            total_params = sum(p.numel() for p in model.parameters())
+            trainable_params = sum(
+                p.numel() for p in model.parameters() if p.requires_grad
+            )
+            mlflow.log_params(
+                {
+                    "model_name": "MNISTNet",
+                    "total_params": total_params,
+                    "trainable_params": trainable_params,
+                }
+            )
 
         # Train
-        best_acc = 0.0
         weights_dir = Path(__file__).parent / "weights"
         weights_dir.mkdir(exist_ok=True)
         start_time = time.time()
 
-        for epoch in range(epochs):
+        for epoch in range(start_epoch, epochs):
             epoch_start = time.time()
-            loss = train_epoch(model, train_loader, optimizer, criterion, device)
-            acc = evaluate(model, test_loader, device)
+            sampler = getattr(train_loader, "sampler", None)
+            if isinstance(sampler, DistributedSampler):
+                sampler.set_epoch(epoch)
+            loss = all_reduce_mean(
+                train_epoch(net, train_loader, optimizer, criterion, device, bf16)
+            )
+            # Shards are equal-sized, so the mean of accuracies is the accuracy
+            acc = all_reduce_mean(evaluate(model, test_loader, device, bf16))
             epoch_time = time.time() - epoch_start
+            if not worker.is_main:
+                continue
 
             # Log metrics per epoch
             mlflow.log_metrics(
@@ -229,9 +445,27 @@ def main(epochs: int = 5, batch_size: int = 64, lr: float = 0.001) -> None:
             # Save best model
             if acc > best_acc:
                 best_acc = acc
-                torch.save(model.state_dict(), weights_dir / "mnist_cnn.pt")
+                checkpointer.save(model.state_dict(), weights_dir / "mnist_cnn.pt")
                 print(f"  → Saved best model (acc: {acc:.2f}%)")
 
+            # Save everything needed to continue after this epoch
+            if (epoch + 1) % checkpoint_every == 0 or epoch + 1 == epochs:
+                checkpointer.save(
+                    {
+                        "model": model.state_dict(),
+                        "optimizer": optimizer.state_dict(),
+                        "epoch": epoch + 1,
+                        "best_accuracy": best_acc,
+                        "rng": rng_state(generator),
+                        "mlflow_run_id": mlflow.active_run().info.run_id,
+                    },
+                    checkpoint_path,
+                )
+
+        if not worker.is_main:
+            return
+        checkpointer.wait()
+
         # Log final metrics and model artifact
         total_time = time.time() - start_time
         mlflow.log_metrics(
@@ -254,6 +488,42 @@ if __name__ == "__main__":
     parser.add_argument("--epochs", type=int, default=5, help="Number of epochs")
     parser.add_argument("--batch-size", type=int, default=64, help="Batch size")
     parser.add_argument("--lr", type=float, default=0.001, help="Learning rate")
+    parser.add_argument(
+        "--data",
+        choices=["tensor", "torchvision"],
+        default="tensor",
+        help="Dataset mode: memory-mapped tensors or per-sample torchvision",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Data-parallel worker processes (ignored under torchrun)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="Training checkpoint path (default: weights/checkpoint.pt)",
+    )
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=1, help="Epochs between checkpoints"
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="Continue from the checkpoint"
+    )
+    parser.add_argument(
+        "--bf16", action="store_true", help="Train under bfloat16 autocast"
+    )
     args = parser.parse_args()
 
-    main(epochs=args.epochs, batch_size=args.batch_size, lr=args.lr)
+    main(
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        lr=args.lr,
+        data_mode=args.data,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        checkpoint_every=args.checkpoint_every,
+        resume=args.resume,
+        bf16=args.bf16,
+    )
@@ -0,0 +1,169 @@
+"""Dynamic micro-batching for concurrent prediction requests."""
+
+import asyncio
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any
+
+from guessme.metrics import BATCH_SIZE, QUEUE_WAIT
+
+
+@dataclass
+class BatchStats:
+    """Counters for tuning max batch size and max wait time."""
+
+    batches: int = 0
+    items: int = 0
+    batch_sizes: Counter = field(default_factory=Counter)
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+    # Moving average of batch run time per item, for queue wait estimates
+    run_ms_per_item: float = 0.0
+
+    def record(self, size: int, waits_ms: list[float]) -> None:
+        """Record one dispatched batch and the queue wait of its items."""
+        self.batches += 1
+        self.items += size
+        self.batch_sizes[size] += 1
+        self.wait_ms_total += sum(waits_ms)
+        self.wait_ms_max = max(self.wait_ms_max, *waits_ms)
+
+        BATCH_SIZE.observe(size)
+        for wait_ms in waits_ms:
+            QUEUE_WAIT.observe(wait_ms / 1000)
+
+    def record_run(self, size: int, run_ms: float, alpha: float = 0.2) -> None:
+        """Fold one batch's run time into the per-item moving average."""
+        per_item = run_ms / size
+        if self.run_ms_per_item == 0.0:
+            self.run_ms_per_item = per_item
+        else:
+            self.run_ms_per_item += alpha * (per_item - self.run_ms_per_item)
+
+    def snapshot(self) -> dict:
+        """Return stats as a plain dict."""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "mean_wait_ms": self.wait_ms_total / self.items if self.items else 0.0,
+            "max_wait_ms": self.wait_ms_max,
+            "run_ms_per_item": self.run_ms_per_item,
+        }
+
+
+class MicroBatcher:
+    """Collect concurrent requests into batches for one batched call.
+
+    Items are queued by submit(). A background task takes the first waiting
+    item, then keeps collecting until max_batch_size items are queued or
+    max_wait_ms has passed since the first item arrived. The batch function
+    then runs once, in an executor so the event loop stays free, and each
+    caller receives its own result. At most max_concurrency batches run at
+    a time; while all slots are busy, new requests accumulate into the next
+    batch.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[list[Any]], list[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        executor: Executor | None = None,
+        max_concurrency: int = 1,
+    ) -> None:
+        """Configure the batcher.
+
+        Args:
+            fn: Batch function mapping a list of items to a list of results
+            max_batch_size: Maximum number of items per batch
+            max_wait_ms: Maximum time to wait for a batch to fill
+            executor: Executor to run fn in (default: the loop's executor)
+            max_concurrency: Maximum number of batches running at once
+        """
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.stats = BatchStats()
+
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result.
+
+        Args:
+            item: Input for the batch function
+
+        Returns:
+            The batch function's result for this item
+        """
+        loop = asyncio.get_running_loop()
+        self._ensure_worker(loop)
+        future = loop.create_future()
+        self._queue.put_nowait((item, future, time.perf_counter()))
+        return await future
+
+    def _ensure_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the collector task on the running loop if needed."""
+        if self._task is not None and not self._task.done():
+            if self._task.get_loop() is loop:
+                return
+            self._task.cancel()
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._run(self._queue))
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """Collect batches and dispatch them until cancelled."""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_concurrency)
+        while True:
+            await slots.acquire()
+            batch = [await queue.get()]
+            deadline = batch[0][2] + self.max_wait_ms / 1000
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    if timeout <= 0:
+                        batch.append(queue.get_nowait())
+                    else:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except (asyncio.QueueEmpty, TimeoutError):
+                    break
+
+            dispatched = time.perf_counter()
+            self.stats.record(
+                len(batch), [(dispatched - queued) * 1000 for _, _, queued in batch]
+            )
+
+            task = loop.create_task(self._dispatch(batch, slots))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _dispatch(self, batch: list[tuple], slots: asyncio.Semaphore) -> None:
+        """Run the batch function in the executor and resolve callers."""
+        loop = asyncio.get_running_loop()
+        items = [item for item, _, _ in batch]
+        start = time.perf_counter()
+        try:
+            results = await loop.run_in_executor(self.executor, self.fn, items)
+            self.stats.record_run(len(items), (time.perf_counter() - start) * 1000)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            slots.release()
+
+        for (_, future, _), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
@@ -1,53 +1,201 @@
 """MNIST prediction service."""
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import torch
 import torch.nn.functional as F
 
+from guessme.config import Settings
+from guessme.metrics import STAGE_LATENCY
 from guessme.model.cnn import MNISTNet
-from guessme.model.preprocess import canvas_to_tensor
+from guessme.model.preprocess import PreprocessPipeline
+from guessme.model.quantize import load_quantized, quantize_model
+from guessme.predictor.backends import build_backend, model_fingerprint
+from guessme.predictor.batching import MicroBatcher
+from guessme.predictor.cache import ResultCache, input_keys
+from guessme.predictor.singleflight import SingleFlight, bitmap_key, points_key
+
+PRECISIONS = ("fp32", "int8", "bf16")
+
+_FORWARD_LATENCY = STAGE_LATENCY.labels("forward")
 
 
 class Predictor:
     """Core predictor logic."""
 
-    def __init__(self, weights_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        weights_path: Path | None = None,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        inference_workers: int = 1,
+        precision: str = "fp32",
+        backend: str = "eager",
+        compile_cache_dir: Path | None = None,
+        cache_size: int = 4096,
+        cache_ttl_s: float = 300.0,
+    ) -> None:
         """Load the trained model.
 
         Args:
             weights_path: Path to model weights. If None, uses default path.
+            max_batch_size: Maximum requests per batched forward pass
+            max_wait_ms: Maximum time a request waits for its batch to fill
+            inference_workers: Threads running batches concurrently
+            precision: "fp32", "int8" for quantized CPU inference, or "bf16"
+                for CPU inference under bfloat16 autocast
+            backend: "eager", "script" (frozen TorchScript) or "compile"
+            compile_cache_dir: Where compiled models are cached. If None,
+                uses a "compiled" directory next to the weights.
+            cache_size: Maximum cached prediction results; 0 disables
+            cache_ttl_s: Seconds a cached result stays valid
         """
-        # Device selection
-        if torch.backends.mps.is_available():
+        if precision not in PRECISIONS:
+            raise ValueError(
+                f"precision must be one of {PRECISIONS}, got {precision!r}"
+            )
+        self.precision = precision
+        if precision == "bf16" and backend == "script":
+            # Frozen TorchScript graphs run in fp32 regardless of autocast
+            print("Warning: bf16 is not supported by the script backend, using eager")
+            backend = "eager"
+
+        # Device selection (quantized and bf16 kernels are CPU-only here)
+        if precision == "fp32" and torch.backends.mps.is_available():
             self.device = torch.device("mps")
         else:
             self.device = torch.device("cpu")
 
-        # Load model
-        self.model = MNISTNet().to(self.device)
-
         # Load weights
         if weights_path is None:
             weights_path = (
                 Path(__file__).parent.parent / "model" / "weights" / "mnist_cnn.pt"
             )
+        if compile_cache_dir is None:
+            compile_cache_dir = weights_path.parent / "compiled"
+        self.backend = backend
+        self.compile_cache_dir = compile_cache_dir
+
+        # Results of recent inputs, invalidated whenever the weights change
+        self.cache = ResultCache(max_entries=cache_size, ttl_s=cache_ttl_s)
+        self.reload_weights(weights_path)
+
+        # Preprocessing with kernels and grids resident on the model device
+        self.pipeline = PreprocessPipeline(device=self.device)
+
+        # Dedicated threads for CPU-bound work, keeping the event loop free
+        self.executor = ThreadPoolExecutor(
+            max_workers=inference_workers, thread_name_prefix="inference"
+        )
+
+        # Identical concurrent requests share one computation
+        self.inflight = SingleFlight()
+
+        # Concurrent async requests share one batched forward pass
+        self.batcher = MicroBatcher(
+            self.predict_batch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            executor=self.executor,
+            max_concurrency=inference_workers,
+        )
 
+        # Client-rasterized bitmaps skip rasterization and batch separately
+        self.bitmap_batcher = MicroBatcher(
+            self.predict_bitmaps,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            executor=self.executor,
+            max_concurrency=inference_workers,
+        )
+
+        # Live predictions from already preprocessed drawings batch separately
+        self.image_batcher = MicroBatcher(
+            self.classify_images,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            executor=self.executor,
+            max_concurrency=inference_workers,
+        )
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "Predictor":
+        """Create a predictor from serving settings."""
+        return cls(
+            max_batch_size=settings.max_batch_size,
+            max_wait_ms=settings.max_wait_ms,
+            inference_workers=settings.inference_workers,
+            precision=settings.precision,
+            backend=settings.backend,
+            compile_cache_dir=settings.compile_cache_dir,
+            cache_size=settings.cache_size,
+            cache_ttl_s=settings.cache_ttl_s,
+        )
+
+    def reload_weights(self, weights_path: Path) -> None:
+        """Load weights and rebuild the forward pass, invalidating the cache.
+
+        Used at startup and to swap in new weights while serving; requests
+        running meanwhile finish on the previous model.
+
+        Args:
+            weights_path: Path to model weights
+        """
+        model = MNISTNet().to(self.device)
         if weights_path.exists():
-            self.model.load_state_dict(
-                torch.load(weights_path, map_location=self.device, weights_only=True)
+            # mmap avoids reading the whole file up front on load
+            model.load_state_dict(
+                torch.load(
+                    weights_path,
+                    map_location=self.device,
+                    weights_only=True,
+                    mmap=True,
+                )
             )
             print(f"Loaded weights from {weights_path}")
         else:
             print(f"Warning: No weights found at {weights_path}, using random weights")
 
-        self.model.eval()
+        model.eval()
+
+        if self.precision == "int8":
+            model = self._quantize(model, weights_path)
+
+        # Forward pass, possibly through a frozen or compiled graph
+        forward_fn = build_backend(model, self.backend, self.compile_cache_dir)
 
-    def predict(self, points: list[dict]) -> dict:
+        self.model, self.forward_fn = model, forward_fn
+        self.cache.invalidate(model_fingerprint(model))
+
+    def warmup(self) -> float:
+        """Run forward passes at representative batch sizes.
+
+        The first calls initialize kernels and allocator pools, so running
+        them before serving keeps that cost off real requests. Batch sizes
+        are powers of two up to the batcher's max_batch_size.
+
+        Returns:
+            Warmup wall time in milliseconds
+        """
+        stroke = torch.tensor([[100.0, 100.0], [300.0, 300.0]])
+        start = time.perf_counter()
+        batch_size = 1
+        while True:
+            # Bypass the result cache so every size runs the model
+            self._forward_results(self.pipeline([stroke] * batch_size))
+            if batch_size >= self.batcher.max_batch_size:
+                break
+            batch_size = min(batch_size * 2, self.batcher.max_batch_size)
+        return (time.perf_counter() - start) * 1000
+
+    def predict(self, points: torch.Tensor | list[dict]) -> dict:
         """Predict digit from canvas points.
 
         Args:
-            points: List of {"x": float, "y": float} from canvas
+            points: (N, 2) float32 tensor of canvas (x, y), or list of
+                {"x": float, "y": float}
 
         Returns:
             {"digit": int, "confidence": int}
@@ -56,23 +204,162 @@ class Predictor:
         result = self._inference(tensor)
         return result
 
-    def _preprocess(self, points: list[dict]) -> torch.Tensor:
-        """Preprocess canvas points to tensor."""
-        tensor = canvas_to_tensor(points)
+    async def predict_async(self, points: torch.Tensor | list[dict]) -> dict:
+        """Predict digit without blocking the event loop.
 
-        # Normalize like MNIST (mean=0.1307, std=0.3081)
-        tensor = (tensor - 0.1307) / 0.3081
+        Preprocessing and inference run on the inference executor, batched
+        with other concurrent callers. Concurrent calls whose points scale
+        to the same grid cells share a single prediction.
 
-        # Add batch dimension: (1, 28, 28) -> (1, 1, 28, 28)
-        tensor = tensor.unsqueeze(0).to(self.device)
+        Args:
+            points: (N, 2) float32 tensor of canvas (x, y), or list of
+                {"x": float, "y": float}
 
-        return tensor
+        Returns:
+            {"digit": int, "confidence": int}
+        """
+        result = await self.inflight.do(
+            points_key(points), lambda: self.batcher.submit(points)
+        )
+        return dict(result)
+
+    def predict_batch(self, drawings: list[torch.Tensor | list[dict]]) -> list[dict]:
+        """Predict digits for many drawings with one forward pass.
+
+        Args:
+            drawings: List of drawings, each an (N, 2) tensor or list of dicts
+
+        Returns:
+            List of {"digit": int, "confidence": int}, one per drawing
+        """
+        return self._inference_batch(self.pipeline(drawings))
+
+    def predict_bitmaps(self, bitmaps: list[torch.Tensor]) -> list[dict]:
+        """Predict digits for 28x28 stroke bitmaps rasterized by the client.
+
+        Rasterization is skipped; centering, blur and normalization run as
+        for points.
+
+        Args:
+            bitmaps: List of (28, 28) stroke bitmaps with values in 0-1
+
+        Returns:
+            List of {"digit": int, "confidence": int}, one per bitmap
+        """
+        images = torch.stack(bitmaps).unsqueeze(1)
+        return self._inference_batch(self.pipeline.transform(images))
+
+    async def predict_bitmap_async(self, bitmap: torch.Tensor) -> dict:
+        """Predict a client-rasterized bitmap without blocking the event loop.
+
+        Concurrent calls with the same bitmap share a single prediction.
+
+        Args:
+            bitmap: (28, 28) stroke bitmap with values in 0-1
+
+        Returns:
+            {"digit": int, "confidence": int}
+        """
+        result = await self.inflight.do(
+            bitmap_key(bitmap), lambda: self.bitmap_batcher.submit(bitmap)
+        )
+        return dict(result)
+
+    def classify_images(self, images: list[torch.Tensor]) -> list[torch.Tensor]:
+        """Compute class probabilities for already preprocessed drawings.
+
+        Args:
+            images: List of (1, 28, 28) unnormalized model inputs, e.g. from
+                StrokeRaster.to_tensor
+
+        Returns:
+            List of (10,) probability tensors, one per image
+        """
+        tensor = self.pipeline.finalize(torch.stack(images))
+        return list(self._probabilities(tensor))
+
+    async def classify_image_async(self, image: torch.Tensor) -> torch.Tensor:
+        """Compute class probabilities without blocking the event loop.
+
+        Args:
+            image: (1, 28, 28) unnormalized model input
+
+        Returns:
+            (10,) tensor of class probabilities
+        """
+        return await self.image_batcher.submit(image)
+
+    def _quantize(self, model: torch.nn.Module, weights_path: Path) -> torch.nn.Module:
+        """Load the calibrated INT8 model, or quantize Linear layers only.
+
+        The calibrated model is only used if it was quantized from the
+        float weights just loaded; after retraining it is stale until
+        quantize is re-run.
+        """
+        int8_path = weights_path.with_name(f"{weights_path.stem}_int8.pt")
+        if not int8_path.exists():
+            print(
+                f"Warning: No calibrated model at {int8_path}, "
+                "quantizing Linear layers only"
+            )
+            return quantize_model(model)
+
+        try:
+            qmodel = load_quantized(int8_path, model_fingerprint(model))
+        except ValueError as e:
+            print(f"Warning: {e}, quantizing Linear layers only")
+            return quantize_model(model)
+        print(f"Loaded quantized weights from {int8_path}")
+        return qmodel
+
+    def close(self) -> None:
+        """Shut down the inference executor."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _preprocess(self, points: torch.Tensor | list[dict]) -> torch.Tensor:
+        """Preprocess canvas points to a normalized (1, 1, 28, 28) tensor."""
+        return self.pipeline([points])
 
     def _inference(self, tensor: torch.Tensor) -> dict:
         """Run model inference."""
-        with torch.no_grad():
-            logits = self.model(tensor)
-            probs = F.softmax(logits, dim=1)
-            confidence, digit = torch.max(probs, dim=1)
+        return self._inference_batch(tensor)[0]
+
+    def _inference_batch(self, tensor: torch.Tensor) -> list[dict]:
+        """Run model inference on a (N, 1, 28, 28) batch.
+
+        Inputs already in the result cache skip the model; the rest run as
+        one smaller batch and are added to the cache.
+        """
+        if self.cache.max_entries <= 0:
+            return self._forward_results(tensor)
+
+        version = self.cache.version
+        keys = input_keys(tensor)
+        results = [self.cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            index = torch.tensor(missing, device=tensor.device)
+            computed = self._forward_results(tensor[index])
+            for i, result in zip(missing, computed, strict=True):
+                results[i] = result
+                self.cache.put(keys[i], result, version)
+        return results
+
+    def _forward_results(self, tensor: torch.Tensor) -> list[dict]:
+        """Run the model on a (N, 1, 28, 28) batch and pick each top class."""
+        confidence, digit = torch.max(self._probabilities(tensor), dim=1)
+
+        return [
+            {"digit": d, "confidence": int(c * 100)}
+            for d, c in zip(digit.tolist(), confidence.tolist(), strict=True)
+        ]
 
-        return {"digit": digit.item(), "confidence": int(confidence.item() * 100)}
+    def _probabilities(self, tensor: torch.Tensor) -> torch.Tensor:
+        """Run the model on a (N, 1, 28, 28) batch, returning (N, 10) probs."""
+        autocast = torch.autocast(
+            self.device.type, dtype=torch.bfloat16, enabled=self.precision == "bf16"
+        )
+        with torch.no_grad(), _FORWARD_LATENCY.time():
+            with autocast:
+                logits = self.forward_fn(tensor)
+            return F.softmax(logits.float(), dim=1).cpu()
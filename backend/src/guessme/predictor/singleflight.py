@@ -0,0 +1,77 @@
+"""Coalescing of identical in-flight requests (singleflight)."""
+
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import torch
+
+from guessme.metrics import SINGLEFLIGHT
+from guessme.model.preprocess import scale_points
+
+_LEADERS = SINGLEFLIGHT.labels("leader")
+_SHARED = SINGLEFLIGHT.labels("shared")
+
+
+def points_key(points: torch.Tensor | list[dict]) -> bytes:
+    """Key canvas points by the grid cells they scale to.
+
+    Payloads whose points land in the same 28x28 cells rasterize
+    identically, so they can share one prediction.
+
+    Args:
+        points: (N, 2) float32 tensor of canvas (x, y), or list of dicts
+
+    Returns:
+        16-byte key
+    """
+    cells = scale_points(points).numpy().tobytes()
+    return hashlib.blake2b(b"points" + cells, digest_size=16).digest()
+
+
+def bitmap_key(bitmap: torch.Tensor) -> bytes:
+    """Key a (28, 28) bitmap by its pixels rounded to uint8."""
+    pixels = (bitmap.clamp(0.0, 1.0) * 255).round().to(torch.uint8)
+    return hashlib.blake2b(
+        b"bitmap" + pixels.numpy().tobytes(), digest_size=16
+    ).digest()
+
+
+class SingleFlight:
+    """Share one computation between concurrent calls with the same key.
+
+    The first caller for a key starts the computation as its own task;
+    callers arriving before it finishes await the same task. The task is
+    shielded, so a caller that is cancelled (e.g. a client that went
+    away) does not cancel it for the others. Keys are forgotten as soon as
+    the computation finishes; this coalesces, it does not cache.
+    """
+
+    def __init__(self) -> None:
+        """Start with nothing in flight."""
+        self._inflight: dict[bytes, asyncio.Task] = {}
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key: bytes, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the computation
+            fn: Coroutine function producing the result
+
+        Returns:
+            The shared result
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self.leaders += 1
+            _LEADERS.inc()
+        else:
+            self.shared += 1
+            _SHARED.inc()
+        return await asyncio.shield(task)
@@ -1,12 +1,37 @@
 """Integration tests for the API endpoints."""
 
+import json
+import time
+
 import pytest
+import torch
 from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
 
 from guessme.api.app import create_app
+from guessme.api.codec import (
+    BITMAP,
+    POINTS_DELTA16,
+    PREDICTION_BINARY,
+    decode_prediction,
+    encode_bitmap,
+    encode_points,
+)
+from guessme.config import Settings
+from guessme.model.preprocess import rasterize, scale_points
 from guessme.predictor.deployment import Predictor
 
 
+def wait_ready(client, timeout=30.0):
+    """Poll /ready until it succeeds, returning the final response."""
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get("/ready")
+        if response.status_code == 200 or time.monotonic() > deadline:
+            return response
+        time.sleep(0.05)
+
+
 @pytest.fixture
 def client():
     """Create test client with real predictor."""
@@ -49,3 +74,406 @@ def test_predict_endpoint_invalid_request(client):
     """Predict endpoint should reject invalid request."""
     response = client.post("/predict", json={"invalid": "data"})
     assert response.status_code == 422  # Validation error
+
+
+def test_predict_endpoint_invalid_point(client):
+    """Predict endpoint should reject points without numeric x and y."""
+    response = client.post("/predict", json={"points": [{"x": 1}]})
+    assert response.status_code == 422
+
+
+def test_predict_binary_points(client):
+    """Delta-encoded int16 points predict the same as JSON."""
+    points = [{"x": 100, "y": 50}, {"x": 103, "y": 200}, {"x": 300, "y": 350}]
+    expected = client.post("/predict", json={"points": points}).json()
+
+    body = encode_points(torch.tensor([[p["x"], p["y"]] for p in points]))
+    response = client.post(
+        "/predict", content=body, headers={"content-type": POINTS_DELTA16}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == PREDICTION_BINARY
+    assert decode_prediction(response.content) == expected
+
+
+def test_predict_response_negotiation(client):
+    """The Accept header selects the response encoding."""
+    body = encode_points(torch.tensor([[100.0, 100.0], [300.0, 300.0]]))
+
+    response = client.post(
+        "/predict",
+        content=body,
+        headers={"content-type": POINTS_DELTA16, "accept": "application/json"},
+    )
+    assert response.json().keys() == {"digit", "confidence"}
+
+    response = client.post(
+        "/predict",
+        json={"points": [{"x": 100, "y": 100}]},
+        headers={"accept": PREDICTION_BINARY},
+    )
+    assert len(response.content) == 2
+
+
+def test_predict_binary_errors(client):
+    """Malformed binary bodies and unknown types are rejected."""
+    response = client.post(
+        "/predict", content=b"\x01\x02\x03", headers={"content-type": POINTS_DELTA16}
+    )
+    assert response.status_code == 400
+
+    response = client.post(
+        "/predict", content=b"x", headers={"content-type": "text/plain"}
+    )
+    assert response.status_code == 415
+
+
+@pytest.mark.parametrize("packed", [True, False])
+def test_predict_bitmap_matches_points(client, packed):
+    """A client-rasterized bitmap predicts the same as the stroke's points."""
+    points = [{"x": 80, "y": 60}, {"x": 320, "y": 60}, {"x": 150, "y": 380}]
+    expected = client.post("/predict", json={"points": points}).json()
+
+    body = encode_bitmap(rasterize(scale_points(points)), packed=packed)
+    response = client.post(
+        "/predict",
+        content=body,
+        headers={"content-type": BITMAP, "accept": "application/json"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == expected
+
+
+def test_predict_bitmap_bad_length(client):
+    """Bitmaps of the wrong size are rejected."""
+    response = client.post(
+        "/predict", content=b"\x00" * 10, headers={"content-type": BITMAP}
+    )
+    assert response.status_code == 400
+
+
+def test_predict_reports_removed_points(client):
+    """Redundant points are dropped and counted in X-Points-Removed."""
+    points = [{"x": 10.0 * i, "y": 200} for i in range(41)]
+    response = client.post("/predict", json={"points": points})
+
+    assert response.status_code == 200
+    assert response.headers["x-points-removed"] == "39"
+
+
+def test_predict_point_and_body_limits():
+    """Drawings over the point or byte limit are rejected with 413."""
+    client = TestClient(create_app(Predictor(), Settings(max_points=10)))
+    points = [{"x": i, "y": i} for i in range(11)]
+    assert client.post("/predict", json={"points": points}).status_code == 413
+
+    client = TestClient(create_app(Predictor(), Settings(max_body_bytes=100)))
+    points = [{"x": i, "y": i} for i in range(10)]
+    assert client.post("/predict", json={"points": points}).status_code == 413
+
+
+def test_predict_shed_when_queue_full():
+    """A full inference queue answers 503 with Retry-After; /health still works."""
+    client = TestClient(create_app(Predictor(), Settings(max_queue_depth=0)))
+
+    response = client.post("/predict", json={"points": [{"x": 1, "y": 1}]})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert client.post("/predict/batch", content=b"").status_code == 503
+    assert client.get("/health").status_code == 200
+
+    metrics = client.get("/metrics").text
+    assert 'guessme_requests_total{path="/predict",status="503"}' in metrics
+    assert 'guessme_requests_shed_total{reason="queue_depth"}' in metrics
+
+
+def test_predict_rate_limited_per_client():
+    """Each X-Client-Id gets its own burst before 429."""
+    settings = Settings(client_rate=0.001, client_burst=2)
+    client = TestClient(create_app(Predictor(), settings))
+    body = {"points": [{"x": 1, "y": 1}]}
+
+    def post(client_id):
+        return client.post("/predict", json=body, headers={"X-Client-Id": client_id})
+
+    assert [post("a").status_code for _ in range(3)] == [200, 200, 429]
+    assert int(post("a").headers["retry-after"]) > 0
+    assert post("b").status_code == 200
+
+
+def test_openapi_schema_documents_points(client):
+    """OpenAPI schema should describe points as a list of x/y objects."""
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    content = response.json()["paths"]["/predict"]["post"]["requestBody"]["content"]
+    schema = content["application/json"]["schema"]
+    assert schema["properties"]["points"]["type"] == "array"
+    assert POINTS_DELTA16 in content
+
+
+def test_ready_after_warmup():
+    """Ready endpoint should succeed once warmup finishes and report timings."""
+    with TestClient(create_app(Predictor())) as client:
+        response = wait_ready(client)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert data["warmup_ms"] >= 0
+    assert data["first_request_ms"] >= 0
+
+
+def test_ready_not_ready_before_startup():
+    """Ready endpoint should fail until the lifespan has warmed the model."""
+    client = TestClient(create_app(Predictor()))  # lifespan not started
+    assert client.get("/ready").status_code == 503
+    assert client.get("/health").status_code == 200
+
+
+def test_model_loaded_in_lifespan():
+    """Without a predictor, the app loads one in the background."""
+    with TestClient(create_app()) as client:
+        assert client.get("/health").status_code == 200
+        assert wait_ready(client).status_code == 200
+
+        response = client.post("/predict", json={"points": [{"x": 1, "y": 1}]})
+        assert response.status_code == 200
+
+
+def test_ready_reports_startup_failure(capsys):
+    """A failed model load is printed and shown by /ready, not left pending."""
+    with TestClient(create_app(settings=Settings(precision="fp8"))) as client:
+        deadline = time.monotonic() + 30
+        while client.app.state.startup_error is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert "ValueError" in response.json()["detail"]
+    assert "model startup failed" in capsys.readouterr().out
+
+
+def test_predictor_loaded_during_shutdown_is_closed(monkeypatch):
+    """Shutdown waits for a load still in progress and closes its predictor."""
+    loaded = []
+    real_from_settings = Predictor.from_settings
+
+    def slow_from_settings(settings):
+        time.sleep(0.5)
+        loaded.append(real_from_settings(settings))
+        return loaded[0]
+
+    monkeypatch.setattr(Predictor, "from_settings", slow_from_settings)
+    with TestClient(create_app()):
+        pass  # shut down before the load finishes
+
+    assert len(loaded) == 1
+    assert loaded[0].executor._shutdown
+
+
+def test_predict_before_model_loaded():
+    """Predict should return 503 while no model is loaded."""
+    client = TestClient(create_app())  # lifespan not started
+    response = client.post("/predict", json={"points": []})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_metrics_endpoint(client):
+    """Metrics endpoint should expose per-stage latency after a prediction."""
+    client.post("/predict", json={"points": [{"x": 14, "y": 14}, {"x": 15, "y": 15}]})
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    for stage in (
+        "parse",
+        "rasterize",
+        "preprocess",
+        "normalize",
+        "forward",
+        "serialize",
+    ):
+        assert f'guessme_stage_latency_seconds_count{{stage="{stage}"}}' in text
+    assert 'guessme_requests_total{path="/predict",status="200"}' in text
+    assert "guessme_batch_size_bucket" in text
+
+
+def test_metrics_label_unknown_paths_other(client):
+    """Known routes keep their path label; anything else is "other"."""
+    client.get("/health")
+    client.get("/no-such-page")
+    text = client.get("/metrics").text
+
+    assert 'path="/health",status="200"' in text
+    assert 'path="other",status="404"' in text
+    assert "no-such-page" not in text
+
+
+def test_websocket_live_predictions_and_final(client):
+    """Strokes get live predictions and submit gets the final answer."""
+    with client.websocket_connect("/ws") as ws:
+        stroke = [{"x": 200, "y": 50}, {"x": 200, "y": 350}]
+        ws.send_json({"clientId": "c1", "type": "stroke", "data": {"points": stroke}})
+        message = ws.receive_json()
+
+        assert message["clientId"] == "c1"
+        assert message["type"] == "predictions"
+        assert len(message["data"]) == 3
+        assert all(0 <= p["confidence"] <= 100 for p in message["data"])
+
+        ws.send_json({"clientId": "c1", "type": "submit"})
+        final = ws.receive_json()
+
+    assert final["type"] == "final"
+    assert final["data"]["label"] == message["data"][0]["label"]
+
+
+def test_websocket_final_matches_rest(client):
+    """The final prediction over strokes equals /predict on all points."""
+    strokes = [
+        [{"x": 100, "y": 100}, {"x": 300, "y": 100}],
+        [{"x": 300, "y": 120}, {"x": 150, "y": 350}],
+    ]
+    expected = client.post(
+        "/predict", json={"points": [p for s in strokes for p in s]}
+    ).json()
+
+    with client.websocket_connect("/ws") as ws:
+        for stroke in strokes:
+            ws.send_json(
+                {"clientId": "c1", "type": "stroke", "data": {"points": stroke}}
+            )
+        ws.send_json({"clientId": "c1", "type": "submit"})
+        while (message := ws.receive_json())["type"] != "final":
+            pass
+
+    assert message["data"] == {
+        "label": str(expected["digit"]),
+        "confidence": expected["confidence"],
+    }
+
+
+def test_websocket_invalid_message_closes(client):
+    """Messages that do not follow the protocol close the connection."""
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"clientId": "c1", "type": "unknown"})
+        with pytest.raises(WebSocketDisconnect) as exc:
+            ws.receive_json()
+
+    assert exc.value.code == 1003
+
+
+def test_websocket_stroke_limits():
+    """Oversized messages and strokes close the socket like REST's 413."""
+    settings = Settings(max_points=3, max_body_bytes=200)
+    client = TestClient(create_app(Predictor(), settings))
+    stroke = [{"x": i, "y": i} for i in range(4)]
+
+    for data in ({"points": stroke}, {"points": [{"x": 1, "y": 1}] * 20}):
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"clientId": "c1", "type": "stroke", "data": data})
+            with pytest.raises(WebSocketDisconnect) as exc:
+                ws.receive_json()
+        assert exc.value.code == 1009
+
+
+def removed_points(client) -> float:
+    """Current value of the ingest points-removed counter."""
+    name = "guessme_ingest_points_removed_total "
+    lines = client.get("/metrics").text.splitlines()
+    return next(
+        (float(line[len(name) :]) for line in lines if line.startswith(name)), 0
+    )
+
+
+def test_websocket_strokes_simplified():
+    """Stroke points that cannot change the raster are dropped."""
+    client = TestClient(create_app(Predictor()))
+    before = removed_points(client)
+    with client.websocket_connect("/ws") as ws:
+        stroke = [{"x": 200, "y": y} for y in range(50, 350, 10)]
+        ws.send_json({"clientId": "c1", "type": "stroke", "data": {"points": stroke}})
+        assert ws.receive_json()["type"] == "predictions"
+
+    # A straight vertical line keeps only its two end points
+    assert removed_points(client) - before == len(stroke) - 2
+
+
+def test_websocket_session_limit():
+    """One connection cannot open unbounded sessions with new client IDs."""
+    client = TestClient(create_app(Predictor(), Settings(max_live_sessions=2)))
+    with client.websocket_connect("/ws") as ws:
+        for client_id in ("a", "b", "c"):
+            ws.send_json({"clientId": client_id, "type": "clear"})
+        with pytest.raises(WebSocketDisconnect) as exc:
+            ws.receive_json()
+
+    assert exc.value.code == 1008
+
+
+def test_predict_batch_streams_ndjson():
+    """Bulk predictions match /predict and keep input order."""
+    app = create_app(Predictor(), Settings(batch_chunk_size=3))
+    client = TestClient(app)
+    drawings = [
+        [{"x": 100 + 20 * i, "y": 50}, {"x": 200, "y": 350 - 10 * i}] for i in range(8)
+    ]
+    body = "".join(json.dumps({"points": d}) + "\n" for d in drawings)
+
+    response = client.post(
+        "/predict/batch",
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["index"] for r in results] == list(range(8))
+    assert app.state.admission.items == 0  # every queued drawing was released
+    for result, drawing in zip(results, drawings, strict=True):
+        expected = client.post("/predict", json={"points": drawing}).json()
+        assert {k: result[k] for k in expected} == expected
+
+
+def test_predict_batch_reports_bad_lines():
+    """Invalid or oversized lines get an error without failing the stream."""
+    app = create_app(Predictor(), Settings(max_line_bytes=100, max_points=3))
+    client = TestClient(app)
+    body = "\n".join(
+        [
+            json.dumps({"points": [{"x": 1, "y": 1}]}),
+            "",
+            "not json",
+            json.dumps({"points": [{"x": 1, "y": 1}] * 20}),
+            json.dumps({"points": []}),
+            json.dumps({"points": [{"x": 1, "y": 1}] * 4}),
+        ]
+    )
+
+    response = client.post("/predict/batch", content=body)
+    results = [json.loads(line) for line in response.text.splitlines()]
+
+    # Indexes are input line numbers; the blank line 1 gets no output
+    assert [r["index"] for r in results] == [0, 2, 3, 4, 5]
+    assert "digit" in results[0]
+    assert "error" in results[1]
+    assert results[2]["error"] == "line exceeds 100 bytes"
+    assert "digit" in results[3]
+    assert results[4]["error"] == "Drawing has 4 points, limit is 3"
+
+
+def test_predict_batch_chunked_upload(client):
+    """A streamed upload is read incrementally."""
+
+    def body():
+        for i in range(50):
+            yield (json.dumps({"points": [{"x": i * 8, "y": 200}]}) + "\n").encode()
+
+    response = client.post("/predict/batch", content=body())
+    assert len(response.text.splitlines()) == 50
@@ -0,0 +1,37 @@
+"""Integration tests for the load test's local server."""
+
+import os
+from pathlib import Path
+
+import httpx
+
+from guessme.bench.loadtest import encode_request, local_server, synthetic_corpus
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+
+def cache_hits(url: str) -> float:
+    """Value of the result cache hit counter on a running server."""
+    name = 'guessme_cache_lookups_total{result="hit"} '
+    lines = httpx.get(f"{url}/metrics").text.splitlines()
+    return next(
+        (float(line[len(name) :]) for line in lines if line.startswith(name)), 0
+    )
+
+
+def test_local_server_reads_settings_from_env(monkeypatch):
+    """GUESSME_* variables reach the booted server: a disabled cache never hits."""
+    monkeypatch.setenv("GUESSME_CACHE_SIZE", "0")
+    monkeypatch.setenv(
+        "PYTHONPATH",
+        os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")])),
+    )
+    body, content_type = encode_request(synthetic_corpus(1)[0], "json")
+
+    with local_server() as (url, _):
+        for _ in range(3):
+            response = httpx.post(
+                f"{url}/predict", content=body, headers={"content-type": content_type}
+            )
+            assert response.status_code == 200
+        assert cache_hits(url) == 0
@@ -0,0 +1,86 @@
+"""Unit tests for admission control."""
+
+import pytest
+
+from guessme.api.admission import AdmissionController, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_waits(monkeypatch):
+    """A full bucket admits burst requests, then reports the refill wait."""
+    now = [100.0]
+    monkeypatch.setattr("guessme.api.admission.time.monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=2.0, burst=3)
+
+    assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.take() == pytest.approx(0.5)
+
+    now[0] += 0.5
+    assert bucket.take() == 0.0
+
+
+def test_admit_until_queue_full():
+    """Requests beyond max_depth get 503 until one is released."""
+    admission = AdmissionController(max_depth=2)
+
+    assert admission.admit("a") is None
+    assert admission.admit("b") is None
+    status, retry_after, _ = admission.admit("c")
+    assert (status, retry_after) == (503, 1.0)
+
+    admission.release()
+    assert admission.admit("c") is None
+    assert admission.depth == 2
+
+
+def test_shed_on_estimated_wait():
+    """Queue depth times service time above max_wait_ms is shed."""
+    admission = AdmissionController(max_wait_ms=50.0, service_ms=lambda: 20.0)
+
+    assert admission.admit(None) is None
+    assert admission.admit(None) is None
+    assert admission.admit(None) is None  # estimated wait 40ms
+    status, retry_after, _ = admission.admit(None)  # estimated wait 60ms
+    assert status == 503
+    assert retry_after == pytest.approx(0.06)
+
+
+def test_batch_items_weigh_on_estimated_wait():
+    """Drawings queued by a batch request count toward the wait, not just 1."""
+    admission = AdmissionController(max_wait_ms=50.0, service_ms=lambda: 20.0)
+
+    assert admission.admit(None) is None  # one batch request
+    admission.add_items(100)
+    status, retry_after, _ = admission.admit(None)
+    assert status == 503
+    assert retry_after == pytest.approx(101 * 0.02)
+
+    admission.remove_items(100)
+    assert admission.admit(None) is None
+
+
+def test_client_rate_limit_is_per_client():
+    """One client exhausting its burst does not affect others."""
+    admission = AdmissionController(client_rate=1.0, client_burst=2)
+
+    assert admission.admit("a") is None
+    assert admission.admit("a") is None
+    assert admission.admit("a")[0] == 429
+    assert admission.admit("b") is None
+
+
+def test_rate_limit_disabled_by_default():
+    """client_rate=0 never rate limits."""
+    admission = AdmissionController(client_burst=1)
+
+    assert all(admission.admit("a") is None for _ in range(10))
+
+
+def test_client_buckets_are_bounded():
+    """Least recently seen clients are forgotten beyond max_clients."""
+    admission = AdmissionController(client_rate=1.0, client_burst=1, max_clients=2)
+
+    for client_id in ("a", "b", "c"):
+        assert admission.admit(client_id) is None
+
+    assert list(admission._buckets) == ["b", "c"]
+    assert admission.admit("a") is None  # fresh bucket
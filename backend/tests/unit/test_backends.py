@@ -0,0 +1,88 @@
+"""Unit tests for inference backends."""
+
+import pytest
+import torch
+
+from guessme.model.cnn import MNISTNet
+from guessme.model.quantize import quantize_model
+from guessme.predictor.backends import (
+    build_backend,
+    model_fingerprint,
+)
+from guessme.predictor.deployment import Predictor
+
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    return MNISTNet().eval()
+
+
+@pytest.mark.parametrize("backend", ["script", "compile"])
+def test_backend_logits_match_eager(model, backend, tmp_path):
+    """Frozen and compiled backends match eager logits within tolerance."""
+    forward = build_backend(model, backend, tmp_path)
+
+    for batch_size in (1, 5):
+        x = torch.randn(batch_size, 1, 28, 28)
+        with torch.no_grad():
+            assert torch.allclose(forward(x), model(x), atol=1e-5)
+
+
+def test_script_backend_cached_on_disk(model, tmp_path):
+    """The frozen model is saved once and loaded on later builds."""
+    build_backend(model, "script", tmp_path)
+    cached = list(tmp_path.glob("*.ts"))
+    assert len(cached) == 1
+
+    mtime = cached[0].stat().st_mtime_ns
+    forward = build_backend(model, "script", tmp_path)
+    assert cached[0].stat().st_mtime_ns == mtime
+    assert isinstance(forward, torch.jit.ScriptModule)
+
+
+def test_script_backend_kept_when_cache_unwritable(model, tmp_path, capsys):
+    """A cache dir that cannot be written warns but keeps the built graph."""
+    blocker = tmp_path / "weights"
+    blocker.write_text("")  # a file where the cache dir should be
+
+    forward = build_backend(model, "script", blocker / "cache")
+
+    assert isinstance(forward, torch.jit.ScriptModule)
+    assert "could not cache" in capsys.readouterr().out
+
+
+def test_eager_backend_is_model(model, tmp_path):
+    """Eager backend returns the model unchanged."""
+    assert build_backend(model, "eager", tmp_path) is model
+
+
+def test_unknown_backend_rejected(model, tmp_path):
+    """Unknown backend names raise."""
+    with pytest.raises(ValueError, match="backend"):
+        build_backend(model, "tensorrt", tmp_path)
+
+
+def test_fingerprint_tracks_weights(model):
+    """Fingerprint changes when weights change."""
+    before = model_fingerprint(model)
+    with torch.no_grad():
+        model.fc2.bias.add_(1.0)
+    assert model_fingerprint(model) != before
+
+
+def test_fingerprint_quantized_model(model):
+    """Quantized models (packed params) can be fingerprinted."""
+    assert model_fingerprint(quantize_model(model)) != model_fingerprint(model)
+
+
+def test_predictor_script_backend(tmp_path):
+    """Predictor with the script backend matches the eager predictor."""
+    points = [{"x": 100, "y": 50}, {"x": 100, "y": 350}]
+    eager = Predictor(weights_path=tmp_path / "mnist_cnn.pt")
+    torch.save(eager.model.state_dict(), tmp_path / "mnist_cnn.pt")
+
+    scripted = Predictor(weights_path=tmp_path / "mnist_cnn.pt", backend="script")
+
+    assert scripted.predict(points) == eager.predict(points)
+    assert list((tmp_path / "compiled").glob("*.ts"))
@@ -0,0 +1,137 @@
+"""Unit tests for MicroBatcher."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from guessme.predictor.batching import BatchStats, MicroBatcher
+
+
+class RecordingFn:
+    """Batch function that doubles items and records batch sizes."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        return [item * 2 for item in items]
+
+
+async def test_concurrent_submits_share_one_batch():
+    """Requests arriving together run in one batched call."""
+    fn = RecordingFn()
+    batcher = MicroBatcher(fn, max_batch_size=8, max_wait_ms=50)
+
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert results == [0, 2, 4, 6, 8]
+    assert fn.batches == [[0, 1, 2, 3, 4]]
+
+
+async def test_max_batch_size_splits_batches():
+    """No batch exceeds max_batch_size."""
+    fn = RecordingFn()
+    batcher = MicroBatcher(fn, max_batch_size=3, max_wait_ms=50)
+
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(7)))
+
+    assert results == [i * 2 for i in range(7)]
+    assert [len(b) for b in fn.batches] == [3, 3, 1]
+
+
+async def test_single_request_flushed_after_max_wait():
+    """A lone request is not held longer than needed."""
+    fn = RecordingFn()
+    batcher = MicroBatcher(fn, max_batch_size=32, max_wait_ms=1)
+
+    assert await asyncio.wait_for(batcher.submit(21), timeout=1) == 42
+
+
+async def test_errors_propagate_to_every_caller():
+    """A failing batch raises in each waiting caller."""
+
+    def fail(items):
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(fail, max_batch_size=4, max_wait_ms=10)
+    results = await asyncio.gather(
+        batcher.submit(1), batcher.submit(2), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    # The collector keeps running after a failed batch
+    batcher.fn = RecordingFn()
+    assert await batcher.submit(3) == 6
+
+
+async def test_stats_track_batch_size_and_wait():
+    """Stats record batch sizes and queue wait."""
+    batcher = MicroBatcher(RecordingFn(), max_batch_size=2, max_wait_ms=20)
+
+    await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+    stats = batcher.stats.snapshot()
+
+    assert stats["batches"] == 2
+    assert stats["items"] == 3
+    assert stats["batch_sizes"] == {1: 1, 2: 1}
+    assert stats["mean_batch_size"] == pytest.approx(1.5)
+    assert stats["max_wait_ms"] >= stats["mean_wait_ms"] >= 0
+
+
+def test_stats_run_time_moving_average():
+    """Per-item run time starts at the first batch and then moves gradually."""
+    stats = BatchStats()
+
+    stats.record_run(4, 40.0)
+    assert stats.run_ms_per_item == pytest.approx(10.0)
+
+    stats.record_run(1, 20.0, alpha=0.5)
+    assert stats.run_ms_per_item == pytest.approx(15.0)
+
+
+async def test_max_concurrency_runs_batches_in_parallel():
+    """Up to max_concurrency batches run at the same time."""
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow(items):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return items
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    batcher = MicroBatcher(
+        slow, max_batch_size=1, max_wait_ms=0, executor=executor, max_concurrency=2
+    )
+    await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+    executor.shutdown()
+
+    assert peak == 2
+
+
+async def test_event_loop_stays_responsive():
+    """Other coroutines make progress while a batch is running."""
+
+    def slow(items):
+        time.sleep(0.2)
+        return items
+
+    batcher = MicroBatcher(slow, max_batch_size=1, max_wait_ms=0)
+    pending = asyncio.create_task(batcher.submit(1))
+
+    start = time.perf_counter()
+    await asyncio.sleep(0.01)
+    assert time.perf_counter() - start < 0.1
+    assert not pending.done()
+    assert await pending == 1
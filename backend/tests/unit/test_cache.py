@@ -0,0 +1,82 @@
+"""Unit tests for the prediction result cache."""
+
+import torch
+
+from guessme.model.preprocess import MNIST_MEAN, MNIST_STD
+from guessme.predictor.cache import ResultCache, input_keys
+
+
+def test_hit_returns_copy():
+    """Cached results are returned as copies and counted as hits."""
+    cache = ResultCache()
+    cache.invalidate("v1")
+    cache.put(b"k", {"digit": 1, "confidence": 90}, "v1")
+
+    result = cache.get(b"k")
+    result["digit"] = 7
+
+    assert cache.get(b"k") == {"digit": 1, "confidence": 90}
+    assert cache.get(b"other") is None
+    assert cache.stats.snapshot()["hits"] == 2
+    assert cache.stats.snapshot()["misses"] == 1
+
+
+def test_lru_eviction():
+    """The least recently used entry is evicted when full."""
+    cache = ResultCache(max_entries=2)
+    cache.invalidate("v1")
+    cache.put(b"a", {"digit": 0}, "v1")
+    cache.put(b"b", {"digit": 1}, "v1")
+    cache.get(b"a")  # b is now least recently used
+    cache.put(b"c", {"digit": 2}, "v1")
+
+    assert len(cache) == 2
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") is not None
+    assert cache.stats.evictions == 1
+
+
+def test_ttl_expiry():
+    """Entries older than ttl_s are misses."""
+    cache = ResultCache(ttl_s=0.0)
+    cache.invalidate("v1")
+    cache.put(b"a", {"digit": 0}, "v1")
+
+    assert cache.get(b"a") is None
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_invalidate_drops_entries_and_stale_puts():
+    """A new version clears the cache and rejects older results."""
+    cache = ResultCache()
+    cache.invalidate("v1")
+    cache.put(b"a", {"digit": 0}, "v1")
+    cache.invalidate("v2")
+
+    assert cache.get(b"a") is None
+    cache.put(b"a", {"digit": 0}, "v1")  # batch that started before the swap
+    assert len(cache) == 0
+
+
+def test_disabled_cache_stores_nothing():
+    """max_entries=0 disables caching."""
+    cache = ResultCache(max_entries=0)
+    cache.invalidate("v1")
+    cache.put(b"a", {"digit": 0}, "v1")
+    assert len(cache) == 0
+
+
+def test_input_keys_quantize_noise():
+    """Inputs differing by less than a uint8 step share a key."""
+    pixels = torch.zeros(2, 1, 28, 28)
+    pixels[:, :, 10:18, 14] = 0.5
+    pixels[1] += 1e-4
+    keys = input_keys((pixels - MNIST_MEAN) / MNIST_STD)
+
+    assert keys[0] == keys[1]
+    assert len(keys[0]) == 16
+
+    pixels[1, 0, 0, 0] = 1.0
+    keys = input_keys((pixels - MNIST_MEAN) / MNIST_STD)
+    assert keys[0] != keys[1]
@@ -0,0 +1,108 @@
+"""Unit tests for asynchronous training checkpoints."""
+
+import random
+import threading
+
+import pytest
+import torch
+import torch.nn as nn
+
+from guessme.model.checkpoint import (
+    AsyncCheckpointer,
+    load_checkpoint,
+    rng_state,
+    set_rng_state,
+)
+from guessme.model.cnn import MNISTNet
+from guessme.model.data import TensorLoader, TensorMNIST
+
+
+def make_loader() -> TensorLoader:
+    generator = torch.Generator().manual_seed(0)
+    images = torch.randint(0, 256, (32, 28, 28), dtype=torch.uint8, generator=generator)
+    dataset = TensorMNIST(images, torch.randint(0, 10, (32,), generator=generator))
+    return TensorLoader(dataset, batch_size=8, shuffle=True, generator=generator)
+
+
+def train(model, optimizer, loader, epochs: range) -> None:
+    for _ in epochs:
+        for images, labels in loader:
+            optimizer.zero_grad()
+            nn.CrossEntropyLoss()(model(images), labels).backward()
+            optimizer.step()
+
+
+def test_save_writes_a_copy_taken_at_save_time(tmp_path):
+    """Changing tensors after save() does not change what is written."""
+    path = tmp_path / "state.pt"
+    weights = torch.zeros(3)
+
+    with AsyncCheckpointer() as checkpointer:
+        checkpointer.save({"w": weights, "epoch": 1}, path)
+        weights += 1
+
+    assert torch.equal(load_checkpoint(path)["w"], torch.zeros(3))
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_failed_write_keeps_previous_checkpoint(tmp_path):
+    """A write that fails leaves the last good file and raises on close."""
+    path = tmp_path / "state.pt"
+    checkpointer = AsyncCheckpointer()
+    checkpointer.save({"epoch": 1}, path)
+    checkpointer.wait()
+
+    checkpointer.save({"epoch": 2, "lock": threading.Lock()}, path)
+    with pytest.raises(TypeError, match="pickle"):
+        checkpointer.close()
+
+    assert load_checkpoint(path)["epoch"] == 1
+
+
+def test_rng_state_round_trip():
+    """Restoring RNG state replays the same random draws."""
+    generator = torch.Generator().manual_seed(1)
+    state = rng_state(generator)
+    expected = (torch.rand(3), random.random(), torch.randperm(5, generator=generator))
+
+    set_rng_state(state, generator)
+
+    assert torch.equal(torch.rand(3), expected[0])
+    assert random.random() == expected[1]
+    assert torch.equal(torch.randperm(5, generator=generator), expected[2])
+
+
+def test_resume_matches_uninterrupted_training(tmp_path):
+    """Two epochs straight equal one epoch, checkpoint, resume, one epoch."""
+    path = tmp_path / "checkpoint.pt"
+
+    torch.manual_seed(0)
+    model, loader = MNISTNet(), make_loader()
+    optimizer = torch.optim.Adam(model.parameters())
+    train(model, optimizer, loader, range(2))
+
+    torch.manual_seed(0)
+    first, loader = MNISTNet(), make_loader()
+    first_optimizer = torch.optim.Adam(first.parameters())
+    train(first, first_optimizer, loader, range(1))
+    with AsyncCheckpointer() as checkpointer:
+        checkpointer.save(
+            {
+                "model": first.state_dict(),
+                "optimizer": first_optimizer.state_dict(),
+                "epoch": 1,
+                "rng": rng_state(loader.generator),
+            },
+            path,
+        )
+
+    state = load_checkpoint(path)
+    resumed, loader = MNISTNet(), make_loader()
+    resumed_optimizer = torch.optim.Adam(resumed.parameters())
+    resumed.load_state_dict(state["model"])
+    resumed_optimizer.load_state_dict(state["optimizer"])
+    set_rng_state(state["rng"], loader.generator)
+    train(resumed, resumed_optimizer, loader, range(state["epoch"], 2))
+
+    for name, value in model.state_dict().items():
+        assert torch.equal(resumed.state_dict()[name], value), name
@@ -0,0 +1,97 @@
+"""Unit tests for binary request and response encodings."""
+
+import pytest
+import torch
+
+from guessme.api.codec import (
+    decode_bitmap,
+    decode_points,
+    decode_prediction,
+    encode_bitmap,
+    encode_points,
+    encode_prediction,
+)
+
+
+def test_points_round_trip():
+    """Whole-pixel points survive encoding unchanged."""
+    points = torch.tensor([[10.0, 20.0], [12.0, 19.0], [400.0, 0.0], [0.0, 400.0]])
+    body = encode_points(points)
+
+    assert len(body) == 16
+    assert torch.equal(decode_points(body), points)
+
+
+def test_points_are_delta_encoded():
+    """Pairs after the first are deltas from the previous point."""
+    body = encode_points(torch.tensor([[100.0, 200.0], [101.0, 198.0]]))
+    assert torch.frombuffer(bytearray(body), dtype=torch.int16).tolist() == [
+        100,
+        200,
+        1,
+        -2,
+    ]
+
+
+def test_points_rounded_to_pixels():
+    """Sub-pixel coordinates are rounded."""
+    body = encode_points(torch.tensor([[10.4, 20.6]]))
+    assert decode_points(body).tolist() == [[10.0, 21.0]]
+
+
+def test_empty_points():
+    """No points encode to an empty body."""
+    assert encode_points(torch.zeros(0, 2)) == b""
+    assert decode_points(b"").shape == (0, 2)
+
+
+def test_decode_rejects_partial_pairs():
+    """Bodies must hold whole (x, y) pairs."""
+    with pytest.raises(ValueError):
+        decode_points(b"\x00\x01\x02")
+
+
+def test_encode_rejects_overflow():
+    """Coordinates beyond int16 cannot be encoded."""
+    with pytest.raises(ValueError):
+        encode_points(torch.tensor([[0.0, 0.0], [40000.0, 0.0]]))
+
+
+def test_prediction_round_trip():
+    """Predictions encode to two bytes."""
+    result = {"digit": 7, "confidence": 93}
+    assert encode_prediction(result) == b"\x07\x5d"
+    assert decode_prediction(encode_prediction(result)) == result
+
+
+def random_bitmap(seed):
+    generator = torch.Generator().manual_seed(seed)
+    return (torch.rand(28, 28, generator=generator) > 0.8).float()
+
+
+def test_bitmap_packed_round_trip():
+    """Packed bitmaps use one bit per pixel, MSB first."""
+    image = random_bitmap(0)
+    body = encode_bitmap(image)
+
+    assert len(body) == 98
+    assert torch.equal(decode_bitmap(body), image)
+
+    first = torch.zeros(28, 28)
+    first[0, 0] = 1.0
+    assert encode_bitmap(first)[0] == 0x80
+
+
+def test_bitmap_uint8_round_trip():
+    """Unpacked bitmaps use one 0-255 byte per pixel."""
+    image = random_bitmap(1)
+    body = encode_bitmap(image, packed=False)
+
+    assert len(body) == 784
+    assert torch.equal(decode_bitmap(body), image)
+
+
+def test_bitmap_rejects_bad_length():
+    """Bitmaps must be 98 or 784 bytes."""
+    with pytest.raises(ValueError):
+        decode_bitmap(b"\x00" * 100)
@@ -0,0 +1,41 @@
+"""Unit tests for runtime settings."""
+
+from pathlib import Path
+
+from guessme.config import Settings
+
+
+def test_settings_defaults(monkeypatch):
+    """Unset environment variables fall back to defaults."""
+    for name in (
+        "MAX_BATCH_SIZE",
+        "MAX_WAIT_MS",
+        "INFERENCE_WORKERS",
+        "TORCH_THREADS",
+        "PRECISION",
+    ):
+        monkeypatch.delenv(f"GUESSME_{name}", raising=False)
+
+    assert Settings.from_env() == Settings()
+
+
+def test_settings_from_env(monkeypatch):
+    """Environment variables override defaults."""
+    monkeypatch.setenv("GUESSME_MAX_BATCH_SIZE", "8")
+    monkeypatch.setenv("GUESSME_MAX_WAIT_MS", "0.5")
+    monkeypatch.setenv("GUESSME_INFERENCE_WORKERS", "2")
+    monkeypatch.setenv("GUESSME_TORCH_THREADS", "1")
+    monkeypatch.setenv("GUESSME_PRECISION", "int8")
+    monkeypatch.setenv("GUESSME_BACKEND", "script")
+    monkeypatch.setenv("GUESSME_COMPILE_CACHE_DIR", "/tmp/compiled")
+    monkeypatch.setenv("GUESSME_MAX_LIVE_SESSIONS", "2")
+
+    settings = Settings.from_env()
+    assert settings.max_batch_size == 8
+    assert settings.max_wait_ms == 0.5
+    assert settings.inference_workers == 2
+    assert settings.torch_threads == 1
+    assert settings.precision == "int8"
+    assert settings.backend == "script"
+    assert settings.compile_cache_dir == Path("/tmp/compiled")
+    assert settings.max_live_sessions == 2
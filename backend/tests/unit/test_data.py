@@ -0,0 +1,64 @@
+"""Unit tests for the memory-mapped MNIST dataset."""
+
+import pytest
+import torch
+from torchvision import transforms
+
+from guessme.model.data import TensorLoader, TensorMNIST, _write_raw, normalize
+from guessme.model.preprocess import MNIST_MEAN, MNIST_STD
+
+
+@pytest.fixture
+def dataset() -> TensorMNIST:
+    """Small random dataset of 10 images."""
+    generator = torch.Generator().manual_seed(0)
+    images = torch.randint(0, 256, (10, 28, 28), dtype=torch.uint8, generator=generator)
+    return TensorMNIST(images, torch.arange(10))
+
+
+def test_normalize_matches_torchvision_transforms(dataset):
+    """Per-batch normalize equals per-sample ToTensor + Normalize."""
+    transform = transforms.Compose(
+        [transforms.ToTensor(), transforms.Normalize((MNIST_MEAN,), (MNIST_STD,))]
+    )
+    expected = torch.stack([transform(image.numpy()) for image in dataset.images])
+
+    assert torch.allclose(normalize(dataset.images), expected, atol=1e-6)
+
+
+def test_loader_batches_in_order(dataset):
+    """Unshuffled batches cover the dataset in order, last one partial."""
+    loader = TensorLoader(dataset, batch_size=4)
+    batches = list(loader)
+
+    assert len(loader) == len(batches) == 3
+    assert [len(labels) for _, labels in batches] == [4, 4, 2]
+    assert batches[0][0].shape == (4, 1, 28, 28)
+    assert torch.equal(torch.cat([labels for _, labels in batches]), dataset.labels)
+
+
+def test_loader_shuffles_each_epoch(dataset):
+    """Shuffled epochs visit every sample once, in a new order each time."""
+    loader = TensorLoader(
+        dataset, batch_size=3, shuffle=True, generator=torch.Generator().manual_seed(0)
+    )
+
+    epochs = [torch.cat([labels for _, labels in loader]) for _ in range(2)]
+
+    assert all(sorted(epoch.tolist()) == list(range(10)) for epoch in epochs)
+    assert not torch.equal(epochs[0], epochs[1])
+
+
+def test_load_memory_maps_cached_split(tmp_path, dataset):
+    """A decoded split on disk loads without touching torchvision."""
+    cache_dir = tmp_path / "MNIST" / "tensor"
+    cache_dir.mkdir(parents=True)
+    _write_raw(cache_dir / "test-images.u8", dataset.images)
+    _write_raw(cache_dir / "test-labels.u8", dataset.labels.to(torch.uint8))
+
+    loaded = TensorMNIST.load(train=False, data_dir=tmp_path)
+
+    assert len(loaded) == 10
+    assert torch.equal(loaded.images, dataset.images)
+    assert torch.equal(loaded.labels, dataset.labels)
+    assert not list(cache_dir.glob("*.tmp"))
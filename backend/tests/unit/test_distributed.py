@@ -0,0 +1,105 @@
+"""Unit tests for data-parallel training helpers."""
+
+import torch
+import torch.multiprocessing as mp
+import torch.nn as nn
+from torch.nn.parallel import DistributedDataParallel
+
+from guessme.model.cnn import MNISTNet
+from guessme.model.data import TensorLoader, TensorMNIST
+from guessme.model.distributed import (
+    WorkerInfo,
+    all_reduce_mean,
+    init_worker,
+    shutdown_worker,
+    spawn,
+)
+
+
+def make_dataset(size: int = 10) -> TensorMNIST:
+    generator = torch.Generator().manual_seed(0)
+    images = torch.randint(
+        0, 256, (size, 28, 28), dtype=torch.uint8, generator=generator
+    )
+    return TensorMNIST(images, torch.arange(size))
+
+
+def sgd_step(net: nn.Module, params, images, labels) -> None:
+    optimizer = torch.optim.SGD(params, lr=0.1)
+    nn.CrossEntropyLoss()(net(images), labels).backward()
+    optimizer.step()
+
+
+def single_process_step() -> MNISTNet:
+    """Reference: one step on the full 10-image batch in one process."""
+    torch.manual_seed(0)
+    model = MNISTNet()
+    images, labels = next(iter(TensorLoader(make_dataset(), batch_size=10)))
+    sgd_step(model, model.parameters(), images, labels)
+    return model
+
+
+def ddp_worker(rank: int, world_size: int, results: mp.SimpleQueue) -> None:
+    """One DDP step on this rank's half batch.
+
+    Reports how far the weights are from the single-process step, and a
+    value averaged across workers.
+    """
+    info = init_worker(rank, world_size)
+    try:
+        torch.manual_seed(0)
+        model = MNISTNet()
+        loader = TensorLoader(make_dataset(), batch_size=8, rank=rank, world_size=2)
+        images, labels = next(iter(loader))
+        sgd_step(DistributedDataParallel(model), model.parameters(), images, labels)
+
+        reference = single_process_step().state_dict()
+        max_diff = max(
+            (value - reference[name]).abs().max().item()
+            for name, value in model.state_dict().items()
+        )
+        results.put((info.rank, all_reduce_mean(float(rank)), max_diff))
+    finally:
+        shutdown_worker()
+
+
+def test_shards_are_equal_and_disjoint():
+    """Each rank sees an equal share; leftovers are dropped."""
+    dataset = make_dataset(11)
+    loaders = [
+        TensorLoader(
+            dataset,
+            batch_size=2,
+            shuffle=True,
+            generator=torch.Generator().manual_seed(0),
+            rank=rank,
+            world_size=3,
+        )
+        for rank in range(3)
+    ]
+
+    shards = [torch.cat([labels for _, labels in loader]) for loader in loaders]
+
+    assert [len(loader) for loader in loaders] == [2, 2, 2]
+    assert [len(shard) for shard in shards] == [3, 3, 3]
+    assert len(set(torch.cat(shards).tolist())) == 9
+
+
+def test_single_worker_needs_no_process_group():
+    """A single worker trains without joining a process group."""
+    info = init_worker(0, 1)
+
+    assert info == WorkerInfo()
+    assert info.is_main and not info.distributed
+    assert all_reduce_mean(2.5) == 2.5
+    shutdown_worker()
+
+
+def test_ddp_matches_single_process_step():
+    """Two workers on half batches end with the full-batch weights."""
+    results = mp.get_context("spawn").SimpleQueue()
+    spawn(ddp_worker, 2, results)
+    reports = sorted(results.get() for _ in range(2))
+
+    assert [mean for _, mean, _ in reports] == [0.5, 0.5]
+    assert all(max_diff < 1e-6 for _, _, max_diff in reports)
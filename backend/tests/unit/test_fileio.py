@@ -0,0 +1,44 @@
+"""Tests for atomic file writes."""
+
+import pytest
+
+from guessme.fileio import atomic_write
+
+
+def test_write_replaces_file(tmp_path):
+    """The new content replaces the old and no temp file is left behind."""
+    path = tmp_path / "state.pt"
+    path.write_bytes(b"old")
+
+    atomic_write(path, lambda f: f.write(b"new"))
+
+    assert path.read_bytes() == b"new"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_temp_files_are_unique(tmp_path):
+    """Concurrent writers to one path never share a temp file."""
+    temps = []
+    for _ in range(2):
+        atomic_write(
+            tmp_path / "model.ts", lambda f: temps.extend(tmp_path.glob("*.tmp"))
+        )
+
+    assert temps[0] != temps[1]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    """A write that raises leaves the old file intact and cleans up."""
+    path = tmp_path / "state.pt"
+    path.write_bytes(b"old")
+
+    def fail(f):
+        f.write(b"partial")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        atomic_write(path, fail)
+
+    assert path.read_bytes() == b"old"
+    assert not list(tmp_path.glob("*.tmp"))
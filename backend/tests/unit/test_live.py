@@ -0,0 +1,108 @@
+"""Unit tests for live WebSocket prediction sessions."""
+
+import asyncio
+import time
+
+import torch
+
+from guessme.api.live import LiveSession, to_predictions
+
+
+class FakePredictor:
+    """Predictor stand-in that records classified bitmaps."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.images = []
+
+    async def classify_image_async(self, image):
+        self.images.append(image)
+        await asyncio.sleep(self.delay)
+        return torch.tensor([0.0, 0.1, 0.0, 0.6, 0.0, 0.0, 0.0, 0.3, 0.0, 0.0])
+
+
+def make_session(predictor, interval_ms=0.0):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    session = LiveSession("c1", lambda: predictor, send, interval_ms=interval_ms)
+    return session, sent
+
+
+def test_to_predictions_sorted_top_k():
+    """Predictions are the top k labels with 0-100 confidence."""
+    probs = torch.tensor([0.0, 0.1, 0.0, 0.6, 0.0, 0.0, 0.0, 0.3, 0.0, 0.0])
+    predictions = [p.model_dump() for p in to_predictions(probs)]
+
+    assert predictions == [
+        {"label": "3", "confidence": 60},
+        {"label": "7", "confidence": 30},
+        {"label": "1", "confidence": 10},
+    ]
+
+
+async def test_strokes_during_prediction_are_coalesced():
+    """Strokes arriving while a prediction runs share the next prediction."""
+    predictor = FakePredictor(delay=0.02)
+    session, sent = make_session(predictor)
+
+    for i in range(10):
+        session.stroke(torch.tensor([[10.0 * i, 10.0 * i]]))
+        await asyncio.sleep(0.001)
+    await session._task
+
+    assert 1 <= len(predictor.images) <= 3
+    assert torch.equal(predictor.images[-1], session.raster.to_tensor())
+    assert sent[-1]["type"] == "predictions"
+    assert sent[-1]["clientId"] == "c1"
+
+
+async def test_live_predictions_are_throttled():
+    """Consecutive live predictions are at least interval_ms apart."""
+    predictor = FakePredictor()
+    session, sent = make_session(predictor, interval_ms=50)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    session.stroke(torch.tensor([[10.0, 10.0]]))
+    await asyncio.sleep(0.01)
+    session.stroke(torch.tensor([[200.0, 200.0]]))
+    await session._task
+
+    assert len(sent) == 2
+    assert loop.time() - start >= 0.05
+
+
+async def test_submit_sends_final():
+    """Submit sends the best prediction for the whole drawing."""
+    session, sent = make_session(FakePredictor())
+    session.stroke(torch.tensor([[10.0, 10.0], [300.0, 300.0]]))
+
+    assert await session.submit()
+    assert sent[-1] == {
+        "clientId": "c1",
+        "type": "final",
+        "data": {"label": "3", "confidence": 60},
+    }
+
+
+async def test_submit_without_model():
+    """Submit reports failure while no model is loaded."""
+    session, sent = make_session(None)
+    assert not await session.submit()
+    assert sent == []
+
+
+async def test_clear_cancels_pending_prediction():
+    """Clear erases the drawing and drops the pending live prediction."""
+    predictor = FakePredictor()
+    session, sent = make_session(predictor, interval_ms=1000)
+    session._last_run = time.monotonic()  # throttle next run
+    session.stroke(torch.tensor([[10.0, 10.0]]))
+    session.clear()
+    await asyncio.sleep(0.01)
+
+    assert sent == []
+    assert session.raster.image.sum() == 0
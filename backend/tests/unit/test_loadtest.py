@@ -0,0 +1,97 @@
+"""Unit tests for the load-testing harness."""
+
+import json
+from collections import Counter
+
+import httpx
+import pytest
+import torch
+
+from guessme.api.app import create_app
+from guessme.api.codec import BITMAP, POINTS_DELTA16, decode_points
+from guessme.bench.loadtest import (
+    encode_request,
+    load_corpus,
+    percentile,
+    run_level,
+    summarize,
+    synthetic_corpus,
+)
+from guessme.model.preprocess import CANVAS_SIZE
+from guessme.predictor.deployment import Predictor
+
+
+def test_percentile_nearest_rank():
+    """Percentiles pick the nearest-rank sample."""
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize_counts_errors_and_throughput():
+    """Non-200 responses and exceptions count as errors."""
+    statuses = Counter({"200": 8, "503": 1, "ConnectError": 1})
+
+    summary = summarize(4, [float(v) for v in range(10)], statuses, elapsed_s=2.0)
+
+    assert summary["requests"] == 10
+    assert summary["errors"] == 2
+    assert summary["error_rate"] == pytest.approx(0.2)
+    assert summary["throughput_rps"] == pytest.approx(4.0)
+    assert summary["latency_ms"]["p50"] == 4.0
+
+
+def test_synthetic_corpus_is_deterministic_and_on_canvas():
+    """Synthetic drawings repeat for a seed and stay on the canvas."""
+    corpus = synthetic_corpus(20)
+
+    assert corpus == synthetic_corpus(20)
+    assert all(len(points) >= 10 for points in corpus)
+    coords = [v for points in corpus for p in points for v in (p["x"], p["y"])]
+    assert min(coords) >= 0 and max(coords) <= CANVAS_SIZE
+
+
+def test_load_corpus_reads_batch_format(tmp_path):
+    """A /predict/batch style NDJSON file loads as drawings."""
+    path = tmp_path / "corpus.ndjson"
+    drawings = synthetic_corpus(3)
+    path.write_text("\n".join(json.dumps({"points": p}) for p in drawings) + "\n")
+
+    assert load_corpus(path) == drawings
+
+
+def test_encode_request_encodings():
+    """Each encoding yields a body with its content type."""
+    points = synthetic_corpus(1)[0]
+
+    body, content_type = encode_request(points, "json")
+    assert content_type == "application/json"
+    assert json.loads(body) == {"points": points}
+
+    body, content_type = encode_request(points, "delta16")
+    assert content_type == POINTS_DELTA16
+    expected = torch.tensor([[p["x"], p["y"]] for p in points]).round()
+    assert torch.equal(decode_points(body), expected)
+
+    body, content_type = encode_request(points, "bitmap")
+    assert (len(body), content_type) == (98, BITMAP)
+
+    with pytest.raises(ValueError):
+        encode_request(points, "xml")
+
+
+async def test_run_level_against_app():
+    """A short level against the app reports only successful requests."""
+    transport = httpx.ASGITransport(app=create_app(Predictor()))
+    bodies = [encode_request(p, "json") for p in synthetic_corpus(5)]
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        level = await run_level(client, bodies, 2, duration_s=0.2, warmup_s=0.05)
+
+    assert level["concurrency"] == 2
+    assert level["requests"] > 0
+    assert level["statuses"] == {"200": level["requests"]}
+    assert level["latency_ms"]["p99"] >= level["latency_ms"]["p50"] > 0
@@ -0,0 +1,78 @@
+"""Unit tests for the in-process metrics registry."""
+
+import pytest
+
+from guessme.metrics import Counter, Gauge, Histogram, Metric, Registry
+
+
+def test_counter_renders_labels():
+    """Counters render one sample per label set."""
+    registry = Registry()
+    counter = Counter("hits_total", "Hits", ("path",), registry=registry)
+    counter.labels("/a").inc()
+    counter.labels("/a").inc(2)
+    counter.labels("/b").inc()
+
+    text = registry.render()
+    assert "# HELP hits_total Hits" in text
+    assert "# TYPE hits_total counter" in text
+    assert 'hits_total{path="/a"} 3.0' in text
+    assert 'hits_total{path="/b"} 1.0' in text
+
+
+def test_gauge_goes_up_and_down():
+    """Gauges support inc, dec and set."""
+    registry = Registry()
+    gauge = Gauge("in_flight", "In flight", registry=registry)
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    assert "in_flight 1.0" in registry.render()
+
+    gauge.set(5)
+    assert "in_flight 5.0" in registry.render()
+
+
+def test_histogram_buckets_are_cumulative():
+    """Histogram buckets count observations at or below each bound."""
+    registry = Registry()
+    histogram = Histogram("size", "Size", buckets=(1, 5), registry=registry)
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value)
+
+    lines = registry.render().splitlines()
+    assert 'size_bucket{le="1.0"} 2' in lines
+    assert 'size_bucket{le="5.0"} 3' in lines
+    assert 'size_bucket{le="+Inf"} 4' in lines
+    assert "size_sum 14.5" in lines
+    assert "size_count 4" in lines
+
+
+def test_histogram_time_observes_elapsed():
+    """The time() context manager records one observation."""
+    registry = Registry()
+    histogram = Histogram("latency", "Latency", ("stage",), registry=registry)
+    with histogram.labels("forward").time():
+        pass
+
+    assert 'latency_count{stage="forward"} 1' in registry.render()
+
+
+def test_label_values_are_escaped():
+    """Quotes, backslashes and newlines in label values are escaped."""
+    registry = Registry()
+    counter = Counter("c", "C", ("v",), registry=registry)
+    counter.labels('a"b\\c\nd').inc()
+
+    assert 'c{v="a\\"b\\\\c\\nd"} 1.0' in registry.render()
+
+
+def test_metric_subclass_must_render_samples():
+    """A metric kind without samples() fails at construction, not at scrape."""
+
+    class Incomplete(Metric):
+        def _new_child(self) -> object:
+            return object()
+
+    with pytest.raises(TypeError, match="samples"):
+        Incomplete("x", "X", registry=Registry())
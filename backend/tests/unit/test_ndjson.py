@@ -0,0 +1,35 @@
+"""Unit tests for NDJSON streaming helpers."""
+
+from guessme.api.ndjson import chunked, read_lines
+
+
+async def aiter_list(items):
+    for item in items:
+        yield item
+
+
+async def collect(items):
+    return [item async for item in items]
+
+
+async def test_read_lines_across_chunks():
+    """Lines split across network chunks are reassembled."""
+    chunks = [b'{"a":', b" 1}\n{", b'"b": 2}\n', b"\n", b'{"c": 3}']
+    lines = await collect(read_lines(aiter_list(chunks), max_line_bytes=100))
+
+    # The blank line is skipped but still counted
+    assert lines == [(0, b'{"a": 1}'), (1, b'{"b": 2}'), (3, b'{"c": 3}')]
+
+
+async def test_read_lines_oversized_line():
+    """Lines over the limit are reported as None without being buffered."""
+    chunks = [b"short\n", b"x" * 8, b"x" * 8, b"x\nafter\n", b"y" * 20]
+    lines = await collect(read_lines(aiter_list(chunks), max_line_bytes=10))
+
+    assert lines == [(0, b"short"), (1, None), (2, b"after"), (3, None)]
+
+
+async def test_chunked():
+    """Items are grouped into lists of at most size."""
+    groups = await collect(chunked(aiter_list(range(7)), 3))
+    assert groups == [[0, 1, 2], [3, 4, 5], [6]]
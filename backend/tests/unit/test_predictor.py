@@ -1,7 +1,11 @@
 """Unit tests for Predictor."""
 
+import asyncio
+
 import pytest
+import torch
 
+from guessme.model.preprocess import StrokeRaster, rasterize, scale_points
 from guessme.predictor.deployment import Predictor
 
 
@@ -36,3 +40,133 @@ def test_predictor_predict_empty_points(predictor):
 
     assert "digit" in result
     assert "confidence" in result
+
+
+def test_predictor_preprocess_uses_pipeline(predictor):
+    """Preprocess should return a normalized batch on the model device."""
+    tensor = predictor._preprocess([{"x": 100, "y": 100}, {"x": 300, "y": 300}])
+
+    assert tensor.shape == (1, 1, 28, 28)
+    assert tensor.device == predictor.pipeline.device
+    assert tensor.min() < 0  # background is normalized below zero
+
+
+def test_predictor_predict_batch_matches_predict(predictor):
+    """Batched prediction should match one-at-a-time prediction."""
+    drawings = [
+        [{"x": 100, "y": 50}, {"x": 100, "y": 350}],
+        [],
+        [{"x": 50, "y": 50}, {"x": 350, "y": 350}, {"x": 50, "y": 350}],
+    ]
+
+    assert predictor.predict_batch(drawings) == [predictor.predict(d) for d in drawings]
+
+
+async def test_predictor_predict_async_batches(predictor):
+    """Concurrent async predictions should be served by the batcher."""
+    drawings = [[{"x": 100 + 20 * i, "y": 100}, {"x": 100, "y": 300}] for i in range(4)]
+
+    results = await asyncio.gather(*(predictor.predict_async(d) for d in drawings))
+
+    assert results == [predictor.predict(d) for d in drawings]
+    assert predictor.batcher.stats.items == 4
+
+
+async def test_predictor_predict_async_coalesces_identical(predictor):
+    """Concurrent requests landing in the same cells share one prediction."""
+    drawings = [[{"x": 100 + i, "y": 100}, {"x": 100, "y": 300}] for i in range(4)]
+
+    results = await asyncio.gather(*(predictor.predict_async(d) for d in drawings))
+
+    assert results == [results[0]] * 4
+    assert results[0] is not results[1]  # each caller gets its own dict
+    assert predictor.batcher.stats.items == 1
+    assert predictor.inflight.shared == 3
+
+
+async def test_predictor_classify_image_matches_predict(predictor):
+    """Classifying a stroke bitmap should agree with predicting its points."""
+    points = [{"x": 100, "y": 50}, {"x": 100, "y": 350}, {"x": 300, "y": 350}]
+    raster = StrokeRaster()
+    raster.append(points)
+
+    probs = await predictor.classify_image_async(raster.to_tensor())
+    expected = predictor.predict(points)
+
+    assert probs.shape == (10,)
+    assert int(probs.argmax()) == expected["digit"]
+    assert int(probs.max() * 100) == expected["confidence"]
+
+
+async def test_predictor_predict_bitmap_matches_predict(predictor):
+    """Predicting a client-side bitmap should match predicting its points."""
+    drawings = [
+        [{"x": 100, "y": 50}, {"x": 100, "y": 350}],
+        [],
+        [{"x": 50, "y": 50}, {"x": 350, "y": 350}, {"x": 50, "y": 350}],
+    ]
+    bitmaps = [rasterize(scale_points(d)) for d in drawings]
+
+    assert predictor.predict_bitmaps(bitmaps) == predictor.predict_batch(drawings)
+    assert await predictor.predict_bitmap_async(bitmaps[0]) == predictor.predict(
+        drawings[0]
+    )
+
+
+def test_predictor_cache_skips_model(predictor):
+    """Repeated drawings are answered from the result cache."""
+    points = [{"x": 100, "y": 50}, {"x": 100, "y": 350}]
+    calls = []
+    forward = predictor.forward_fn
+    predictor.forward_fn = lambda x: calls.append(len(x)) or forward(x)
+
+    first = predictor.predict_batch([points, points])
+    second = predictor.predict(points)
+
+    assert first == [second, second]
+    assert calls == [2]  # only the first batch ran the model
+    assert predictor.cache.stats.hits == 1
+
+
+def test_predictor_reload_invalidates_cache(predictor, tmp_path):
+    """Loading new weights empties the cache."""
+    predictor.predict([{"x": 100, "y": 50}])
+    assert len(predictor.cache) == 1
+    old_version = predictor.cache.version
+
+    weights = tmp_path / "mnist_cnn.pt"
+    torch.save({k: v + 1 for k, v in predictor.model.state_dict().items()}, weights)
+    predictor.reload_weights(weights)
+
+    assert len(predictor.cache) == 0
+    assert predictor.cache.version != old_version
+
+
+def test_predictor_warmup(predictor):
+    """Warmup should run and report elapsed time."""
+    assert predictor.warmup() > 0
+
+
+def test_predictor_bf16_close_to_fp32(tmp_path):
+    """bf16 autocast returns float32 probabilities close to fp32's."""
+    weights = tmp_path / "mnist_cnn.pt"
+    torch.save(Predictor().model.state_dict(), weights)
+    fp32 = Predictor(weights_path=weights, cache_size=0)
+    bf16 = Predictor(weights_path=weights, precision="bf16", cache_size=0)
+    images = [torch.rand(1, 28, 28) for _ in range(4)]
+
+    expected = torch.stack(fp32.classify_images(images))
+    probs = torch.stack(bf16.classify_images(images))
+
+    assert bf16.device.type == "cpu"
+    assert probs.dtype == torch.float32
+    assert not torch.equal(probs, expected)  # really ran in reduced precision
+    assert torch.allclose(probs, expected, atol=0.02)
+
+
+def test_predictor_bf16_script_falls_back_to_eager():
+    """TorchScript ignores autocast, so bf16 uses the eager backend."""
+    predictor = Predictor(precision="bf16", backend="script")
+
+    assert predictor.backend == "eager"
+    assert predictor.forward_fn is predictor.model
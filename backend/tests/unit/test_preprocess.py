@@ -1,4 +1,6 @@
 import io
+import itertools
+import random
 import sys
 
 import pytest
@@ -6,15 +8,28 @@ import torch
 
 from guessme.model.preprocess import (
     CANVAS_SIZE,
+    MNIST_MEAN,
+    MNIST_STD,
+    PreprocessPipeline,
+    StrokeRaster,
     bresenham_line,
     canvas_to_tensor,
+    canvas_to_tensor_batch,
+    center_batch,
     center_of_mass,
+    center_of_mass_batch,
     center_tensor,
     dilate_strokes,
     draw_lines_on_tensor,
     gaussian_blur,
     gaussian_kernel,
+    line_pixels,
+    pack_points,
     print_ascii,
+    rasterize,
+    rasterize_batch,
+    scale_points,
+    simplify_points,
     tensor_to_ascii,
 )
 
@@ -327,6 +342,72 @@ class TestDrawLines:
         assert img[5, 5] == 1.0
 
 
+# === Vectorized Rasterizer Tests ===
+
+
+class TestLinePixels:
+    """Test vectorized line rasterization against bresenham_line"""
+
+    def test_matches_bresenham_all_segments(self):
+        """Every segment inside the 28x28 grid matches bresenham_line"""
+        rng = random.Random(0)
+        for _ in range(500):
+            x0, y0, x1, y1 = (rng.randint(0, 27) for _ in range(4))
+            pixels = line_pixels(torch.tensor([[x0, y0], [x1, y1]]))
+            assert [tuple(p) for p in pixels.tolist()] == bresenham_line(x0, y0, x1, y1)
+
+    def test_polyline_concatenates_segments(self):
+        """Polyline pixels are the concatenation of per-segment lines"""
+        points = [(0, 0), (5, 2), (5, 2), (1, 9)]
+        expected = []
+        for (x0, y0), (x1, y1) in itertools.pairwise(points):
+            expected += bresenham_line(x0, y0, x1, y1)
+
+        pixels = line_pixels(torch.tensor(points))
+        assert [tuple(p) for p in pixels.tolist()] == expected
+
+    def test_fewer_than_two_points(self):
+        """No segments means no pixels"""
+        assert line_pixels(torch.tensor([[3, 4]])).shape == (0, 2)
+        assert line_pixels(torch.zeros(0, 2, dtype=torch.long)).shape == (0, 2)
+
+
+class TestRasterize:
+    """Test that rasterize matches the per-pixel Bresenham loop"""
+
+    @staticmethod
+    def loop_rasterize(scaled_points):
+        img = torch.zeros(28, 28)
+        for x, y in scaled_points:
+            img[y, x] = 1.0
+        for (x0, y0), (x1, y1) in itertools.pairwise(scaled_points):
+            for x, y in bresenham_line(x0, y0, x1, y1):
+                img[y, x] = 1.0
+        return img
+
+    @pytest.mark.parametrize("n_points", [1, 2, 50, 500])
+    def test_bit_identical_to_loop(self, n_points):
+        """Vectorized output equals the per-pixel loop exactly"""
+        rng = random.Random(n_points)
+        scaled = [(rng.randint(0, 27), rng.randint(0, 27)) for _ in range(n_points)]
+
+        result = rasterize(torch.tensor(scaled))
+        assert torch.equal(result, self.loop_rasterize(scaled))
+
+    def test_empty(self):
+        """No points gives a blank image"""
+        result = rasterize(torch.zeros(0, 2, dtype=torch.long))
+        assert result.shape == (28, 28)
+        assert result.sum() == 0
+
+    def test_draw_lines_skips_out_of_bounds(self):
+        """draw_lines_on_tensor clips pixels outside the 28x28 grid"""
+        img = torch.zeros(28, 28)
+        draw_lines_on_tensor(img, [(-5, 0), (30, 0)])
+        assert img[0].sum() == 28
+        assert img.sum() == 28
+
+
 # === Dilation Tests ===
 
 
@@ -537,3 +618,332 @@ class TestCanvasToTensorEnhanced:
         points = [{"x": 200, "y": 200}]
         result = canvas_to_tensor(points)
         assert result.shape == (1, 28, 28)
+
+
+# === Batched Preprocessing Tests ===
+
+
+def random_drawing(rng, n_points):
+    return [
+        {"x": rng.uniform(0, 400), "y": rng.uniform(0, 400)} for _ in range(n_points)
+    ]
+
+
+class TestRasterizeBatch:
+    """Test batched rasterization"""
+
+    def test_matches_per_drawing(self):
+        """Each image equals rasterizing its drawing alone"""
+        drawings = [torch.tensor([[0, 0], [10, 5]]), torch.tensor([[27, 27]])]
+        imgs = rasterize_batch(drawings)
+
+        assert imgs.shape == (2, 28, 28)
+        for img, drawing in zip(imgs, drawings, strict=True):
+            assert torch.equal(img, rasterize(drawing))
+
+    def test_no_line_between_drawings(self):
+        """Last point of one drawing is not connected to the next"""
+        drawings = [torch.tensor([[0, 0]]), torch.tensor([[27, 0]])]
+        imgs = rasterize_batch(drawings)
+
+        assert imgs[0].sum() == 1
+        assert imgs[1].sum() == 1
+
+    def test_empty_drawings(self):
+        """Empty drawings give blank images"""
+        imgs = rasterize_batch([torch.zeros(0, 2, dtype=torch.long)] * 2)
+        assert imgs.shape == (2, 28, 28)
+        assert imgs.sum() == 0
+
+
+class NoFloat64Tensor(torch.Tensor):
+    """Stands in for an MPS tensor: float64 is rejected, .cpu() leaves it."""
+
+    @classmethod
+    def __torch_function__(cls, func, types, args=(), kwargs=None):
+        if func is torch.Tensor.double:
+            raise TypeError("Cannot convert a MPS Tensor to float64 dtype")
+        result = super().__torch_function__(func, types, args, kwargs or {})
+        if func is torch.Tensor.cpu:
+            return result.as_subclass(torch.Tensor)
+        return result
+
+
+class TestCenterBatch:
+    """Test batched centering"""
+
+    def test_matches_center_tensor(self):
+        """Each image is shifted like center_tensor"""
+        images = torch.zeros(3, 1, 28, 28)
+        images[0, 0, 5, 5] = 1.0
+        images[1, 0, 20:25, 2:6] = 1.0
+
+        centered = center_batch(images)
+        for image, result in zip(images, centered, strict=True):
+            assert torch.equal(result, center_tensor(image))
+
+    def test_no_float64_on_input_device(self):
+        """Rounding runs on CPU, so devices without float64 (MPS) work"""
+        images = torch.zeros(2, 1, 28, 28)
+        images[0, 0, 3, 7] = 1.0
+
+        centered = center_batch(images.as_subclass(NoFloat64Tensor))
+        assert torch.equal(centered.as_subclass(torch.Tensor), center_batch(images))
+
+    def test_center_of_mass_batch(self):
+        """Center of mass per image, image center when empty"""
+        images = torch.zeros(2, 1, 28, 28)
+        images[0, 0, 5, 10] = 1.0
+
+        com = center_of_mass_batch(images)
+        assert com.tolist() == [[5.0, 10.0], [14.0, 14.0]]
+        assert tuple(com[0].tolist()) == center_of_mass(images[0])
+
+
+class TestCanvasToTensorBatch:
+    """Test that batched canvas_to_tensor matches per-drawing calls"""
+
+    @pytest.mark.parametrize("dilate", [False, True])
+    @pytest.mark.parametrize("center", [False, True])
+    @pytest.mark.parametrize("blur", [False, True])
+    def test_matches_canvas_to_tensor(self, dilate, center, blur):
+        """Batch output equals stacking canvas_to_tensor results"""
+        rng = random.Random(0)
+        drawings = [random_drawing(rng, n) for n in (0, 1, 2, 20, 200)]
+
+        result = canvas_to_tensor_batch(
+            drawings, dilate=dilate, center=center, blur=blur
+        )
+        expected = torch.stack(
+            [
+                canvas_to_tensor(points, dilate=dilate, center=center, blur=blur)
+                for points in drawings
+            ]
+        )
+
+        assert result.shape == (5, 1, 28, 28)
+        assert torch.allclose(result, expected, atol=1e-6)
+
+    def test_empty_batch(self):
+        """No drawings gives an empty batch"""
+        assert canvas_to_tensor_batch([]).shape == (0, 1, 28, 28)
+
+
+# === PreprocessPipeline Tests ===
+
+
+class TestPreprocessPipeline:
+    """Test the reusable preprocessing pipeline"""
+
+    def test_matches_canvas_to_tensor_normalized(self):
+        """Pipeline output equals canvas_to_tensor plus MNIST normalization"""
+        rng = random.Random(1)
+        drawings = [random_drawing(rng, n) for n in (0, 3, 40)]
+
+        result = PreprocessPipeline()(drawings)
+        expected = torch.stack(
+            [(canvas_to_tensor(points) - MNIST_MEAN) / MNIST_STD for points in drawings]
+        )
+
+        assert result.shape == (3, 1, 28, 28)
+        assert torch.allclose(result, expected, atol=1e-6)
+
+    def test_stages_configurable(self):
+        """Disabled stages are skipped"""
+        points = [{"x": 100, "y": 100}]
+        pipeline = PreprocessPipeline(center=False, blur=False, normalize=False)
+
+        result = pipeline([points])
+        expected = canvas_to_tensor(points, center=False, blur=False)
+        assert torch.equal(result[0], expected)
+
+    def test_constants_precomputed(self):
+        """Kernel and coordinate grid live on the pipeline device"""
+        pipeline = PreprocessPipeline(blur_kernel_size=5)
+
+        assert pipeline.blur_kernel.shape == (1, 1, 5, 5)
+        assert pipeline.blur_kernel.device == pipeline.device
+        assert pipeline.coords.device == pipeline.device
+
+    def test_transform_does_not_modify_input(self):
+        """transform leaves its input tensor untouched"""
+        images = torch.zeros(1, 1, 28, 28)
+        images[0, 0, 3, 3] = 1.0
+        original = images.clone()
+
+        PreprocessPipeline(center=False, blur=False).transform(images)
+        assert torch.equal(images, original)
+
+    def test_finalize_matches_pipeline(self):
+        """finalize on canvas_to_tensor output equals the full pipeline"""
+        drawings = [random_drawing(random.Random(7), 20), []]
+        images = torch.stack([canvas_to_tensor(d) for d in drawings])
+
+        pipeline = PreprocessPipeline()
+        assert torch.allclose(pipeline.finalize(images), pipeline(drawings), atol=1e-6)
+        assert images.min() >= 0  # input not normalized in place
+
+
+# === Point Packing Tests ===
+
+
+class TestPackPoints:
+    """Test packed (N, 2) point representation"""
+
+    def test_pack_dicts(self):
+        """Dicts are packed into an (N, 2) float32 tensor"""
+        packed = pack_points([{"x": 1, "y": 2}, {"x": 3.5, "y": 4}])
+        assert packed.dtype == torch.float32
+        assert packed.tolist() == [[1.0, 2.0], [3.5, 4.0]]
+
+    def test_pack_empty(self):
+        """Empty list packs to shape (0, 2)"""
+        assert pack_points([]).shape == (0, 2)
+
+    def test_tensor_passthrough(self):
+        """Float32 tensors are returned without copying"""
+        points = torch.tensor([[1.0, 2.0]])
+        assert pack_points(points).data_ptr() == points.data_ptr()
+
+    def test_scale_points_matches_int_scaling(self):
+        """Vectorized scaling equals per-point int() scaling and clamping"""
+        rng = random.Random(2)
+        points = [
+            {"x": rng.uniform(-100, 500), "y": rng.uniform(-100, 500)}
+            for _ in range(200)
+        ]
+        expected = [
+            [
+                max(0, min(27, int(p["x"] * 27 / CANVAS_SIZE))),
+                max(0, min(27, int(p["y"] * 27 / CANVAS_SIZE))),
+            ]
+            for p in points
+        ]
+
+        assert scale_points(pack_points(points)).tolist() == expected
+
+    def test_canvas_to_tensor_accepts_tensor(self):
+        """canvas_to_tensor gives the same result for dicts and tensors"""
+        points = [{"x": 50, "y": 60}, {"x": 250, "y": 300}]
+        assert torch.equal(
+            canvas_to_tensor(points), canvas_to_tensor(pack_points(points))
+        )
+
+
+# === Incremental Rasterization Tests ===
+
+
+class TestStrokeRaster:
+    """Test incremental stroke rasterization"""
+
+    def test_chunks_match_full_rasterization(self):
+        """Appending in chunks equals rasterizing all points at once"""
+        points = random_drawing(random.Random(3), 60)
+        raster = StrokeRaster()
+        for i in range(0, 60, 7):
+            raster.append(points[i : i + 7])
+
+        assert torch.equal(raster.image, rasterize(scale_points(points)))
+        assert raster.num_points == 60
+
+    def test_chunks_are_joined(self):
+        """The first new point is connected to the previous last point"""
+        raster = StrokeRaster()
+        raster.append([{"x": 0, "y": 0}])
+        raster.append([{"x": 400, "y": 0}])
+
+        assert raster.image[0].sum() == 28
+
+    def test_empty_append(self):
+        """Appending no points leaves the raster unchanged"""
+        raster = StrokeRaster()
+        raster.append([])
+        assert raster.last is None
+        assert raster.image.sum() == 0
+
+    @pytest.mark.parametrize(
+        "center,blur", list(itertools.product([True, False], repeat=2))
+    )
+    def test_to_tensor_matches_canvas_to_tensor(self, center, blur):
+        """Model input equals canvas_to_tensor over all appended points"""
+        rng = random.Random(4)
+        for n_points in (0, 1, 5, 80):
+            points = random_drawing(rng, n_points)
+            raster = StrokeRaster()
+            for i in range(0, n_points, 9):
+                raster.append(points[i : i + 9])
+
+            expected = canvas_to_tensor(points, center=center, blur=blur)
+            assert torch.equal(raster.to_tensor(center=center, blur=blur), expected)
+
+    def test_center_of_mass_sums(self):
+        """Running sums give the same center of mass as a full scan"""
+        raster = StrokeRaster()
+        raster.append(random_drawing(random.Random(5), 30))
+        raster.append(random_drawing(random.Random(6), 30))  # overlaps
+
+        assert raster.mass == raster.image.sum()
+        assert raster.center_of_mass() == center_of_mass(raster.image)
+
+    def test_to_tensor_returns_new_tensor(self):
+        """The model input does not alias the raster's bitmap"""
+        raster = StrokeRaster()
+        raster.append([{"x": 200, "y": 200}])
+        raster.to_tensor(center=False, blur=False).zero_()
+        assert raster.image.sum() == 1
+
+    def test_clear(self):
+        """Clear erases pixels and forgets the last point"""
+        raster = StrokeRaster()
+        raster.append([{"x": 0, "y": 0}, {"x": 399, "y": 399}])
+        raster.clear()
+        raster.append([{"x": 399, "y": 0}])
+
+        assert raster.image.sum() == 1
+        assert raster.num_points == 1
+        assert raster.mass == 1
+
+
+# === Stroke Simplification Tests ===
+
+
+class TestSimplifyPoints:
+    """Test ingest-time point simplification"""
+
+    def test_raster_unchanged(self):
+        """Simplified drawings rasterize to exactly the same image"""
+        rng = random.Random(8)
+        for _ in range(300):
+            # Random walks on a coarse step revisit cells and run straight
+            x, y = rng.uniform(0, 400), rng.uniform(0, 400)
+            points = []
+            for _ in range(rng.randint(0, 50)):
+                x += rng.choice([-30, -15, 0, 15, 30])
+                y += rng.choice([-15, 0, 15])
+                points.append({"x": x, "y": y})
+
+            simplified = simplify_points(points)
+            assert torch.equal(
+                rasterize(scale_points(simplified)), rasterize(scale_points(points))
+            )
+
+    def test_straight_line_keeps_endpoints(self):
+        """Samples along a straight stroke collapse to its endpoints"""
+        points = [{"x": 10.0 * i, "y": 10.0 * i} for i in range(41)]
+        simplified = simplify_points(points)
+        assert simplified.tolist() == [[0.0, 0.0], [400.0, 400.0]]
+
+    def test_same_cell_duplicates_dropped(self):
+        """Consecutive points in one cell keep only the first"""
+        points = [{"x": 100, "y": 100}, {"x": 101, "y": 102}, {"x": 300, "y": 100}]
+        assert simplify_points(points).tolist() == [[100.0, 100.0], [300.0, 100.0]]
+
+    def test_reversal_kept(self):
+        """A point where the stroke doubles back is kept"""
+        points = [{"x": 0, "y": 0}, {"x": 400, "y": 0}, {"x": 200, "y": 0}]
+        assert len(simplify_points(points)) == 3
+
+    def test_short_inputs(self):
+        """Empty and single-point drawings pass through"""
+        assert simplify_points([]).shape == (0, 2)
+        assert simplify_points([{"x": 1, "y": 2}]).tolist() == [[1.0, 2.0]]
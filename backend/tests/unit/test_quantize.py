@@ -0,0 +1,134 @@
+"""Unit tests for INT8 quantization."""
+
+import pytest
+import torch
+import torch.nn as nn
+
+from guessme.model.cnn import MNISTNet
+from guessme.model.quantize import (
+    load_quantized,
+    model_size_bytes,
+    quantize_model,
+    save_quantized,
+)
+from guessme.predictor.backends import model_fingerprint
+from guessme.predictor.deployment import Predictor
+
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    return MNISTNet().eval()
+
+
+@pytest.fixture
+def calibration():
+    torch.manual_seed(1)
+    return [torch.randn(16, 1, 28, 28) for _ in range(4)]
+
+
+def test_quantized_forward_shape(model, calibration):
+    """Quantized model maps (N, 1, 28, 28) -> (N, 10)."""
+    qmodel = quantize_model(model, calibration)
+    assert qmodel(torch.randn(3, 1, 28, 28)).shape == (3, 10)
+
+
+def test_quantized_close_to_float(model, calibration):
+    """Quantized logits stay close to float logits."""
+    qmodel = quantize_model(model, calibration)
+    x = calibration[0]
+
+    with torch.no_grad():
+        diff = (qmodel(x) - model(x)).abs().max()
+    assert diff < 0.05
+
+
+def test_quantize_leaves_float_model_untouched(model, calibration):
+    """Quantizing does not modify the float model."""
+    before = {k: v.clone() for k, v in model.state_dict().items()}
+    quantize_model(model, calibration)
+
+    assert isinstance(model.fc1, nn.Linear)
+    for k, v in model.state_dict().items():
+        assert torch.equal(v, before[k])
+
+
+def test_dynamic_only_without_calibration(model):
+    """Without calibration only Linear layers are quantized."""
+    qmodel = quantize_model(model)
+
+    assert type(qmodel.conv1) is nn.Conv2d
+    assert type(qmodel.fc1) is not nn.Linear
+
+
+def test_quantized_model_is_smaller(model, calibration):
+    """INT8 weights shrink the serialized model."""
+    qmodel = quantize_model(model, calibration)
+    assert model_size_bytes(qmodel) < model_size_bytes(model) / 3
+
+
+def test_save_load_roundtrip(model, calibration, tmp_path):
+    """Loaded quantized model reproduces the saved one exactly."""
+    qmodel = quantize_model(model, calibration)
+    path = tmp_path / "mnist_cnn_int8.pt"
+    save_quantized(qmodel, path, model_fingerprint(model))
+
+    x = torch.randn(2, 1, 28, 28)
+    assert torch.equal(load_quantized(path, model_fingerprint(model))(x), qmodel(x))
+
+
+def test_load_rejects_other_float_weights(model, calibration, tmp_path):
+    """A model quantized from other float weights is refused when checked."""
+    path = tmp_path / "mnist_cnn_int8.pt"
+    save_quantized(quantize_model(model, calibration), path, "0" * 16)
+
+    with pytest.raises(ValueError, match="different float weights"):
+        load_quantized(path, model_fingerprint(model))
+
+
+def test_predictor_int8(tmp_path):
+    """Predictor in int8 mode runs on CPU and returns valid predictions."""
+    predictor = Predictor(weights_path=tmp_path / "mnist_cnn.pt", precision="int8")
+
+    result = predictor.predict([{"x": 100, "y": 50}, {"x": 100, "y": 350}])
+
+    assert predictor.device.type == "cpu"
+    assert 0 <= result["digit"] <= 9
+    assert 0 <= result["confidence"] <= 100
+
+
+def test_predictor_int8_loads_calibrated_model(model, calibration, tmp_path):
+    """Predictor prefers the calibrated model next to the float weights."""
+    torch.save(model.state_dict(), tmp_path / "mnist_cnn.pt")
+    qmodel = quantize_model(model, calibration)
+    save_quantized(qmodel, tmp_path / "mnist_cnn_int8.pt", model_fingerprint(model))
+
+    predictor = Predictor(weights_path=tmp_path / "mnist_cnn.pt", precision="int8")
+
+    x = torch.randn(2, 1, 28, 28)
+    assert torch.equal(predictor.model(x), qmodel(x))
+
+
+def test_predictor_int8_ignores_stale_calibrated_model(
+    model, calibration, tmp_path, capsys
+):
+    """After retraining, the old INT8 model is skipped for dynamic quantization."""
+    save_quantized(
+        quantize_model(model, calibration),
+        tmp_path / "mnist_cnn_int8.pt",
+        model_fingerprint(model),
+    )
+    torch.manual_seed(2)
+    torch.save(MNISTNet().state_dict(), tmp_path / "mnist_cnn.pt")
+
+    predictor = Predictor(weights_path=tmp_path / "mnist_cnn.pt", precision="int8")
+
+    assert "different float weights" in capsys.readouterr().out
+    assert isinstance(predictor.model.conv1, nn.Conv2d)
+    assert type(predictor.model.fc1) is not nn.Linear
+
+
+def test_predictor_rejects_unknown_precision():
+    """Unknown precision values are rejected."""
+    with pytest.raises(ValueError, match="precision"):
+        Predictor(precision="int4")
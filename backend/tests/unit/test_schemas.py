@@ -0,0 +1,57 @@
+"""Unit tests for API schemas."""
+
+import pytest
+import torch
+from pydantic import ValidationError
+
+from guessme.api.schemas import PredictRequest
+
+
+def test_predict_request_packs_points():
+    """Points are parsed into one (N, 2) float32 tensor."""
+    request = PredictRequest.model_validate_json(
+        '{"points": [{"x": 1, "y": 2.5}, {"x": 300, "y": 0}]}'
+    )
+
+    assert isinstance(request.points, torch.Tensor)
+    assert request.points.dtype == torch.float32
+    assert request.points.tolist() == [[1.0, 2.5], [300.0, 0.0]]
+
+
+def test_predict_request_empty_points():
+    """Empty list gives an empty (0, 2) tensor."""
+    request = PredictRequest.model_validate({"points": []})
+    assert request.points.shape == (0, 2)
+
+
+def test_predict_request_accepts_numeric_strings():
+    """Numeric strings are coordinates, as with Point's lax float fields."""
+    request = PredictRequest.model_validate(
+        {"points": [{"x": "1.5", "y": 2}, {"x": 3, "y": " 4 "}]}
+    )
+    assert request.points.tolist() == [[1.5, 2.0], [3.0, 4.0]]
+
+
+@pytest.mark.parametrize(
+    "points",
+    [
+        "not a list",
+        [{"x": 1}],
+        [{"x": "a", "y": 1}],
+        [{"x": "", "y": 1}],
+        [{"x": None, "y": 1}],
+        [{"x": "nan", "y": 1}],
+        [[1, 2]],
+        [{"x": float("nan"), "y": 1}],
+    ],
+)
+def test_predict_request_rejects_invalid_points(points):
+    """Malformed points raise a validation error."""
+    with pytest.raises(ValidationError):
+        PredictRequest.model_validate({"points": points})
+
+
+def test_predict_request_serializes_points():
+    """Dumping returns the original {"x", "y"} objects."""
+    request = PredictRequest.model_validate({"points": [{"x": 1, "y": 2}]})
+    assert request.model_dump() == {"points": [{"x": 1.0, "y": 2.0}]}
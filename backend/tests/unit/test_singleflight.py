@@ -0,0 +1,106 @@
+"""Unit tests for singleflight request coalescing."""
+
+import asyncio
+
+import pytest
+import torch
+
+from guessme.predictor.singleflight import SingleFlight, bitmap_key, points_key
+
+
+async def test_concurrent_calls_share_one_computation():
+    """Callers with the same key await a single run."""
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do(b"k", compute) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert calls == [1]
+    assert (flight.leaders, flight.shared) == (1, 4)
+
+
+async def test_different_keys_run_separately():
+    """Distinct keys do not coalesce."""
+    flight = SingleFlight()
+
+    async def compute(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        flight.do(b"a", lambda: compute(1)), flight.do(b"b", lambda: compute(2))
+    )
+    assert results == [1, 2]
+    assert flight.shared == 0
+
+
+async def test_finished_keys_are_forgotten():
+    """Sequential calls each run; nothing is cached."""
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert await flight.do(b"k", compute) == 1
+    assert await flight.do(b"k", compute) == 2
+
+
+async def test_errors_reach_every_caller():
+    """An exception is raised in all coalesced callers."""
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flight.do(b"k", fail), flight.do(b"k", fail), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_cancelled_caller_does_not_cancel_others():
+    """A caller going away leaves the shared computation running."""
+    flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(flight.do(b"k", compute))
+    second = asyncio.ensure_future(flight.do(b"k", compute))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+def test_points_key_normalizes_to_cells():
+    """Points in the same grid cells share a key."""
+    a = torch.tensor([[100.0, 100.0], [300.0, 300.0]])
+    b = torch.tensor([[101.0, 102.0], [300.5, 299.0]])
+    c = torch.tensor([[200.0, 100.0], [300.0, 300.0]])
+
+    assert points_key(a) == points_key(b)
+    assert points_key(a) != points_key(c)
+    assert points_key([{"x": 100, "y": 100}, {"x": 300, "y": 300}]) == points_key(a)
+
+
+def test_bitmap_key():
+    """Bitmaps key by pixel content."""
+    bitmap = torch.zeros(28, 28)
+    other = bitmap.clone()
+    other[3, 3] = 1.0
+
+    assert bitmap_key(bitmap) == bitmap_key(bitmap.clone())
+    assert bitmap_key(bitmap) != bitmap_key(other)
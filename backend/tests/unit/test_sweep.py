@@ -0,0 +1,79 @@
+"""Tests for the hyperparameter sweep runner's grid and stopping logic."""
+
+import multiprocessing
+
+import pytest
+
+from guessme.model.sweep import (
+    MedianStopper,
+    grid,
+    main,
+    threads_per_trial,
+)
+
+
+def test_grid_is_every_combination():
+    """Every lr is paired with every batch size."""
+    configs = grid({"lr": [1e-3, 3e-3], "batch_size": [32, 64, 128]})
+
+    assert len(configs) == 6
+    assert configs[0] == {"lr": 1e-3, "batch_size": 32}
+    assert {(c["lr"], c["batch_size"]) for c in configs} == {
+        (lr, bs) for lr in (1e-3, 3e-3) for bs in (32, 64, 128)
+    }
+
+
+def test_threads_split_between_trials(monkeypatch):
+    """Cores are divided evenly, with at least one thread per trial."""
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+
+    assert threads_per_trial(1) == 8
+    assert threads_per_trial(3) == 2
+    assert threads_per_trial(16) == 1
+
+
+def test_stopper_waits_for_grace_epochs():
+    """A bad trial is not stopped before the grace period ends."""
+    stopper = MedianStopper({}, grace_epochs=2, min_trials=1)
+    stopper.report("good", 0, 90.0)
+    stopper.report("good", 1, 95.0)
+
+    assert not stopper.report("bad", 0, 10.0)
+    assert not stopper.report("bad", 1, 10.0)
+
+
+def test_stopper_stops_trials_below_median():
+    """After the grace period, trials below the median at that epoch stop."""
+    stopper = MedianStopper({}, grace_epochs=1, min_trials=3)
+    for name, accuracies in {"a": [50, 90], "b": [50, 92], "c": [50, 94]}.items():
+        for epoch, accuracy in enumerate(accuracies):
+            stopper.report(name, epoch, accuracy)
+
+    stopper.report("low", 0, 50.0)
+    stopper.report("high", 0, 50.0)
+    assert stopper.report("low", 1, 91.0)
+    assert not stopper.report("high", 1, 93.0)
+
+
+def test_stopper_needs_min_trials():
+    """Too few other trials at an epoch means no comparison."""
+    stopper = MedianStopper({}, grace_epochs=0, min_trials=2)
+    stopper.report("a", 0, 90.0)
+
+    assert not stopper.report("bad", 0, 10.0)
+
+
+def test_stopper_shares_history_across_processes():
+    """A Manager dict lets trials in other processes see each report."""
+    with multiprocessing.Manager() as manager:
+        stopper = MedianStopper(manager.dict(), grace_epochs=0, min_trials=1)
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            pool.apply(stopper.report, ("other", 0, 90.0))
+
+        assert stopper.report("bad", 0, 10.0)
+
+
+def test_unknown_backend_rejected():
+    """Backends other than auto, local and ray fail before any run starts."""
+    with pytest.raises(ValueError, match="backend"):
+        main(backend="slurm")
@@ -2,7 +2,9 @@
 
 import pytest
 
-mlflow = pytest.importorskip("mlflow", reason="requires train deps (uv sync --group train)")
+mlflow = pytest.importorskip(
+    "mlflow", reason="requires train deps (uv sync --group train)"
+)
 
 from guessme.model.train import get_dataloaders, get_device  # noqa: E402
 
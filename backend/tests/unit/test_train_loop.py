@@ -0,0 +1,45 @@
+"""Tests for the training loop functions (no train dependency group needed)."""
+
+import torch
+import torch.nn as nn
+
+from guessme.model.cnn import MNISTNet
+from guessme.model.data import TensorLoader, TensorMNIST
+from guessme.model.train import evaluate, train_epoch
+
+
+def make_loader() -> TensorLoader:
+    generator = torch.Generator().manual_seed(0)
+    images = torch.randint(0, 256, (64, 28, 28), dtype=torch.uint8, generator=generator)
+    return TensorLoader(TensorMNIST(images, torch.arange(64) % 10), batch_size=16)
+
+
+def test_train_epoch_bf16_autocast():
+    """bf16 training keeps fp32 weights and reduces the loss."""
+    torch.manual_seed(0)
+    loader = make_loader()
+    model = MNISTNet()
+    optimizer = torch.optim.Adam(model.parameters())
+    criterion = nn.CrossEntropyLoss()
+    device = torch.device("cpu")
+
+    first = train_epoch(model, loader, optimizer, criterion, device, bf16=True)
+    for _ in range(5):
+        last = train_epoch(model, loader, optimizer, criterion, device, bf16=True)
+
+    assert last < first
+    assert all(p.dtype == torch.float32 for p in model.parameters())
+
+
+def test_evaluate_bf16_matches_fp32_on_confident_model():
+    """bf16 evaluation agrees with fp32 once the model fits the data."""
+    torch.manual_seed(0)
+    loader = make_loader()
+    model = MNISTNet()
+    optimizer = torch.optim.Adam(model.parameters())
+    device = torch.device("cpu")
+    for _ in range(20):
+        train_epoch(model, loader, optimizer, nn.CrossEntropyLoss(), device)
+
+    assert evaluate(model, loader, device) == 100
+    assert evaluate(model, loader, device, bf16=True) == 100
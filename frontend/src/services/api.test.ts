@@ -31,7 +31,10 @@ describe('api service', () => {
         'http://localhost:8000/predict',
         expect.objectContaining({
           method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
+          headers: {
+            'Content-Type': 'application/json',
+            'X-Client-Id': expect.any(String)
+          },
           body: JSON.stringify({ points: mockPoints })
         })
       )
@@ -1,4 +1,5 @@
 import type { Point, PredictResponse } from '@/types'
+import { getClientId } from './websocket'
 
 const API_URL = import.meta.env.VITE_API_URL ?? 'http://localhost:8000'
 
@@ -13,7 +14,11 @@ export async function predictDigit(points: Point[]): Promise<PredictResponse> {
   try {
     const response = await fetch(`${API_URL}/predict`, {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
+      headers: {
+        'Content-Type': 'application/json',
+        // Keys the server's per-client rate limit
+        'X-Client-Id': getClientId()
+      },
       body: JSON.stringify({ points })
     })
 